@@ -6,6 +6,10 @@ from dandiapi.api.models import (
     AssetBlob,
     AssetMetadata,
     Dandiset,
+    GirderImport,
+    GirderImportFile,
+    MultipartUpload,
+    StatsSnapshot,
     Validation,
     Version,
     VersionMetadata,
@@ -73,3 +77,44 @@ class AssetAdmin(admin.ModelAdmin):
 class ValidationAdmin(admin.ModelAdmin):
     list_display = ['id', 'blob', 'state', 'sha256', 'error', 'modified', 'created']
     list_display_links = ['id', 'blob', 'sha256']
+
+
+@admin.register(MultipartUpload)
+class MultipartUploadAdmin(admin.ModelAdmin):
+    list_display = ['id', 'object_key', 'size', 'user', 'created']
+    list_display_links = ['id', 'object_key']
+
+
+@admin.register(StatsSnapshot)
+class StatsSnapshotAdmin(admin.ModelAdmin):
+    list_display = [
+        'id',
+        'dandiset_count',
+        'published_dandiset_count',
+        'user_count',
+        'size',
+        'modified',
+    ]
+
+
+@admin.register(GirderImport)
+class GirderImportAdmin(admin.ModelAdmin):
+    list_display = [
+        'id',
+        'girder_folder_id',
+        'dandiset',
+        'owner',
+        'state',
+        'file_count',
+        'pending_count',
+        'modified',
+        'created',
+    ]
+    list_display_links = ['id', 'girder_folder_id']
+
+
+@admin.register(GirderImportFile)
+class GirderImportFileAdmin(admin.ModelAdmin):
+    list_display = ['id', 'girder_import', 'girder_id', 'path', 'size', 'state', 'error', 'blob']
+    list_display_links = ['id', 'girder_id', 'path']
+    list_filter = ['state']
@@ -4,3 +4,11 @@ from django.apps import AppConfig
 class PublishConfig(AppConfig):
     name = 'dandiapi.api'
     verbose_name = 'DANDI: Publish'
+
+    def ready(self):
+        # Connect the cache invalidation signal handlers
+        import dandiapi.api.authentication  # noqa: F401
+        import dandiapi.api.caching  # noqa: F401
+
+        # Connect the signal handler which records the queries of sampled requests
+        import dandiapi.api.metrics  # noqa: F401
@@ -0,0 +1,125 @@
+"""
+Token authentication which caches the user of each token.
+
+Clients such as the CLI authenticate every request with a token, which DRF looks up together with
+its user. Recently used tokens are kept in a bounded LRU in each process, and in the cache, both
+under the token cache policy. Only the fields of the user which requests commonly need are cached,
+never its password; any other field is loaded when it is first accessed. Deleting a token or saving
+its user invalidates both, but the LRUs of other processes keep an old token for up to
+LOCAL_TIMEOUT.
+"""
+from __future__ import annotations
+
+from collections import OrderedDict
+import hashlib
+import threading
+import time
+from typing import Generic, Hashable, Optional, Tuple, TypeVar
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+
+from dandiapi.api.caching import policy_timeout
+
+# The most tokens kept by each process, and for at most how many seconds
+LOCAL_SIZE = 1000
+LOCAL_TIMEOUT = 30
+
+# The fields of a user which are cached, in the order of the model's fields, as from_db requires
+USER_FIELDS = ('id', 'is_superuser', 'username', 'first_name', 'last_name', 'is_staff', 'is_active')
+
+Value = TypeVar('Value')
+
+
+class LRUCache(Generic[Value]):
+    """A thread-safe cache of the most recently used values, each of which expires."""
+
+    def __init__(self, maxsize: int, timeout: float):
+        self.maxsize = maxsize
+        self.timeout = timeout
+        self._entries: OrderedDict[Hashable, Tuple[float, Value]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Value]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Value, timeout: Optional[float] = None) -> None:
+        if timeout is None:
+            timeout = self.timeout
+        with self._lock:
+            self._entries[key] = (time.monotonic() + timeout, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+local_tokens: LRUCache[tuple] = LRUCache(LOCAL_SIZE, LOCAL_TIMEOUT)
+
+
+def _token_cache_key(key: str) -> str:
+    # Tokens are secrets, so they are never stored in the cache as they are
+    return f'api:token:{hashlib.sha256(key.encode()).hexdigest()}'
+
+
+def invalidate_token(key: str) -> None:
+    """Forget a token, e.g. once it is deleted."""
+    cache_key = _token_cache_key(key)
+    local_tokens.delete(cache_key)
+    cache.delete(cache_key)
+
+
+@receiver([post_save, post_delete], sender=Token)
+def _invalidate_saved_token(sender, instance: Token, **kwargs):
+    invalidate_token(instance.key)
+
+
+# Deleting a user deletes their token too, which invalidates it
+@receiver(post_save, sender=User)
+def _invalidate_user_tokens(sender, instance: User, created: bool, **kwargs):
+    if not created:
+        for key in Token.objects.filter(user=instance).values_list('key', flat=True):
+            invalidate_token(key)
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    def authenticate_credentials(self, key: str) -> Tuple[User, Token]:
+        timeout = policy_timeout('token')
+        if not timeout:
+            return super().authenticate_credentials(key)
+
+        cache_key = _token_cache_key(key)
+        user_values = local_tokens.get(cache_key)
+        if user_values is None:
+            user_values = cache.get(cache_key)
+            if user_values is None:
+                user, _ = super().authenticate_credentials(key)
+                user_values = tuple(getattr(user, field) for field in USER_FIELDS)
+                cache.set(cache_key, user_values, timeout)
+            local_tokens.set(cache_key, user_values, min(timeout, LOCAL_TIMEOUT))
+
+        # Every request gets its own instances, since views may modify the user
+        user = User.from_db(User.objects.db, USER_FIELDS, user_values)
+        token = Token.from_db(Token.objects.db, ['key', 'user_id'], [key, user.pk])
+        token.user = user
+        return user, token
@@ -0,0 +1,258 @@
+"""
+Server and HTTP caching of responses from read-heavy API endpoints.
+
+Each cached endpoint is assigned a named policy, whose timeout is configured by the
+DANDI_CACHE_POLICIES setting. Responses which describe a particular dandiset are additionally
+keyed on a per-dandiset generation, which is bumped whenever the dandiset or any of its
+versions or assets are modified, invalidating all of its cached responses at once.
+
+Ownership of dandisets is also cached briefly, since bulk clients check it on every write.
+"""
+from __future__ import annotations
+
+import functools
+import hashlib
+from typing import Callable, Optional
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+from guardian.utils import get_40x_or_None
+from rest_framework import status
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from dandiapi.api.models import Asset, Dandiset, Version
+
+# HTTP Cache-Control max-age, in seconds, for responses describing published or draft versions.
+# Published versions can still be modified through the API, so clients must revalidate them too.
+PUBLISHED_MAX_AGE = 60 * 60
+DRAFT_MAX_AGE = 60
+
+
+def policy_timeout(policy: str) -> Optional[int]:
+    """Return the timeout of a policy, in seconds, or None if caching is disabled for it."""
+    return settings.DANDI_CACHE_POLICIES.get(policy) or None
+
+
+def _generation_key(dandiset_id) -> str:
+    return f'api:dandiset-generation:{int(dandiset_id)}'
+
+
+def dandiset_generation(dandiset_id) -> str:
+    # If the generation was evicted, a new one is created, which orphans any old entries
+    return cache.get_or_set(_generation_key(dandiset_id), lambda: uuid4().hex, None)
+
+
+def invalidate_dandiset(dandiset_id) -> None:
+    def bump():
+        cache.set(_generation_key(dandiset_id), uuid4().hex, None)
+
+    bump()
+    # Another request could repopulate the cache with stale data before this transaction commits
+    transaction.on_commit(bump)
+
+
+def _owner_key(user_id, dandiset_id) -> str:
+    return f'api:dandiset-owner:{int(user_id)}:{int(dandiset_id)}'
+
+
+def get_owner_40x_or_none(request: Request, dandiset: Dandiset) -> Optional[HttpResponse]:
+    """
+    Return a 403 response unless the user of a request owns a dandiset, like get_40x_or_None.
+
+    Only ownership is cached, so a user who was just made an owner is never refused.
+    """
+    timeout = policy_timeout('owner_permission')
+    if timeout is None or not request.user.is_authenticated:
+        return get_40x_or_None(request, ['owner'], dandiset, return_403=True)
+
+    key = _owner_key(request.user.id, dandiset.id)
+    if cache.get(key):
+        return None
+    response = get_40x_or_None(request, ['owner'], dandiset, return_403=True)
+    if response is None:
+        cache.set(key, True, timeout)
+    return response
+
+
+def invalidate_owners(dandiset_id, user_ids) -> None:
+    """Forget the cached ownership of a dandiset by some users."""
+    keys = [_owner_key(user_id, dandiset_id) for user_id in user_ids]
+    if not keys:
+        return
+
+    def forget():
+        cache.delete_many(keys)
+
+    forget()
+    # Another request could cache the ownership again before this transaction commits
+    transaction.on_commit(forget)
+
+
+def cache_response(
+    policy: str, dandiset_kwarg: Optional[str] = None, version_kwarg: Optional[str] = None
+) -> Callable:
+    """
+    Cache the data of successful GET responses from a view.
+
+    Responses are keyed on the full request path, including query parameters.
+    If dandiset_kwarg is given, responses are invalidated whenever that dandiset changes.
+    If version_kwarg is given, only responses for published versions are cached, since
+    drafts may be modified at any time.
+
+    This may decorate either a function-based view or a viewset method.
+    """
+
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            request: Request = next(arg for arg in args if isinstance(arg, Request))
+            timeout = policy_timeout(policy)
+            if (
+                request.method != 'GET'
+                or timeout is None
+                or (version_kwarg and kwargs.get(version_kwarg) == 'draft')
+            ):
+                return view(*args, **kwargs)
+
+            generation = dandiset_generation(kwargs[dandiset_kwarg]) if dandiset_kwarg else ''
+            path_hash = hashlib.md5(request.get_full_path().encode()).hexdigest()
+            key = f'api:response:{policy}:{generation}:{path_hash}'
+
+            data = cache.get(key)
+            if data is not None:
+                return Response(data)
+
+            response = view(*args, **kwargs)
+            if response.status_code == status.HTTP_200_OK:
+                cache.set(key, response.data, timeout)
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+def _version_validators(request: Request, dandiset_id, version: str):
+    # The ETag and Last-Modified of a version only need to be fetched once per request
+    if hasattr(request, '_version_validators'):
+        return request._version_validators
+
+    def fetch():
+        return (
+            Version.objects.filter(dandiset_id=int(dandiset_id), version=version)
+            .values_list('modification_count', 'modified')
+            .first()
+        )
+
+    if version == 'draft':
+        validators = fetch()
+    else:
+        # Published versions rarely change, so their validators can be cached like their content
+        timeout = policy_timeout('published_version')
+        key = f'api:version-validators:{dandiset_generation(dandiset_id)}:{version}'
+        validators = cache.get(key) if timeout else None
+        if validators is None:
+            validators = fetch()
+            if validators is not None and timeout:
+                cache.set(key, validators, timeout)
+
+    request._version_validators = validators
+    return validators
+
+
+def conditional_version_response(dandiset_kwarg: str, version_kwarg: str) -> Callable:
+    """
+    Send HTTP caching headers for responses describing a version, and honor conditional requests.
+
+    Clients and CDNs may reuse responses for published versions for an hour, and responses for
+    drafts for a minute, after which they must be revalidated using an ETag derived from the
+    modification counter of the version. Since each representation of a response (JSON or the
+    browsable API) has different content, the ETag also includes the negotiated format.
+
+    This must not be used for responses containing presigned URLs, as those expire.
+    """
+
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            request: Request = next(arg for arg in args if isinstance(arg, Request))
+            version = kwargs[version_kwarg]
+            validators = (
+                _version_validators(request, kwargs[dandiset_kwarg], version)
+                if request.method in ['GET', 'HEAD']
+                else None
+            )
+            if validators is None:
+                # Let the view itself handle a non-existent version
+                return view(*args, **kwargs)
+
+            modification_count, modified = validators
+            etag = quote_etag(f'{version}-{modification_count}-{request.accepted_renderer.format}')
+            last_modified = int(modified.timestamp())
+            response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+            if response is None:
+                response = view(*args, **kwargs)
+
+            if response.status_code in [status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED]:
+                response['ETag'] = etag
+                response['Last-Modified'] = http_date(last_modified)
+                max_age = DRAFT_MAX_AGE if version == 'draft' else PUBLISHED_MAX_AGE
+                patch_cache_control(response, public=True, max_age=max_age, must_revalidate=True)
+                patch_vary_headers(response, ['Accept'])
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+@receiver(post_save, sender=Dandiset)
+@receiver(post_delete, sender=Dandiset)
+def _invalidate_dandiset(sender, instance: Dandiset, **kwargs):
+    invalidate_dandiset(instance.id)
+
+
+@receiver(post_save, sender=Version)
+@receiver(post_delete, sender=Version)
+def _invalidate_version(sender, instance: Version, **kwargs):
+    invalidate_dandiset(instance.dandiset_id)
+
+
+@receiver(post_save, sender=Asset)
+# Once an asset is deleted, its versions can no longer be found
+@receiver(pre_delete, sender=Asset)
+def _invalidate_asset(sender, instance: Asset, created=False, **kwargs):
+    # A newly created asset does not belong to any versions yet
+    if created:
+        return
+    for dandiset_id in set(instance.versions.values_list('dandiset_id', flat=True)):
+        invalidate_dandiset(dandiset_id)
+
+
+@receiver(m2m_changed, sender=Asset.versions.through)
+def _invalidate_asset_versions(sender, instance, action: str, reverse: bool, pk_set, **kwargs):
+    if reverse:
+        # The assets of a single version were changed
+        if action.startswith('post_'):
+            invalidate_dandiset(instance.dandiset_id)
+    elif action == 'pre_clear':
+        # post_clear does not provide the versions that were removed, so record them now
+        instance._cleared_dandiset_ids = set(
+            instance.versions.values_list('dandiset_id', flat=True)
+        )
+    elif action == 'post_clear':
+        for dandiset_id in getattr(instance, '_cleared_dandiset_ids', ()):
+            invalidate_dandiset(dandiset_id)
+    elif action in ['post_add', 'post_remove']:
+        for dandiset_id in set(
+            Version.objects.filter(pk__in=pk_set).values_list('dandiset_id', flat=True)
+        ):
+            invalidate_dandiset(dandiset_id)
@@ -1,7 +1,13 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 import hashlib
+from typing import Optional
 
 from django.core.files.storage import Storage
 
+# Size of the chunks streamed from MinIO, unless another is given
+MINIO_CHUNK_SIZE = 1024 * 1024
+
 
 class UnsupportedStorageException(Exception):
     """Raised when the given Storage is not supported."""
@@ -23,22 +29,61 @@ class ChecksumCalculatorFile:
         return self.h.hexdigest()
 
 
-def _calculate_checksum_boto3(storage: Storage, name: str):
+def _calculate_checksum_boto3(
+    storage: Storage, name: str, chunk_size: Optional[int], max_concurrency: Optional[int]
+):
+    from boto3.s3.transfer import TransferConfig
+
+    config = TransferConfig()
+    if chunk_size is not None:
+        config.multipart_chunksize = config.multipart_threshold = chunk_size
+    if max_concurrency is not None:
+        config.max_request_concurrency = max_concurrency
+        config.use_threads = max_concurrency > 1
     obj = storage.bucket.Object(name)
     calculator = ChecksumCalculatorFile()
-    obj.download_fileobj(calculator)
+    # The calculator is not seekable, so boto3 writes the parts to it in order
+    obj.download_fileobj(calculator, Config=config)
     return calculator.checksum
 
 
-def _calculate_checksum_minio(storage: Storage, name: str):
-    obj = storage.client.get_object(storage.bucket_name, name)
+def _calculate_checksum_minio(
+    storage: Storage, name: str, chunk_size: Optional[int], max_concurrency: Optional[int]
+):
+    chunk_size = chunk_size or MINIO_CHUNK_SIZE
     calculator = ChecksumCalculatorFile()
-    for d in obj.stream(amt=1024 * 1024):
-        calculator.write(d)
+    if not max_concurrency or max_concurrency == 1:
+        obj = storage.client.get_object(storage.bucket_name, name)
+        for d in obj.stream(amt=chunk_size):
+            calculator.write(d)
+        return calculator.checksum
+
+    def read_range(offset: int) -> bytes:
+        obj = storage.client.get_partial_object(storage.bucket_name, name, offset, chunk_size)
+        try:
+            return obj.read()
+        finally:
+            obj.release_conn()
+
+    size = storage.client.stat_object(storage.bucket_name, name).size
+    with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+        # Only max_concurrency ranges are held in memory, and they are hashed in order
+        pending = deque()
+        for offset in range(0, size, chunk_size):
+            pending.append(executor.submit(read_range, offset))
+            if len(pending) == max_concurrency:
+                calculator.write(pending.popleft().result())
+        while pending:
+            calculator.write(pending.popleft().result())
     return calculator.checksum
 
 
-def calculate_sha256_checksum(storage: Storage, name: str):
+def calculate_sha256_checksum(
+    storage: Storage,
+    name: str,
+    chunk_size: Optional[int] = None,
+    max_concurrency: Optional[int] = None,
+):
     """
     Calculate the checksum of an S3 blob.
 
@@ -46,6 +91,10 @@ def calculate_sha256_checksum(storage: Storage, name: str):
     file, rather than streaming the bytes as you read. This method determines whether the blob is
     stored in S3 or Minio and uses the appropriate client to stream the data rather than
     downloading in one go.
+
+    The blob is read in chunks of chunk_size bytes, max_concurrency of them at once. Either
+    defaults to the backend's own strategy: 8 MiB parts over 10 threads with boto3, or a single
+    stream of 1 MiB chunks with Minio. test_checksum_benchmarks measures alternatives.
     """
     try:
         from storages.backends.s3boto3 import S3Boto3Storage
@@ -53,7 +102,7 @@ def calculate_sha256_checksum(storage: Storage, name: str):
         pass
     else:
         if isinstance(storage, S3Boto3Storage):
-            return _calculate_checksum_boto3(storage, name)
+            return _calculate_checksum_boto3(storage, name, chunk_size, max_concurrency)
 
     try:
         from minio_storage.storage import MinioStorage
@@ -61,6 +110,6 @@ def calculate_sha256_checksum(storage: Storage, name: str):
         pass
     else:
         if isinstance(storage, MinioStorage):
-            return _calculate_checksum_minio(storage, name)
+            return _calculate_checksum_minio(storage, name, chunk_size, max_concurrency)
 
     raise UnsupportedStorageException('Unsupported storage provider.')
@@ -1,3 +1,6 @@
+from datetime import datetime
+from typing import Iterator, List, Tuple
+
 from dandiapi.api.models.validation import Validation
 
 try:
@@ -13,21 +16,27 @@ except ImportError:
 
 
 PART_SIZE = 500 * 1024 * 1024  # 500 MB
+UPLOAD_PART_SIZE = 64 * 1024 * 1024  # 64 MB
+# The most keys S3 accepts in a single DeleteObjects request
+DELETE_BATCH_SIZE = 1000
 
 
 def copy_object(validation: Validation, dest_key: str):
-    storage = Validation.blob.field.storage
+    move_object(Validation.blob.field.storage, validation.blob.name, dest_key)
+
+
+def move_object(storage, source_key: str, dest_key: str):
+    """Move an object to a new key within the bucket of a storage, without downloading it."""
     source_bucket = storage.bucket_name
     # TODO: we may eventually want different buckets
     dest_bucket = source_bucket
-    source_key = validation.blob.name
 
-    if isinstance(Validation.blob.field.storage, S3Boto3Storage):
+    if isinstance(storage, S3Boto3Storage):
         _copy_object_s3(storage, source_bucket, source_key, dest_bucket, dest_key)
-    elif isinstance(Validation.blob.field.storage, MinioStorage):
+    elif isinstance(storage, MinioStorage):
         _copy_object_minio(storage, source_bucket, source_key, dest_bucket, dest_key)
     else:
-        raise ValueError(f'Unknown Validation storage {Validation.blob.field.storage}')
+        raise ValueError(f'Unknown storage {storage}')
 
 
 def _copy_object_s3(
@@ -115,3 +124,93 @@ def _copy_object_minio(
     copy_source = f'{source_bucket}/{source_key}'
     client.copy_object(dest_bucket, dest_key, copy_source)
     client.remove_object(source_bucket, source_key)
+
+
+def upload_object(storage, key: str, stream, size: int):
+    """
+    Upload the content of a readable stream to a storage, using multipart upload.
+
+    The stream is only read once, sequentially, so it need not be seekable.
+    """
+    if isinstance(storage, S3Boto3Storage):
+        from boto3.s3.transfer import TransferConfig
+
+        storage.bucket.upload_fileobj(
+            stream,
+            key,
+            Config=TransferConfig(
+                multipart_threshold=UPLOAD_PART_SIZE, multipart_chunksize=UPLOAD_PART_SIZE
+            ),
+        )
+    elif isinstance(storage, MinioStorage):
+        # The Minio client will automatically use multipart upload if the file size is too big
+        storage.client.put_object(
+            storage.bucket_name, key, stream, size, part_size=UPLOAD_PART_SIZE
+        )
+    else:
+        raise ValueError(f'Unknown storage {storage}')
+
+
+def list_objects(storage, prefix: str) -> Iterator[Tuple[str, datetime]]:
+    """Yield the key and last modified time of every object in a storage under a prefix."""
+    if isinstance(storage, S3Boto3Storage):
+        client = storage.connection.meta.client
+        paginator = client.get_paginator('list_objects_v2')
+        for page in paginator.paginate(Bucket=storage.bucket_name, Prefix=prefix):
+            for obj in page.get('Contents', []):
+                yield obj['Key'], obj['LastModified']
+    elif isinstance(storage, MinioStorage):
+        for obj in storage.client.list_objects(storage.bucket_name, prefix, recursive=True):
+            yield obj.object_name, obj.last_modified
+    else:
+        raise ValueError(f'Unknown storage {storage}')
+
+
+def delete_objects(storage, keys: List[str]) -> None:
+    """Delete objects from a storage, using as few DeleteObjects requests as possible."""
+    for start in range(0, len(keys), DELETE_BATCH_SIZE):
+        batch = keys[start : start + DELETE_BATCH_SIZE]
+        if isinstance(storage, S3Boto3Storage):
+            client = storage.connection.meta.client
+            response = client.delete_objects(
+                Bucket=storage.bucket_name,
+                Delete={'Objects': [{'Key': key} for key in batch], 'Quiet': True},
+            )
+            errors = [error['Key'] for error in response.get('Errors', [])]
+        elif isinstance(storage, MinioStorage):
+            # The errors are returned lazily, so the request is only made once they are consumed
+            errors = [
+                error.object_name
+                for error in storage.client.remove_objects(storage.bucket_name, batch)
+            ]
+        else:
+            raise ValueError(f'Unknown storage {storage}')
+
+        if errors:
+            raise IOError(f'Failed to delete {len(errors)} objects, including {errors[0]}')
+
+
+def abort_multipart_upload(storage, key: str, upload_id: str) -> bool:
+    """
+    Abort a multipart upload, deleting any parts which were uploaded.
+
+    Return False if the upload no longer exists, because it was completed or already aborted.
+    """
+    if isinstance(storage, S3Boto3Storage):
+        client = storage.connection.meta.client
+        try:
+            client.abort_multipart_upload(Bucket=storage.bucket_name, Key=key, UploadId=upload_id)
+        except client.exceptions.NoSuchUpload:
+            return False
+    elif isinstance(storage, MinioStorage):
+        # Minio can only abort every upload of a key, which is this one, since upload keys are
+        # unique
+        incomplete_uploads = storage.client.list_incomplete_uploads(
+            storage.bucket_name, key, recursive=True
+        )
+        if upload_id not in {upload.upload_id for upload in incomplete_uploads}:
+            return False
+        storage.client.remove_incomplete_upload(storage.bucket_name, key)
+    else:
+        raise ValueError(f'Unknown storage {storage}')
+    return True
@@ -0,0 +1,254 @@
+"""
+Garbage collection of rows and objects which are no longer referenced.
+
+AssetBlobs, AssetMetadata and VersionMetadata are shared, so removing an asset from a version or
+deleting a dandiset never deletes them. Collection runs in dependency order: assets which belong
+to no version are deleted first, then the blobs and metadata left unreferenced, and finally
+uploads which were never validated.
+
+Multipart uploads which were never completed are not objects yet, so they are aborted separately
+by reap_multipart_uploads, once they expire.
+
+Only rows and objects last modified before the grace period are collected, so anything which
+is still being uploaded, validated or registered is left alone. Blobs and metadata are modified
+whenever they are reused, so one which is about to be referenced again is never collected.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+import functools
+import logging
+import time
+from typing import Iterator, List, Tuple
+
+from django.db import transaction
+from django.db.models import Count, Exists, OuterRef, QuerySet, Sum
+from django.utils import timezone
+
+from dandiapi.api import girder_importer
+from dandiapi.api.copy import abort_multipart_upload, delete_objects, list_objects
+from dandiapi.api.models import (
+    Asset,
+    AssetBlob,
+    AssetMetadata,
+    GirderImport,
+    GirderImportFile,
+    MultipartUpload,
+    StatsSnapshot,
+    Validation,
+    Version,
+    VersionMetadata,
+)
+
+DEFAULT_GRACE_PERIOD = timedelta(days=7)
+DEFAULT_BATCH_SIZE = 1000
+UPLOADS_PREFIX = 'uploads/'
+# Aborting an upload is a request per upload, so several are made at once
+ABORT_WORKERS = 8
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class GarbageReport:
+    assets: int = 0
+    asset_blobs: int = 0
+    asset_blob_bytes: int = 0
+    asset_metadata: int = 0
+    version_metadata: int = 0
+    uploads: int = 0
+
+    def __str__(self) -> str:
+        return (
+            f'{self.assets} assets, '
+            f'{self.asset_blobs} blobs ({self.asset_blob_bytes} bytes), '
+            f'{self.asset_metadata} asset metadata, '
+            f'{self.version_metadata} version metadata, '
+            f'{self.uploads} uploads'
+        )
+
+
+def orphaned_assets(cutoff: datetime) -> QuerySet:
+    return Asset.objects.filter(
+        ~Exists(Asset.versions.through.objects.filter(asset=OuterRef('pk'))),
+        # An asset which was replaced by a newer one is still part of its history
+        ~Exists(Asset.objects.filter(previous=OuterRef('pk'))),
+        modified__lt=cutoff,
+    )
+
+
+def orphaned_asset_blobs(cutoff: datetime) -> QuerySet:
+    return AssetBlob.objects.filter(
+        ~Exists(Asset.objects.filter(blob=OuterRef('pk'))),
+        # Blobs transferred by an unfinished Girder import are not registered as assets yet
+        ~Exists(
+            GirderImportFile.objects.filter(blob=OuterRef('pk')).exclude(
+                girder_import__state=GirderImport.State.SUCCEEDED
+            )
+        ),
+        modified__lt=cutoff,
+    )
+
+
+def orphaned_asset_metadata(cutoff: datetime) -> QuerySet:
+    return AssetMetadata.objects.filter(
+        ~Exists(Asset.objects.filter(metadata=OuterRef('pk'))), modified__lt=cutoff
+    )
+
+
+def orphaned_version_metadata(cutoff: datetime) -> QuerySet:
+    return VersionMetadata.objects.filter(
+        ~Exists(Version.objects.filter(metadata=OuterRef('pk'))), modified__lt=cutoff
+    )
+
+
+def _claim_batch(queryset: QuerySet, batch_size: int) -> List[int]:
+    # Rows locked by a concurrent collection are left to it
+    return list(
+        queryset.select_for_update(skip_locked=True).values_list('pk', flat=True)[:batch_size]
+    )
+
+
+def _delete_rows(queryset: QuerySet, batch_size: int, pause: float) -> int:
+    deleted = 0
+    while True:
+        with transaction.atomic():
+            batch = _claim_batch(queryset, batch_size)
+            if not batch:
+                return deleted
+            # Filter the original queryset again, in case a row was referenced in the meantime
+            _, deleted_per_model = queryset.filter(pk__in=batch).delete()
+        deleted += deleted_per_model.get(queryset.model._meta.label, 0)
+        time.sleep(pause)
+
+
+def _delete_asset_blobs(queryset: QuerySet, batch_size: int, pause: float) -> Tuple[int, int]:
+    storage = AssetBlob.blob.field.storage
+    deleted = 0
+    deleted_bytes = 0
+    while True:
+        with transaction.atomic():
+            batch = _claim_batch(queryset, batch_size)
+            if not batch:
+                return deleted, deleted_bytes
+            asset_blobs = list(queryset.filter(pk__in=batch).values_list('blob', 'size', 'counted'))
+            queryset.filter(pk__in=batch).delete()
+            keys = {key for key, _, _ in asset_blobs}
+            # Never delete an object which is still referenced by another row
+            keys -= set(AssetBlob.objects.filter(blob__in=keys).values_list('blob', flat=True))
+            # Only blobs which were counted in the archive size are subtracted from it
+            counted_bytes = sum(size for _, size, counted in asset_blobs if counted)
+            if counted_bytes:
+                transaction.on_commit(
+                    functools.partial(StatsSnapshot.increment, size=-counted_bytes)
+                )
+
+        # The rows are deleted first, so a failure here can only leak objects, never rows
+        delete_objects(storage, sorted(keys))
+        deleted += len(asset_blobs)
+        deleted_bytes += sum(size for _, size, _ in asset_blobs)
+        time.sleep(pause)
+
+
+def abandoned_uploads(cutoff: datetime, batch_size: int) -> Iterator[List[str]]:
+    """Yield batches of keys of uploads older than cutoff, which are not in use."""
+    storage = Validation.blob.field.storage
+    batch = []
+    for key, last_modified in list_objects(storage, UPLOADS_PREFIX):
+        if last_modified < cutoff:
+            batch.append(key)
+        if len(batch) == batch_size:
+            yield _exclude_in_use(batch)
+            batch = []
+    if batch:
+        yield _exclude_in_use(batch)
+
+
+def _exclude_in_use(keys: List[str]) -> List[str]:
+    validating = Validation.objects.filter(
+        blob__in=keys, state=Validation.State.IN_PROGRESS
+    ).values_list('blob', flat=True)
+    # Files being transferred by a Girder import are uploaded under their Girder ID
+    prefix = girder_importer.UPLOADS_PREFIX
+    transferring = GirderImportFile.objects.filter(
+        girder_id__in=[key[len(prefix) :] for key in keys if key.startswith(prefix)],
+        state=GirderImportFile.State.IN_PROGRESS,
+    ).values_list('girder_id', flat=True)
+    return sorted(
+        set(keys) - set(validating) - {f'{prefix}{girder_id}' for girder_id in transferring}
+    )
+
+
+def collect_garbage(
+    grace_period: timedelta = DEFAULT_GRACE_PERIOD,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    pause: float = 0,
+    dry_run: bool = False,
+) -> GarbageReport:
+    """
+    Delete everything which is unreferenced and older than the grace period.
+
+    Deletions are made in batches of batch_size rows, pausing for pause seconds between
+    batches, to limit the load on the database and object store. With dry_run, nothing is
+    deleted, and the report only counts what would be deleted by this step alone; e.g. blobs
+    which are only referenced by orphaned assets are not counted.
+    """
+    cutoff = timezone.now() - grace_period
+    report = GarbageReport()
+
+    if dry_run:
+        report.assets = orphaned_assets(cutoff).count()
+        asset_blobs = orphaned_asset_blobs(cutoff).aggregate(count=Count('pk'), size=Sum('size'))
+        report.asset_blobs = asset_blobs['count']
+        report.asset_blob_bytes = asset_blobs['size'] or 0
+        report.asset_metadata = orphaned_asset_metadata(cutoff).count()
+        report.version_metadata = orphaned_version_metadata(cutoff).count()
+        report.uploads = sum(len(batch) for batch in abandoned_uploads(cutoff, batch_size))
+        return report
+
+    report.assets = _delete_rows(orphaned_assets(cutoff), batch_size, pause)
+    report.asset_blobs, report.asset_blob_bytes = _delete_asset_blobs(
+        orphaned_asset_blobs(cutoff), batch_size, pause
+    )
+    report.asset_metadata = _delete_rows(orphaned_asset_metadata(cutoff), batch_size, pause)
+    report.version_metadata = _delete_rows(orphaned_version_metadata(cutoff), batch_size, pause)
+
+    storage = Validation.blob.field.storage
+    for batch in abandoned_uploads(cutoff, batch_size):
+        delete_objects(storage, batch)
+        report.uploads += len(batch)
+        time.sleep(pause)
+
+    return report
+
+
+def _abort(storage, upload: MultipartUpload) -> bool:
+    """Abort an upload, returning whether it is gone."""
+    try:
+        # An upload which no longer exists was completed without being validated, or was
+        # aborted by an earlier attempt; either way, there is nothing left to abort
+        abort_multipart_upload(storage, upload.object_key, upload.upload_id)
+    except Exception:
+        # It is retried by the next reap
+        logger.exception('Failed to abort multipart upload %s', upload.object_key)
+        return False
+    return True
+
+
+def reap_multipart_uploads(batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+    """Abort every multipart upload which has expired, returning how many were reaped."""
+    storage = Validation.blob.field.storage
+    expired = MultipartUpload.objects.filter(
+        created__lt=timezone.now() - MultipartUpload.EXPIRY
+    ).order_by('pk')
+    reaped = 0
+    with ThreadPoolExecutor(max_workers=ABORT_WORKERS) as executor:
+        last_pk = 0
+        while True:
+            batch = list(expired.filter(pk__gt=last_pk)[:batch_size])
+            if not batch:
+                return reaped
+            last_pk = batch[-1].pk
+            gone = executor.map(lambda upload: _abort(storage, upload), batch)
+            aborted = [upload.pk for upload, upload_gone in zip(batch, gone) if upload_gone]
+            reaped += MultipartUpload.forget(MultipartUpload.objects.filter(pk__in=aborted))
@@ -1,9 +1,21 @@
+import asyncio
 import contextlib
 from dataclasses import dataclass
-from typing import Any, Dict, Iterator, List
+import hashlib
+import json
+import os
+from pathlib import Path
+import tempfile
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional
 
 from django.conf import settings
-from httpx import Client
+from httpx import AsyncClient, Client, Limits
+
+try:
+    import h2
+except ImportError:
+    # AsyncGirderClient will fall back to HTTP/1.1
+    h2 = None
 
 
 class GirderError(Exception):
@@ -17,22 +29,42 @@ class GirderFile:
     metadata: Dict[str, Any]
     size: int
 
+    @classmethod
+    def from_item(cls, item: Dict, file_list: List[Dict], current_path: str) -> 'GirderFile':
+        if len(file_list) != 1:
+            raise GirderError(f'Found {len(file_list)} files in item {item["_id"]}')
+
+        f = file_list[0]
+        if f['size'] == 0:
+            raise GirderError(f'Found empty file {f["_id"]}')
+
+        return cls(
+            girder_id=f['_id'],
+            # Use item name instead of file name, since it's more likely to reflect an
+            # explicit rename operation in Girder
+            path=f'{current_path}{item["name"]}',
+            metadata=item['meta'],
+            size=f['size'],
+        )
+
+
+def _girder_api_url() -> str:
+    girder_api_url = settings.DANDI_GIRDER_API_URL
+    if not girder_api_url.endswith('/'):
+        girder_api_url += '/'
+    return girder_api_url
+
 
 class GirderClient(Client):
     def __init__(self, authenticate=False, **kwargs):
-        girder_api_url = settings.DANDI_GIRDER_API_URL
-        girder_api_key = settings.DANDI_GIRDER_API_KEY
-        if not girder_api_url.endswith('/'):
-            girder_api_url += '/'
-
-        kwargs.setdefault('base_url', girder_api_url)
+        kwargs.setdefault('base_url', _girder_api_url())
         super().__init__(**kwargs)
 
         if not authenticate:
             return
 
         # Fetch the token using the API key
-        resp = self.post('api_key/token', params={'key': girder_api_key})
+        resp = self.post('api_key/token', params={'key': settings.DANDI_GIRDER_API_KEY})
         if resp.status_code != 200:
             raise GirderError('Failed to authenticate with Girder')
         token = resp.json()['authToken']['token']
@@ -65,36 +97,182 @@ class GirderClient(Client):
             resp.raise_for_status()
             yield resp.iter_bytes()
 
-    @contextlib.contextmanager
-    def dandiset_lock(self, dandiset_identifier: str) -> None:
+    def lock_dandiset(self, dandiset_identifier: str) -> None:
         resp = self.post(f'dandi/{dandiset_identifier}/lock')
         if resp.status_code != 200:
             raise GirderError(f'Failed to lock dandiset {dandiset_identifier}')
+
+    def unlock_dandiset(self, dandiset_identifier: str) -> None:
+        resp = self.post(f'dandi/{dandiset_identifier}/unlock')
+        if resp.status_code != 200:
+            raise GirderError(f'Failed to unlock dandiset {dandiset_identifier}')
+
+    @contextlib.contextmanager
+    def dandiset_lock(self, dandiset_identifier: str) -> None:
+        self.lock_dandiset(dandiset_identifier)
         try:
             yield
         finally:
-            resp = self.post(f'dandi/{dandiset_identifier}/unlock')
-            if resp.status_code != 200:
-                raise GirderError(f'Failed to unlock dandiset {dandiset_identifier}')
+            self.unlock_dandiset(dandiset_identifier)
 
     def files_in_folder(self, folder_id: str, current_path: str = '/') -> Iterator[GirderFile]:
         for item in self.get_items(folder_id):
-            file_list = self.get_item_files(item['_id'])
-            if len(file_list) != 1:
-                raise GirderError(f'Found {len(file_list)} files in item {item["_id"]}')
-
-            f = file_list[0]
-            if f['size'] == 0:
-                raise GirderError(f'Found empty file {f["_id"]}')
-
-            yield GirderFile(
-                girder_id=f['_id'],
-                # Use item name instead of file name, since it's more likely to reflect an
-                # explicit rename operation in Girder
-                path=f'{current_path}{item["name"]}',
-                metadata=item['meta'],
-                size=f['size'],
-            )
+            yield GirderFile.from_item(item, self.get_item_files(item['_id']), current_path)
 
         for subfolder in self.get_subfolders(folder_id):
             yield from self.files_in_folder(subfolder['_id'], f'{current_path}{subfolder["name"]}/')
+
+
+class GirderListingCache:
+    """
+    An on-disk cache of Girder listing responses, keyed by URL.
+
+    Listings are never invalidated, so the cache should only be used when a stale listing is
+    acceptable, e.g. for dry runs of a migration; remove the directory to start afresh.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+
+    def _path(self, url: str) -> Path:
+        key = hashlib.sha256(url.encode()).hexdigest()
+        return self.directory / key[:2] / f'{key}.json'
+
+    def get(self, url: str) -> Optional[Any]:
+        try:
+            with self._path(url).open() as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def set(self, url: str, value: Any) -> None:
+        path = self._path(url)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write to a temporary file first, so a concurrent reader never sees a partial listing
+        fd, temp_path = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+        with os.fdopen(fd, 'w') as f:
+            json.dump(value, f)
+        os.replace(temp_path, path)
+
+
+class AsyncGirderClient(AsyncClient):
+    """
+    An asynchronous Girder client, for crawling large folder trees concurrently.
+
+    A crawl runs `concurrency` workers, each making one request at a time, so at most that many
+    requests are in flight at once; the connection pool is limited to the same size, and uses
+    HTTP/2 if h2 is installed, so requests are multiplexed over the pooled connections. Listings
+    are fetched in pages of `page_size` records, and read from `listing_cache`, if given.
+    """
+
+    def __init__(
+        self,
+        concurrency: int = 16,
+        page_size: int = 1000,
+        listing_cache: Optional[GirderListingCache] = None,
+        **kwargs,
+    ):
+        kwargs.setdefault('base_url', _girder_api_url())
+        kwargs.setdefault('limits', Limits(max_connections=concurrency))
+        kwargs.setdefault('http2', h2 is not None)
+        super().__init__(**kwargs)
+        self.concurrency = concurrency
+        self.page_size = page_size
+        self.listing_cache = listing_cache
+
+    async def authenticate(self) -> None:
+        resp = await self.post('api_key/token', params={'key': settings.DANDI_GIRDER_API_KEY})
+        if resp.status_code != 200:
+            raise GirderError('Failed to authenticate with Girder')
+        self.headers = {'Girder-Token': resp.json()['authToken']['token']}
+
+    async def get_json(self, *args, **kwargs) -> Any:
+        resp = await self.get(*args, **kwargs)
+        resp.raise_for_status()
+        return resp.json()
+
+    async def get_listing(self, path: str, params: Optional[Dict[str, Any]] = None) -> List[Dict]:
+        if self.listing_cache is None:
+            return await self.get_json(path, params=params)
+
+        url = str(self.build_request('GET', path, params=params).url)
+        listing = self.listing_cache.get(url)
+        if listing is None:
+            listing = await self.get_json(path, params=params)
+            self.listing_cache.set(url, listing)
+        return listing
+
+    async def get_page(self, path: str, params: Dict[str, Any], offset: int) -> List[Dict]:
+        return await self.get_listing(
+            path, params={**params, 'limit': self.page_size, 'offset': offset}
+        )
+
+    async def files_in_folder(
+        self, folder_id: str, current_path: str = '/'
+    ) -> AsyncIterator[GirderFile]:
+        """
+        Yield every file beneath a folder, in no particular order.
+
+        Pages of subfolders and items, and the files of each item, are fetched concurrently by a
+        pool of workers; each GirderFile is yielded as soon as it is found. Girder has no bulk
+        endpoint for the files of many items, so those requests are pipelined over the shared
+        connection pool instead.
+        """
+        # Jobs are (kind, target, path, offset) tuples, where target is a folder ID for
+        # 'items' and 'subfolders' listings, or an item for 'files'
+        jobs: asyncio.Queue = asyncio.Queue()
+        # Bound the results, so a slow consumer applies backpressure to the crawl
+        results: asyncio.Queue = asyncio.Queue(maxsize=self.page_size)
+        done = object()
+
+        async def run_job(kind: str, target: Any, path: str, offset: Optional[int]) -> None:
+            if kind == 'files':
+                file_list = await self.get_listing(f'item/{target["_id"]}/files')
+                await results.put(GirderFile.from_item(target, file_list, path))
+                return
+
+            if kind == 'subfolders':
+                params = {'parentId': target, 'parentType': 'folder'}
+                page = await self.get_page('folder', params, offset)
+                for subfolder in page:
+                    subfolder_path = f'{path}{subfolder["name"]}/'
+                    jobs.put_nowait(('items', subfolder['_id'], subfolder_path, 0))
+                    jobs.put_nowait(('subfolders', subfolder['_id'], subfolder_path, 0))
+            else:
+                page = await self.get_page('item', {'folderId': target}, offset)
+                for item in page:
+                    jobs.put_nowait(('files', item, path, None))
+
+            if len(page) == self.page_size:
+                jobs.put_nowait((kind, target, path, offset + len(page)))
+
+        async def worker() -> None:
+            while True:
+                job = await jobs.get()
+                try:
+                    await run_job(*job)
+                except Exception as e:
+                    await results.put(e)
+                finally:
+                    jobs.task_done()
+
+        async def monitor() -> None:
+            await jobs.join()
+            await results.put(done)
+
+        jobs.put_nowait(('items', folder_id, current_path, 0))
+        jobs.put_nowait(('subfolders', folder_id, current_path, 0))
+        tasks = [asyncio.ensure_future(worker()) for _ in range(self.concurrency)]
+        tasks.append(asyncio.ensure_future(monitor()))
+        try:
+            while True:
+                result = await results.get()
+                if result is done:
+                    return
+                if isinstance(result, Exception):
+                    raise result
+                yield result
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
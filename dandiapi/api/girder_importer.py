@@ -0,0 +1,321 @@
+"""
+Migration of dandisets from Girder.
+
+A migration is split into three steps, each of which may be safely repeated, so an interrupted
+migration can resume from the checkpoint recorded by its GirderImport:
+
+1. crawl: lock the dandiset in Girder, create the dandiset and its draft version, owned by the
+   importing user, and record every file in the Girder folder
+2. transfer: stream each claimed file into the blob store, computing its checksum in the same
+   pass
+3. finalize: register every transferred file as an asset of the draft version, and unlock the
+   dandiset in Girder
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+import hashlib
+import logging
+import re
+from typing import Dict, Iterator, List, Optional
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from dandiapi.api.copy import move_object, upload_object
+from dandiapi.api.girder import (
+    AsyncGirderClient,
+    GirderClient,
+    GirderError,
+    GirderFile,
+    GirderListingCache,
+)
+from dandiapi.api.models import (
+    Asset,
+    AssetBlob,
+    AssetMetadata,
+    Dandiset,
+    GirderImport,
+    GirderImportFile,
+    Version,
+    VersionMetadata,
+)
+
+FINALIZE_BATCH_SIZE = 1000
+# Files are uploaded under this prefix, until their checksum is known
+UPLOADS_PREFIX = 'uploads/girder/'
+# A transfer which has been in progress for this long is assumed to have been interrupted
+STALE_TRANSFER_AGE = timedelta(hours=24)
+
+logger = logging.getLogger(__name__)
+
+
+class HashingReader:
+    """A readable file-like object over an iterator of bytes, which hashes everything read."""
+
+    def __init__(self, chunks: Iterator[bytes]):
+        self._chunks = iter(chunks)
+        self._buffer = bytearray()
+        self.h = hashlib.sha256()
+        self.size = 0
+
+    def read(self, size: int = -1) -> bytes:
+        while size < 0 or len(self._buffer) < size:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                break
+            self._buffer += chunk
+
+        if size < 0:
+            size = len(self._buffer)
+        data = bytes(self._buffer[:size])
+        del self._buffer[:size]
+
+        self.h.update(data)
+        self.size += len(data)
+        return data
+
+    @property
+    def checksum(self) -> str:
+        return self.h.hexdigest()
+
+
+def _create_dandiset(folder: Dict) -> Dandiset:
+    identifier = folder['name']
+    if not re.fullmatch(Dandiset.IDENTIFIER_REGEX, identifier):
+        raise GirderError(f'Folder {folder["_id"]} is not a dandiset')
+    if Dandiset.objects.filter(id=int(identifier)).exists():
+        raise GirderError(f'Dandiset {identifier} already exists')
+
+    metadata = folder['meta']['dandiset']
+    version_metadata, created = VersionMetadata.objects.get_or_create(
+        name=metadata['name'], metadata=metadata
+    )
+    if created:
+        version_metadata.save()
+
+    # Keep the identifier the dandiset had in Girder
+    dandiset = Dandiset(id=int(identifier))
+    dandiset.save(force_insert=True)
+    Version(dandiset=dandiset, metadata=version_metadata, version='draft').save()
+    return dandiset
+
+
+async def _files_in_folder(
+    girder_folder_id: str, headers, listing_cache: Optional[GirderListingCache] = None
+) -> List[GirderFile]:
+    async with AsyncGirderClient(headers=headers, listing_cache=listing_cache) as client:
+        return [f async for f in client.files_in_folder(girder_folder_id)]
+
+
+def list_files(girder_folder_id: str, client: GirderClient) -> List[GirderFile]:
+    """
+    List every file in a Girder folder, without importing anything.
+
+    Listings are cached in DANDI_GIRDER_LISTING_CACHE_DIR, if it is set, so repeated dry runs
+    don't query Girder again. A real crawl never reads the cache, since it may be stale.
+    """
+    listing_cache = None
+    if settings.DANDI_GIRDER_LISTING_CACHE_DIR:
+        listing_cache = GirderListingCache(settings.DANDI_GIRDER_LISTING_CACHE_DIR)
+    return asyncio.run(_files_in_folder(girder_folder_id, client.headers, listing_cache))
+
+
+def lock(girder_import: GirderImport, client: GirderClient) -> None:
+    """Lock the dandiset in Girder, unless an earlier attempt at the import already did."""
+    if girder_import.locked:
+        return
+    folder = client.get_folder(girder_import.girder_folder_id)
+    client.lock_dandiset(folder['name'])
+    girder_import.locked = True
+    girder_import.save()
+
+
+def crawl(girder_import: GirderImport, client: GirderClient) -> None:
+    """Create the dandiset being imported, and record every file which must be transferred."""
+    lock(girder_import, client)
+    if girder_import.dandiset is None:
+        folder = client.get_folder(girder_import.girder_folder_id)
+        with transaction.atomic():
+            girder_import.dandiset = _create_dandiset(folder)
+            if girder_import.owner is not None:
+                girder_import.dandiset.add_owner(girder_import.owner)
+            girder_import.save()
+
+    # The ORM can't be used from within an event loop, so collect the whole listing first
+    girder_files = asyncio.run(_files_in_folder(girder_import.girder_folder_id, client.headers))
+    # Files recorded by an earlier, interrupted crawl are left as they are
+    GirderImportFile.objects.bulk_create(
+        [
+            GirderImportFile(
+                girder_import=girder_import,
+                girder_id=f.girder_id,
+                # Asset paths are relative to the root of the dandiset
+                path=f.path.lstrip('/'),
+                metadata=f.metadata,
+                size=f.size,
+            )
+            for f in girder_files
+        ],
+        batch_size=FINALIZE_BATCH_SIZE,
+        ignore_conflicts=True,
+    )
+
+    girder_import.state = GirderImport.State.TRANSFERRING
+    girder_import.save()
+
+
+def _store_blob(storage, upload_key: str, sha256: str, size: int) -> AssetBlob:
+    with transaction.atomic():
+        # Concurrent transfers of the same content must not both create a blob, so serialize them
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT pg_advisory_xact_lock(hashtext(%s))', [sha256])
+
+        # Reused blobs are modified again, so garbage collection can't delete them in the meantime
+        AssetBlob.objects.filter(sha256=sha256).update(modified=timezone.now())
+        asset_blob = AssetBlob.objects.filter(sha256=sha256).first()
+        if asset_blob is not None:
+            # The same content was already imported or uploaded
+            storage.delete(upload_key)
+            return asset_blob
+
+        destination = AssetBlob.blob_key(sha256)
+        move_object(storage, upload_key, destination)
+        asset_blob = AssetBlob(blob=destination, sha256=sha256, size=size)
+        asset_blob.save()
+        return asset_blob
+
+
+def claim_pending(girder_import: GirderImport) -> List[int]:
+    """
+    Mark every file which still needs to be transferred as in progress, and return their IDs.
+
+    Files which are already in progress are not claimed again, unless they appear to have been
+    abandoned by an interrupted transfer.
+    """
+    with transaction.atomic():
+        pending = girder_import.files.filter(
+            Q(state__in=[GirderImportFile.State.PENDING, GirderImportFile.State.FAILED])
+            | Q(
+                state=GirderImportFile.State.IN_PROGRESS,
+                modified__lt=timezone.now() - STALE_TRANSFER_AGE,
+            )
+        )
+        # Skip rows being claimed by a concurrent call
+        claimed = list(pending.select_for_update(skip_locked=True).values_list('id', flat=True))
+        GirderImportFile.objects.filter(id__in=claimed).update(
+            state=GirderImportFile.State.IN_PROGRESS, modified=timezone.now()
+        )
+    return claimed
+
+
+def transfer(import_file: GirderImportFile, client: GirderClient) -> bool:
+    """
+    Copy the content of a file from Girder into the blob store.
+
+    Return whether the transfer succeeded; a failure is recorded on the file, to be retried when
+    the import is resumed.
+    """
+    if import_file.blob is not None:
+        return True
+
+    storage = AssetBlob.blob.field.storage
+    # The checksum, and so the final key, is not known until the content has been read
+    upload_key = f'{UPLOADS_PREFIX}{import_file.girder_id}'
+    try:
+        with client.iter_file_content(import_file.girder_id) as content:
+            reader = HashingReader(content)
+            upload_object(storage, upload_key, reader, import_file.size)
+
+        if reader.size != import_file.size:
+            storage.delete(upload_key)
+            raise GirderError(
+                f'Expected {import_file.size} bytes in file {import_file.girder_id}, '
+                f'got {reader.size}'
+            )
+
+        asset_blob = _store_blob(storage, upload_key, reader.checksum, reader.size)
+    except Exception as e:
+        logger.error('Failed to transfer %s', import_file.girder_id, exc_info=True)
+        import_file.state = GirderImportFile.State.FAILED
+        import_file.error = str(e)
+        import_file.save()
+        return False
+
+    import_file.blob = asset_blob
+    import_file.state = GirderImportFile.State.SUCCEEDED
+    import_file.error = None
+    import_file.save()
+    return True
+
+
+def _transfer_in_thread(import_file_id: int, client: GirderClient) -> bool:
+    try:
+        return transfer(GirderImportFile.objects.get(pk=import_file_id), client)
+    finally:
+        # Each thread opens its own database connection
+        connection.close()
+
+
+def transfer_pending(girder_import: GirderImport, client: GirderClient, workers: int = 1) -> int:
+    """
+    Transfer every file which has not been transferred yet, in parallel.
+
+    Return the number of failed transfers.
+    """
+    claimed = claim_pending(girder_import)
+    if workers == 1:
+        results = [
+            transfer(import_file, client)
+            for import_file in GirderImportFile.objects.filter(id__in=claimed).iterator()
+        ]
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(
+                executor.map(
+                    lambda import_file_id: _transfer_in_thread(import_file_id, client), claimed
+                )
+            )
+    return results.count(False)
+
+
+def finalize(girder_import: GirderImport, client: GirderClient) -> bool:
+    """
+    Register every transferred file as an asset of the imported draft version.
+
+    Return whether the import is complete.
+    """
+    with transaction.atomic():
+        # Lock the import, since concurrent transfers may each attempt to finalize it
+        girder_import = GirderImport.objects.select_for_update().get(pk=girder_import.pk)
+        if girder_import.state != GirderImport.State.TRANSFERRING:
+            return girder_import.state == GirderImport.State.SUCCEEDED
+        if girder_import.files.exclude(state=GirderImportFile.State.SUCCEEDED).exists():
+            return False
+
+        version = Version.objects.get(dandiset=girder_import.dandiset, version='draft')
+        import_files = girder_import.files.filter(asset__isnull=True).select_related('blob')
+        while True:
+            batch = list(import_files[:FINALIZE_BATCH_SIZE])
+            if not batch:
+                break
+            for import_file in batch:
+                asset_metadata, created = AssetMetadata.objects.get_or_create(
+                    metadata=import_file.metadata
+                )
+                if created:
+                    asset_metadata.save()
+                asset = Asset(path=import_file.path, blob=import_file.blob, metadata=asset_metadata)
+                asset.save()
+                import_file.asset = asset
+            version.assets.add(*[import_file.asset for import_file in batch])
+            GirderImportFile.objects.bulk_update(batch, ['asset'])
+
+        if girder_import.locked:
+            client.unlock_dandiset(girder_import.dandiset.identifier)
+        girder_import.state = GirderImport.State.SUCCEEDED
+        girder_import.locked = False
+        girder_import.save()
+    return True
@@ -0,0 +1,267 @@
+"""
+Synthetic load on the ingestion path of the API.
+
+Each simulated client repeatedly uploads a file of random content and registers it as an asset,
+the same way the CLI does: initialize a multipart upload, PUT each part to its presigned URL,
+complete the upload, start its validation, poll until the validation finishes, and finally
+create the asset in a draft version. The duration of every stage is recorded, so the slowest
+part of the path can be found before a large data release.
+"""
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+import hashlib
+import math
+import os
+import random
+import secrets
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+import httpx
+
+STAGES = ['initialize', 'upload', 'complete', 'validate', 'poll', 'register']
+DEFAULT_POLL_INTERVAL = 0.5
+DEFAULT_TIMEOUT = 600
+
+
+class LoadGenerationError(Exception):
+    pass
+
+
+def fixed_sizes(size: int) -> Callable[[random.Random], int]:
+    return lambda rng: size
+
+
+def uniform_sizes(size: int) -> Callable[[random.Random], int]:
+    """Sizes between 1 byte and twice size, so their mean is size."""
+    return lambda rng: rng.randint(1, 2 * size)
+
+
+def lognormal_sizes(size: int, sigma: float) -> Callable[[random.Random], int]:
+    """Sizes with a long tail of large files, whose median is size."""
+    return lambda rng: max(1, round(rng.lognormvariate(math.log(size), sigma)))
+
+
+def percentile(values: List[float], percent: float) -> float:
+    """Return the nearest-rank percentile of some values."""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(len(ordered) * percent / 100) - 1)]
+
+
+@dataclass
+class LoadReport:
+    dandiset_identifier: Optional[str] = None
+    files: int = 0
+    bytes: int = 0
+    elapsed: float = 0
+    durations: Dict[str, List[float]] = field(default_factory=lambda: defaultdict(list))
+    errors: List[str] = field(default_factory=list)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def record(self, size: int, durations: Dict[str, float]) -> None:
+        with self._lock:
+            self.files += 1
+            self.bytes += size
+            for stage, duration in durations.items():
+                self.durations[stage].append(duration)
+
+    def record_failure(self, error: str) -> None:
+        with self._lock:
+            self.errors.append(error)
+
+    @property
+    def failures(self) -> int:
+        return len(self.errors)
+
+    @property
+    def throughput(self) -> float:
+        """Bytes ingested per second, from the first upload to the last registration."""
+        return self.bytes / self.elapsed if self.elapsed else 0
+
+    def __str__(self) -> str:
+        lines = [
+            f'Ingested {self.files} files ({self.bytes} bytes) into dandiset '
+            f'{self.dandiset_identifier} in {self.elapsed:.1f} s, '
+            f'{self.failures} failed',
+            f'Throughput: {self.throughput / 2 ** 20:.2f} MB/s, '
+            f'{self.files / self.elapsed if self.elapsed else 0:.2f} files/s',
+        ]
+        for stage in [*STAGES, 'total']:
+            durations = self.durations.get(stage)
+            if durations:
+                lines.append(
+                    f'  {stage}: '
+                    + ', '.join(
+                        f'p{p} {percentile(durations, p) * 1000:.0f} ms' for p in [50, 90, 99]
+                    )
+                )
+        return '\n'.join(lines)
+
+
+class SimulatedClient:
+    """A client of the API, which uploads files and registers them as assets."""
+
+    def __init__(
+        self,
+        api: httpx.Client,
+        storage: httpx.Client,
+        dandiset_identifier: str,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        timeout: float = DEFAULT_TIMEOUT,
+    ):
+        self.api = api
+        self.storage = storage
+        self.assets_url = f'/api/dandisets/{dandiset_identifier}/versions/draft/assets/'
+        self.poll_interval = poll_interval
+        self.timeout = timeout
+
+    def _request(self, client: httpx.Client, method: str, url: str, **kwargs) -> httpx.Response:
+        response = client.request(method, url, **kwargs)
+        if response.is_error:
+            raise LoadGenerationError(
+                f'{method} {url} failed with {response.status_code}: {response.text}'
+            )
+        return response
+
+    def ingest(self, path: str, size: int) -> Dict[str, float]:
+        """Upload and register a file of random content, returning the duration of each stage."""
+        durations = {}
+        start = stage_start = time.monotonic()
+
+        def finish(stage: str) -> None:
+            nonlocal stage_start
+            now = time.monotonic()
+            durations[stage] = now - stage_start
+            stage_start = now
+
+        initialization = self._request(
+            self.api, 'POST', '/api/uploads/initialize/', json={'file_size': size}
+        ).json()
+        finish('initialize')
+
+        h = hashlib.sha256()
+        parts = []
+        for part_number, part in enumerate(initialization['parts'], start=1):
+            data = os.urandom(part['size'])
+            h.update(data)
+            response = self._request(self.storage, 'PUT', part['upload_url'], content=data)
+            parts.append(
+                {'part_number': part_number, 'size': part['size'], 'etag': response.headers['etag']}
+            )
+        sha256 = h.hexdigest()
+        finish('upload')
+
+        completion = self._request(
+            self.api,
+            'POST',
+            '/api/uploads/complete/',
+            json={
+                'object_key': initialization['object_key'],
+                'upload_id': initialization['upload_id'],
+                'parts': parts,
+            },
+        ).json()
+        self._request(self.storage, 'POST', completion['complete_url'], content=completion['body'])
+        finish('complete')
+
+        self._request(
+            self.api,
+            'POST',
+            '/api/uploads/validate/',
+            json={'object_key': initialization['object_key'], 'sha256': sha256},
+        )
+        finish('validate')
+
+        deadline = time.monotonic() + self.timeout
+        while True:
+            validation = self._request(
+                self.api, 'GET', f'/api/uploads/validations/{sha256}/'
+            ).json()
+            if validation['state'] == 'SUCCEEDED':
+                break
+            if validation['state'] == 'FAILED':
+                raise LoadGenerationError(f'Validation of {path} failed: {validation["error"]}')
+            if time.monotonic() > deadline:
+                raise LoadGenerationError(f'Validation of {path} timed out')
+            time.sleep(self.poll_interval)
+        finish('poll')
+
+        self._request(
+            self.api,
+            'POST',
+            self.assets_url,
+            json={'metadata': {'path': path}, 'sha256': sha256},
+        )
+        finish('register')
+
+        durations['total'] = time.monotonic() - start
+        return durations
+
+
+def generate_load(
+    api_url: str,
+    token: str,
+    clients: int,
+    files: int,
+    sizes: Callable[[random.Random], int],
+    dandiset_identifier: Optional[str] = None,
+    seed: Optional[int] = None,
+    poll_interval: float = DEFAULT_POLL_INTERVAL,
+    timeout: float = DEFAULT_TIMEOUT,
+    **kwargs,
+) -> LoadReport:
+    """
+    Ingest files into a dandiset from many concurrent clients.
+
+    Every client has its own connections, and ingests files one at a time, until files have been
+    ingested between all of them. A failed file is reported, and does not stop its client. Unless
+    dandiset_identifier is given, a new dandiset is created for the files. Any other kwargs are
+    passed to the httpx.Client of the API.
+    """
+    report = LoadReport()
+    rng = random.Random(seed)
+    # Sizes are drawn up front, so a seed reproduces the same load regardless of scheduling
+    file_sizes = [sizes(rng) for _ in range(files)]
+    run_id = secrets.token_hex(4)
+
+    def api_client() -> httpx.Client:
+        return httpx.Client(
+            base_url=api_url,
+            headers={'Authorization': f'Token {token}'},
+            timeout=timeout,
+            **kwargs,
+        )
+
+    if dandiset_identifier is None:
+        with api_client() as api:
+            response = api.post(
+                '/api/dandisets/', json={'name': f'Load test {run_id}', 'metadata': {}}
+            )
+            response.raise_for_status()
+            dandiset_identifier = response.json()['identifier']
+    report.dandiset_identifier = dandiset_identifier
+
+    remaining = iter(enumerate(file_sizes))
+    remaining_lock = threading.Lock()
+
+    def run_client(client_number: int) -> None:
+        with api_client() as api, httpx.Client(timeout=timeout) as storage:
+            client = SimulatedClient(api, storage, dandiset_identifier, poll_interval, timeout)
+            while True:
+                with remaining_lock:
+                    file_number, size = next(remaining, (None, None))
+                if file_number is None:
+                    return
+                path = f'load-{run_id}/client{client_number}/file{file_number}.dat'
+                try:
+                    report.record(size, client.ingest(path, size))
+                except (LoadGenerationError, httpx.HTTPError) as e:
+                    report.record_failure(f'{path}: {e}')
+
+    start = time.monotonic()
+    with ThreadPoolExecutor(max_workers=clients) as executor:
+        list(executor.map(run_client, range(clients)))
+    report.elapsed = time.monotonic() - start
+    return report
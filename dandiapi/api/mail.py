@@ -1,3 +1,7 @@
+import smtplib
+import socket
+from typing import Iterator, List
+
 from django.core import mail
 
 FROM_EMAIL = 'admin@api.dandiarchive.org'
@@ -9,60 +13,86 @@ def build_message(subject, message, to, html_message):
     return message
 
 
-def removed_subject(dandiset):
-    return f'Removed from Dandiset "{dandiset.most_recent_version.name}"'
+def removed_subject(dandiset_name):
+    return f'Removed from Dandiset "{dandiset_name}"'
 
 
-def removed_message(dandiset):
-    return f'You have been removed as an owner of Dandiset "{dandiset.most_recent_version.name}".'
+def removed_message(dandiset_name):
+    return f'You have been removed as an owner of Dandiset "{dandiset_name}".'
 
 
-def removed_html_message(dandiset):
+def removed_html_message(dandiset, dandiset_name):
     return (
         'You have been removed as an owner of Dandiset '
         f'<a href="https://dandiarchive.org/dandiset/{dandiset.identifier}">'
-        f'{dandiset.most_recent_version.name}'
+        f'{dandiset_name}'
         '</a>.'
     )
 
 
-def build_removed_message(dandiset, removed_owner):
+def build_removed_message(dandiset, dandiset_name, removed_owner):
     return build_message(
-        subject=removed_subject(dandiset),
-        message=removed_message(dandiset),
+        subject=removed_subject(dandiset_name),
+        message=removed_message(dandiset_name),
         to=removed_owner,
-        html_message=removed_html_message(dandiset),
+        html_message=removed_html_message(dandiset, dandiset_name),
     )
 
 
-def added_subject(dandiset):
-    return f'Added to Dandiset "{dandiset.most_recent_version.name}"'
+def added_subject(dandiset_name):
+    return f'Added to Dandiset "{dandiset_name}"'
 
 
-def added_message(dandiset):
-    return f'You have been made an owner of Dandiset "{dandiset.most_recent_version.name}".'
+def added_message(dandiset_name):
+    return f'You have been made an owner of Dandiset "{dandiset_name}".'
 
 
-def added_html_message(dandiset):
+def added_html_message(dandiset, dandiset_name):
     return (
         'You have been made an owner of Dandiset '
         f'<a href="https://dandiarchive.org/dandiset/{dandiset.identifier}">'
-        f'{dandiset.most_recent_version.name}'
+        f'{dandiset_name}'
         '</a>.'
     )
 
 
-def build_added_message(dandiset, added_owner):
+def build_added_message(dandiset, dandiset_name, added_owner):
     return build_message(
-        subject=added_subject(dandiset),
-        message=added_message(dandiset),
+        subject=added_subject(dandiset_name),
+        message=added_message(dandiset_name),
         to=added_owner,
-        html_message=added_html_message(dandiset),
+        html_message=added_html_message(dandiset, dandiset_name),
     )
 
 
-def send_ownership_change_emails(dandiset, removed_owners, added_owners):
-    messages = [build_removed_message(dandiset, removed_owner) for removed_owner in removed_owners]
-    messages += [build_added_message(dandiset, added_owner) for added_owner in added_owners]
+def build_ownership_change_messages(
+    dandiset, removed_owners, added_owners
+) -> List[mail.EmailMessage]:
+    """Build the messages to the removed owners, followed by those to the added owners."""
+    # Finding the most recent version is a query, so it is only done once for every message
+    dandiset_name = dandiset.most_recent_version.name
+    messages = [
+        build_removed_message(dandiset, dandiset_name, removed_owner)
+        for removed_owner in removed_owners
+    ]
+    messages += [
+        build_added_message(dandiset, dandiset_name, added_owner) for added_owner in added_owners
+    ]
+    return messages
+
+
+def send_messages(messages: List[mail.EmailMessage]) -> Iterator[int]:
+    """Send messages over one connection, yielding how many have been sent after each one."""
     with mail.get_connection() as connection:
-        connection.send_messages(messages)
+        # One at a time, since a failure part way through a batch doesn't tell which were sent
+        for sent, message in enumerate(messages, 1):
+            connection.send_messages([message])
+            yield sent
+
+
+def is_transient_error(error: Exception) -> bool:
+    """Whether sending a message might succeed if it is tried again later."""
+    if isinstance(error, smtplib.SMTPResponseException):
+        # 4xx replies are temporary, e.g. when the server is busy
+        return 400 <= error.smtp_code < 500
+    return isinstance(error, (smtplib.SMTPServerDisconnected, ConnectionError, socket.timeout))
@@ -0,0 +1,61 @@
+import time
+
+from django.core.management.base import BaseCommand
+from rest_framework.renderers import JSONRenderer
+
+from dandiapi.api.models import Asset, Version
+from dandiapi.api.renderers import FastJSONRenderer
+from dandiapi.api.views.serializers import (
+    AssetSerializer,
+    AssetValuesSerializer,
+    VersionSerializer,
+    VersionValuesSerializer,
+)
+
+
+def render_model_serializer(queryset, serializer_class) -> bytes:
+    return JSONRenderer().render(serializer_class(queryset, many=True).data)
+
+
+def render_values_serializer(queryset, values_serializer) -> bytes:
+    return FastJSONRenderer().render(
+        [values_serializer.to_representation(row) for row in values_serializer.values(queryset)]
+    )
+
+
+def best_time(repeat: int, func, *args) -> float:
+    """Return the best time of several runs, in seconds, including database queries."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+class Command(BaseCommand):
+    help = 'Compare the per-row cost of serializing asset and version listings.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1000, help='Number of rows to serialize.')
+        parser.add_argument('--repeat', type=int, default=5, help='Number of timed repetitions.')
+
+    def handle(self, *args, rows, repeat, **kwargs):
+        for name, model, serializer_class, values_serializer in [
+            ('asset', Asset, AssetSerializer, AssetValuesSerializer),
+            ('version', Version, VersionSerializer, VersionValuesSerializer),
+        ]:
+            queryset = model.objects.order_by('pk')[:rows]
+            count = queryset.count()
+            if not count:
+                self.stdout.write(f'{name}: no rows to serialize, skipping')
+                continue
+
+            before = best_time(repeat, render_model_serializer, queryset, serializer_class) / count
+            after = best_time(repeat, render_values_serializer, queryset, values_serializer) / count
+            self.stdout.write(
+                f'{name} ({count} rows): '
+                f'ModelSerializer + JSONRenderer {before * 1e6:.1f} us/row, '
+                f'ValuesSerializer + FastJSONRenderer {after * 1e6:.1f} us/row '
+                f'({before / after:.1f}x)'
+            )
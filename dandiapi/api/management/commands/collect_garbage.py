@@ -0,0 +1,46 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from dandiapi.api import garbage_collection
+
+
+class Command(BaseCommand):
+    help = (
+        'Delete assets which belong to no version, blobs and metadata which are no longer '
+        'referenced, and abandoned uploads.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Report what would be deleted, without deleting anything.',
+        )
+        parser.add_argument(
+            '--grace-period',
+            type=float,
+            default=garbage_collection.DEFAULT_GRACE_PERIOD.days,
+            help='Only delete what was last modified at least this many days ago.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=garbage_collection.DEFAULT_BATCH_SIZE,
+            help='Number of rows or objects to delete at once.',
+        )
+        parser.add_argument(
+            '--pause',
+            type=float,
+            default=0,
+            help='Seconds to wait between batches, to limit the load on the database and S3.',
+        )
+
+    def handle(self, *args, dry_run, grace_period, batch_size, pause, **kwargs):
+        report = garbage_collection.collect_garbage(
+            grace_period=timedelta(days=grace_period),
+            batch_size=batch_size,
+            pause=pause,
+            dry_run=dry_run,
+        )
+        self.stdout.write(f'{"Would delete" if dry_run else "Deleted"} {report}')
@@ -0,0 +1,94 @@
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.authtoken.models import Token
+
+from dandiapi.api import load_generator
+
+MB = 2 ** 20
+
+
+class Command(BaseCommand):
+    help = (
+        'Upload and register many files of random content from concurrent simulated clients, '
+        'and report the ingest throughput and the latency of each stage. '
+        'Only run this against a local or staging deployment.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--api-url',
+            default='http://localhost:8000',
+            help='Root URL of the deployment, which must share this database.',
+        )
+        parser.add_argument('--clients', type=int, default=8, help='Number of concurrent clients.')
+        parser.add_argument('--files', type=int, default=100, help='Number of files to ingest.')
+        parser.add_argument(
+            '--size-distribution',
+            choices=['fixed', 'uniform', 'lognormal'],
+            default='lognormal',
+            help='Distribution of file sizes.',
+        )
+        parser.add_argument(
+            '--size',
+            type=float,
+            default=1,
+            help=(
+                'File size in MB; the median size with a lognormal distribution, '
+                'or the mean size with a uniform distribution.'
+            ),
+        )
+        parser.add_argument(
+            '--sigma',
+            type=float,
+            default=1,
+            help='Standard deviation of the log of file sizes, with a lognormal distribution.',
+        )
+        parser.add_argument('--seed', type=int, help='Seed of the file sizes.')
+        parser.add_argument(
+            '--dandiset',
+            help='Identifier of the dandiset to register assets in; a new one by default.',
+        )
+        parser.add_argument(
+            '--username',
+            default='load-generator',
+            help='User to make requests as, which is created if it does not exist.',
+        )
+
+    def handle(
+        self,
+        *args,
+        api_url,
+        clients,
+        files,
+        size_distribution,
+        size,
+        sigma,
+        seed,
+        dandiset,
+        username,
+        **kwargs,
+    ):
+        size = max(1, round(size * MB))
+        sizes = {
+            'fixed': lambda: load_generator.fixed_sizes(size),
+            'uniform': lambda: load_generator.uniform_sizes(size),
+            'lognormal': lambda: load_generator.lognormal_sizes(size, sigma),
+        }[size_distribution]()
+
+        user, _ = User.objects.get_or_create(username=username)
+        token, _ = Token.objects.get_or_create(user=user)
+
+        report = load_generator.generate_load(
+            api_url,
+            token.key,
+            clients=clients,
+            files=files,
+            sizes=sizes,
+            dandiset_identifier=dandiset,
+            seed=seed,
+        )
+        self.stdout.write(str(report))
+        for error in report.errors:
+            self.stderr.write(error)
+        if report.failures:
+            raise CommandError(f'{report.failures} files failed to ingest')
@@ -0,0 +1,85 @@
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from dandiapi.api import girder_importer
+from dandiapi.api.girder import GirderClient
+from dandiapi.api.models import GirderImport
+from dandiapi.api.tasks import import_girder_dandiset
+
+
+class Command(BaseCommand):
+    help = (
+        'Import a dandiset from a Girder folder. '
+        'Running this again for the same folder resumes an interrupted import.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('girder_folder_id', help='The ID of the dandiset folder in Girder.')
+        parser.add_argument(
+            '--owner',
+            help='The username of the owner of the imported dandiset. Required for a new import.',
+        )
+        parser.add_argument(
+            '--sync',
+            action='store_true',
+            help='Run the import in this process, instead of dispatching Celery tasks.',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=4,
+            help='Number of files to transfer in parallel, with --sync.',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help=(
+                'List the files which would be imported, without importing anything. '
+                'Listings are cached in DANDI_GIRDER_LISTING_CACHE_DIR, if it is set.'
+            ),
+        )
+
+    def handle(self, *args, girder_folder_id, owner, sync, workers, dry_run, **kwargs):
+        if dry_run:
+            girder_files = girder_importer.list_files(
+                girder_folder_id, GirderClient(authenticate=True)
+            )
+            for girder_file in girder_files:
+                self.stdout.write(f'{girder_file.path} ({girder_file.size} bytes)')
+            total_size = sum(girder_file.size for girder_file in girder_files)
+            self.stdout.write(f'Would import {len(girder_files)} files ({total_size} bytes)')
+            return
+
+        girder_import = GirderImport.objects.filter(girder_folder_id=girder_folder_id).first()
+        if girder_import is None:
+            if owner is None:
+                raise CommandError('--owner is required to start an import')
+            owner_user = User.objects.filter(username=owner).first()
+            if owner_user is None:
+                raise CommandError(f'User {owner} does not exist')
+            girder_import = GirderImport.objects.create(
+                girder_folder_id=girder_folder_id, owner=owner_user
+            )
+        else:
+            self.stdout.write(f'Resuming import of {girder_folder_id} ({girder_import.state})')
+
+        if not sync:
+            import_girder_dandiset.delay(girder_import.id)
+            self.stdout.write(f'Dispatched import of {girder_folder_id}')
+            return
+
+        client = GirderClient(authenticate=True)
+        # The dandiset stays locked in Girder until the import succeeds
+        girder_importer.lock(girder_import, client)
+        if girder_import.state == GirderImport.State.CRAWLING:
+            girder_importer.crawl(girder_import, client)
+        self.stdout.write(f'Transferring {girder_import.pending_count} files')
+        failed = girder_importer.transfer_pending(girder_import, client, workers=workers)
+
+        if failed:
+            raise CommandError(f'{failed} files failed to transfer; run again to retry them')
+        girder_importer.finalize(girder_import, client)
+        self.stdout.write(
+            f'Imported {girder_import.file_count} files into dandiset '
+            f'{girder_import.dandiset.identifier}'
+        )
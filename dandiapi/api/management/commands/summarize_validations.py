@@ -0,0 +1,61 @@
+from collections import Counter
+from datetime import timedelta
+import statistics
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from dandiapi.api.models import Validation
+
+MB = 2 ** 20
+
+
+class Command(BaseCommand):
+    help = 'Summarize the throughput and failures of recent validations.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--hours',
+            type=float,
+            default=24,
+            help='Summarize validations which finished within this many hours.',
+        )
+
+    def handle(self, *args, hours, **kwargs):
+        validations = list(
+            Validation.objects.filter(
+                modified__gte=timezone.now() - timedelta(hours=hours),
+                state__in=[Validation.State.SUCCEEDED, Validation.State.FAILED],
+            )
+            # Validations from before durations were recorded can't be summarized
+            .exclude(durations={}).values('state', 'error_type', 'size', 'durations')
+        )
+        succeeded = [v for v in validations if v['state'] == Validation.State.SUCCEEDED]
+        failed = [v for v in validations if v['state'] == Validation.State.FAILED]
+        self.stdout.write(
+            f'{len(validations)} validations in the last {hours:g} hours: '
+            f'{len(succeeded)} succeeded, {len(failed)} failed'
+        )
+
+        if succeeded:
+            total_size = sum(v['size'] for v in succeeded)
+            total_duration = sum(v['durations']['total'] for v in succeeded)
+            throughputs = [v['size'] / v['durations']['total'] / MB for v in succeeded]
+            self.stdout.write(
+                f'Throughput: {total_size / MB:.1f} MB in {total_duration:.1f} s '
+                f'({total_size / total_duration / MB:.1f} MB/s overall, '
+                f'{statistics.median(throughputs):.1f} MB/s median, '
+                f'{min(throughputs):.1f} MB/s slowest)'
+            )
+            stages = Counter()
+            for v in succeeded:
+                stages.update({k: d for k, d in v['durations'].items() if k != 'total'})
+            for stage, duration in stages.most_common():
+                self.stdout.write(
+                    f'  {stage}: {duration:.1f} s ({duration / total_duration:.0%} of the time)'
+                )
+
+        if failed:
+            self.stdout.write('Failures:')
+            for error_type, count in Counter(v['error_type'] for v in failed).most_common():
+                self.stdout.write(f'  {error_type or "Unknown"}: {count}')
@@ -0,0 +1,193 @@
+"""
+Prometheus metrics of requests and validations.
+
+The queries, database time, rendering time and latency of requests are recorded only for
+requests sampled by RequestMetricsMiddleware. Rendering starts once the view returns its
+response, so serializing data with a serializer's .data inside a view counts as view time, not
+rendering time. The stage durations and throughput of every
+validation are recorded by the Celery worker which runs it.
+
+Each process records its own metrics, so when several processes serve requests or run tasks,
+PROMETHEUS_MULTIPROC_DIR must be set to a directory shared by all of them, for the metrics
+endpoint to report their aggregate.
+"""
+from __future__ import annotations
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+import os
+import threading
+import time
+from typing import Dict, Iterator, Optional
+
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+from prometheus_client import (
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+STAGE_BUCKETS = (0.01, 0.1, 0.5, 1, 5, 10, 30, 60, 300, 600, 1800, 3600)
+THROUGHPUT_BUCKETS = tuple(mb * 2 ** 20 for mb in (1, 5, 10, 25, 50, 100, 250, 500, 1000))
+
+REQUEST_DURATION = Histogram(
+    'dandi_request_duration_seconds',
+    'Total latency of sampled requests.',
+    ['view', 'method'],
+    buckets=LATENCY_BUCKETS,
+)
+REQUEST_DB_DURATION = Histogram(
+    'dandi_request_db_duration_seconds',
+    'Time spent executing database queries by sampled requests.',
+    ['view', 'method'],
+    buckets=LATENCY_BUCKETS,
+)
+REQUEST_RENDER_DURATION = Histogram(
+    'dandi_request_render_duration_seconds',
+    'Time spent rendering the responses of sampled requests, after their views returned.',
+    ['view', 'method'],
+    buckets=LATENCY_BUCKETS,
+)
+REQUEST_QUERIES = Histogram(
+    'dandi_request_queries',
+    'Number of database queries made by sampled requests.',
+    ['view', 'method'],
+    buckets=QUERY_BUCKETS,
+)
+
+VALIDATION_STAGE_DURATION = Histogram(
+    'dandi_validation_stage_duration_seconds',
+    'Time spent in each stage of validations.',
+    ['stage'],
+    buckets=STAGE_BUCKETS,
+)
+VALIDATION_BYTES = Counter('dandi_validation_bytes', 'Number of bytes validated.')
+VALIDATION_THROUGHPUT = Histogram(
+    'dandi_validation_throughput_bytes_per_second',
+    'Bytes validated per second by each validation.',
+    buckets=THROUGHPUT_BUCKETS,
+)
+VALIDATIONS = Counter(
+    'dandi_validations', 'Number of validations which finished.', ['state', 'error_type']
+)
+
+
+class StageTimer:
+    """Time the stages of a task, e.g. `with timer.stage('checksum'): ...`."""
+
+    def __init__(self, histogram: Histogram) -> None:
+        self.histogram = histogram
+        self.durations: Dict[str, float] = {}
+        self._start = time.perf_counter()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - start
+            self.durations[name] = self.durations.get(name, 0) + duration
+            self.histogram.labels(name).observe(duration)
+
+    @property
+    def total(self) -> float:
+        return time.perf_counter() - self._start
+
+
+class RequestMetrics:
+    """
+    The metrics of a single request.
+
+    Every database connection records its queries in the metrics of the current request, which
+    is held in a context variable, so the queries of async views are recorded too, from
+    whichever thread runs them.
+    """
+
+    def __init__(self) -> None:
+        self.queries = 0
+        self.db_duration = 0.0
+        self.render_duration = 0.0
+        self._render_start: Optional[float] = None
+        # An async view may make queries from several threads at once
+        self._lock = threading.Lock()
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - start
+            with self._lock:
+                self.db_duration += duration
+                self.queries += 1
+
+    @contextmanager
+    def recording(self) -> Iterator[None]:
+        """Record the queries made within this context, including in threads it starts."""
+        token = _current_request_metrics.set(self)
+        try:
+            yield
+        finally:
+            _current_request_metrics.reset(token)
+
+    def start_render(self) -> None:
+        self._render_start = time.perf_counter()
+
+    def finish_render(self, response) -> None:
+        self.render_duration += time.perf_counter() - self._render_start
+
+    def observe(self, view: str, method: str, duration: float) -> None:
+        REQUEST_DURATION.labels(view, method).observe(duration)
+        REQUEST_DB_DURATION.labels(view, method).observe(self.db_duration)
+        REQUEST_RENDER_DURATION.labels(view, method).observe(self.render_duration)
+        REQUEST_QUERIES.labels(view, method).observe(self.queries)
+
+    def server_timing(self, duration: float) -> str:
+        """
+        Format the metrics as the value of a Server-Timing header, in milliseconds.
+
+        Rendering a small response may take only microseconds, so that is the precision.
+        """
+        return ', '.join(
+            [
+                f'db;dur={self.db_duration * 1000:.3f};desc="{self.queries} queries"',
+                f'render;dur={self.render_duration * 1000:.3f}',
+                f'total;dur={duration * 1000:.3f}',
+            ]
+        )
+
+
+_current_request_metrics: ContextVar[Optional[RequestMetrics]] = ContextVar(
+    'request_metrics', default=None
+)
+
+
+def _record_query(execute, sql, params, many, context):
+    metrics = _current_request_metrics.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    return metrics(execute, sql, params, many, context)
+
+
+@receiver(connection_created)
+def _install_query_recorder(sender, connection, **kwargs):
+    # A connection which reconnects keeps its wrappers
+    if _record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_record_query)
+
+
+def latest() -> bytes:
+    """Return every metric, in the Prometheus text format."""
+    if 'PROMETHEUS_MULTIPROC_DIR' in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry)
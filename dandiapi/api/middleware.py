@@ -0,0 +1,108 @@
+import asyncio
+import random
+import time
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from whitenoise.middleware import WhiteNoiseMiddleware
+
+from dandiapi.api.metrics import RequestMetrics
+
+
+class AsyncCapableMiddleware:
+    """
+    A middleware which is called as a coroutine when the handler it wraps is one.
+
+    A synchronous middleware forces every async view below it to run in a thread, so one is
+    needed for each middleware in front of the async views.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def _mark_async(self, get_response) -> None:
+        # Like django.utils.deprecation.MiddlewareMixin
+        if asyncio.iscoroutinefunction(get_response):
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    @property
+    def is_async(self) -> bool:
+        return hasattr(self, '_is_coroutine')
+
+
+class RequestMetricsMiddleware(AsyncCapableMiddleware):
+    """
+    Record the metrics of a sample of requests, and report them in a Server-Timing header.
+
+    The fraction of requests which are sampled is set by DANDI_REQUEST_METRICS_SAMPLE_RATE.
+    If it is 0, this middleware is removed entirely, so it costs nothing.
+    """
+
+    def __init__(self, get_response):
+        self.sample_rate = settings.DANDI_REQUEST_METRICS_SAMPLE_RATE
+        if not self.sample_rate:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self._mark_async(get_response)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        if random.random() >= self.sample_rate:
+            return self.get_response(request)
+
+        metrics = request.request_metrics = RequestMetrics()
+        start = time.perf_counter()
+        with metrics.recording():
+            response = self.get_response(request)
+        return self.finish(request, response, metrics, time.perf_counter() - start)
+
+    async def __acall__(self, request):
+        if random.random() >= self.sample_rate:
+            return await self.get_response(request)
+
+        # Timed on the event loop; the queries which views make in other threads are recorded,
+        # since the metrics are in the context those threads run in
+        metrics = request.request_metrics = RequestMetrics()
+        start = time.perf_counter()
+        with metrics.recording():
+            response = await self.get_response(request)
+        return self.finish(request, response, metrics, time.perf_counter() - start)
+
+    def finish(self, request, response, metrics: RequestMetrics, duration: float):
+        resolver_match = request.resolver_match
+        view = resolver_match.view_name if resolver_match else 'unresolved'
+        metrics.observe(view, request.method, duration)
+        response['Server-Timing'] = metrics.server_timing(duration)
+        return response
+
+    def process_template_response(self, request, response):
+        # DRF responses are rendered after this hook, so time from here until rendering is done
+        metrics = getattr(request, 'request_metrics', None)
+        if metrics is not None:
+            metrics.start_render()
+            response.add_post_render_callback(metrics.finish_render)
+        return response
+
+
+class AsyncCapableWhiteNoiseMiddleware(AsyncCapableMiddleware, WhiteNoiseMiddleware):
+    """A WhiteNoiseMiddleware which doesn't force async views to run in a thread."""
+
+    def __init__(self, get_response=None, settings=settings):
+        super().__init__(get_response, settings)
+        self._mark_async(get_response)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        # Static files are looked up in memory, unless they are reloaded in development
+        if self.autorefresh:
+            static_file = self.find_file(request.path_info)
+        else:
+            static_file = self.files.get(request.path_info)
+        if static_file is not None:
+            return self.serve(static_file, request)
+        return await self.get_response(request)
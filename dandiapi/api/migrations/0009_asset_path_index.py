@@ -0,0 +1,19 @@
+# Generated by Django 3.1.14 on 2026-10-18 23:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0008_many_to_many_assets'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='asset',
+            index=models.Index(
+                fields=['path'], name='api_asset_path_idx', opclasses=['varchar_pattern_ops']
+            ),
+        ),
+    ]
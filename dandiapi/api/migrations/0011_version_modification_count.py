@@ -0,0 +1,18 @@
+# Generated by Django 3.1.14 on 2026-10-18 23:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0010_stats_snapshot'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='version',
+            name='modification_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,145 @@
+# Generated by Django 3.1.14 on 2026-10-19 00:02
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django_extensions.db.fields
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0011_version_modification_count'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GirderImport',
+            fields=[
+                (
+                    'id',
+                    models.AutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name='ID'
+                    ),
+                ),
+                (
+                    'created',
+                    django_extensions.db.fields.CreationDateTimeField(
+                        auto_now_add=True, verbose_name='created'
+                    ),
+                ),
+                (
+                    'modified',
+                    django_extensions.db.fields.ModificationDateTimeField(
+                        auto_now=True, verbose_name='modified'
+                    ),
+                ),
+                ('girder_folder_id', models.CharField(max_length=24, unique=True)),
+                (
+                    'state',
+                    models.CharField(
+                        choices=[
+                            ('CRAWLING', 'Crawling'),
+                            ('TRANSFERRING', 'Transferring'),
+                            ('SUCCEEDED', 'Succeeded'),
+                        ],
+                        default='CRAWLING',
+                        max_length=20,
+                    ),
+                ),
+                ('locked', models.BooleanField(default=False)),
+                (
+                    'dandiset',
+                    models.OneToOneField(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name='girder_import',
+                        to='api.dandiset',
+                    ),
+                ),
+            ],
+            options={
+                'get_latest_by': 'modified',
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='GirderImportFile',
+            fields=[
+                (
+                    'id',
+                    models.AutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name='ID'
+                    ),
+                ),
+                (
+                    'created',
+                    django_extensions.db.fields.CreationDateTimeField(
+                        auto_now_add=True, verbose_name='created'
+                    ),
+                ),
+                (
+                    'modified',
+                    django_extensions.db.fields.ModificationDateTimeField(
+                        auto_now=True, verbose_name='modified'
+                    ),
+                ),
+                ('girder_id', models.CharField(max_length=24)),
+                ('path', models.CharField(max_length=512)),
+                ('metadata', models.JSONField(blank=True, default=dict)),
+                ('size', models.PositiveBigIntegerField()),
+                (
+                    'state',
+                    models.CharField(
+                        choices=[
+                            ('PENDING', 'Pending'),
+                            ('IN_PROGRESS', 'In Progress'),
+                            ('SUCCEEDED', 'Succeeded'),
+                            ('FAILED', 'Failed'),
+                        ],
+                        default='PENDING',
+                        max_length=20,
+                    ),
+                ),
+                ('error', models.TextField(null=True)),
+                (
+                    'asset',
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name='+',
+                        to='api.asset',
+                    ),
+                ),
+                (
+                    'blob',
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name='+',
+                        to='api.assetblob',
+                    ),
+                ),
+                (
+                    'girder_import',
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name='files',
+                        to='api.girderimport',
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='girderimportfile',
+            index=models.Index(
+                fields=['girder_import', 'state'], name='api_girderi_girder__672f07_idx'
+            ),
+        ),
+        migrations.AlterUniqueTogether(
+            name='girderimportfile',
+            unique_together={('girder_import', 'girder_id')},
+        ),
+    ]
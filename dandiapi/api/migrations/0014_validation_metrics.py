@@ -0,0 +1,28 @@
+# Generated by Django 3.1.14 on 2026-10-19 00:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0013_multipart_upload'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='validation',
+            name='durations',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AddField(
+            model_name='validation',
+            name='error_type',
+            field=models.CharField(blank=True, default='', max_length=100),
+        ),
+        migrations.AddField(
+            model_name='validation',
+            name='size',
+            field=models.PositiveBigIntegerField(blank=True, null=True),
+        ),
+    ]
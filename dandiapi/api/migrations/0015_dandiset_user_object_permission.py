@@ -0,0 +1,108 @@
+# Generated by Django 3.1.14 on 2026-10-19 00:44
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+from django.db.models.functions import Cast
+
+
+def _generic_dandiset_permissions(apps, schema_editor):
+    ContentType = apps.get_model('contenttypes', 'ContentType')  # noqa: N806
+    UserObjectPermission = apps.get_model('guardian', 'UserObjectPermission')  # noqa: N806
+    db_alias = schema_editor.connection.alias
+    content_type = ContentType.objects.using(db_alias).filter(app_label='api', model='dandiset')
+    return UserObjectPermission.objects.using(db_alias).filter(content_type__in=content_type)
+
+
+def move_to_dandiset_permissions(apps, schema_editor):
+    Dandiset = apps.get_model('api', 'Dandiset')  # noqa: N806
+    DandisetUserObjectPermission = apps.get_model(  # noqa: N806
+        'api', 'DandisetUserObjectPermission'
+    )
+    db_alias = schema_editor.connection.alias
+    generic_permissions = _generic_dandiset_permissions(apps, schema_editor)
+    # Generic permissions have no foreign key, so they may outlive their dandiset
+    dandiset_pks = (
+        Dandiset.objects.using(db_alias)
+        .annotate(pk_text=Cast('pk', models.CharField()))
+        .values('pk_text')
+    )
+    generic_permissions.exclude(object_pk__in=dandiset_pks).delete()
+    DandisetUserObjectPermission.objects.using(db_alias).bulk_create(
+        DandisetUserObjectPermission(
+            content_object_id=int(permission.object_pk),
+            permission_id=permission.permission_id,
+            user_id=permission.user_id,
+        )
+        for permission in generic_permissions.iterator()
+    )
+    generic_permissions.delete()
+
+
+def move_to_generic_permissions(apps, schema_editor):
+    ContentType = apps.get_model('contenttypes', 'ContentType')  # noqa: N806
+    UserObjectPermission = apps.get_model('guardian', 'UserObjectPermission')  # noqa: N806
+    DandisetUserObjectPermission = apps.get_model(  # noqa: N806
+        'api', 'DandisetUserObjectPermission'
+    )
+    db_alias = schema_editor.connection.alias
+    content_type, _ = ContentType.objects.using(db_alias).get_or_create(
+        app_label='api', model='dandiset'
+    )
+    UserObjectPermission.objects.using(db_alias).bulk_create(
+        UserObjectPermission(
+            content_type=content_type,
+            object_pk=str(permission.content_object_id),
+            permission_id=permission.permission_id,
+            user_id=permission.user_id,
+        )
+        for permission in DandisetUserObjectPermission.objects.using(db_alias).iterator()
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('api', '0014_validation_metrics'),
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('guardian', '0002_generic_permissions_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DandisetUserObjectPermission',
+            fields=[
+                (
+                    'id',
+                    models.AutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name='ID'
+                    ),
+                ),
+                (
+                    'content_object',
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, to='api.dandiset'
+                    ),
+                ),
+                (
+                    'permission',
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, to='auth.permission'
+                    ),
+                ),
+                (
+                    'user',
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL
+                    ),
+                ),
+            ],
+            options={
+                'abstract': False,
+                'unique_together': {('user', 'permission', 'content_object')},
+            },
+        ),
+        migrations.RunPython(move_to_dandiset_permissions, move_to_generic_permissions),
+    ]
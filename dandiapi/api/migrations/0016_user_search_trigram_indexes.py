@@ -0,0 +1,27 @@
+# Generated by Django 3.1.14 on 2026-10-19 01:20
+
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+# The auth app owns the user table, so its indexes can't be declared on a model of this app
+USER_SEARCH_FIELDS = ['username', 'first_name', 'last_name']
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0015_dandiset_user_object_permission'),
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        *[
+            migrations.RunSQL(
+                f'CREATE INDEX api_user_{field}_trgm ON auth_user '
+                f'USING gin ({field} gin_trgm_ops);',
+                f'DROP INDEX api_user_{field}_trgm;',
+            )
+            for field in USER_SEARCH_FIELDS
+        ],
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 3.1.14 on 2026-10-19 01:03
+
+from django.db import migrations, models
+
+
+def count_referenced_blobs(apps, schema_editor):
+    Asset = apps.get_model('api', 'Asset')  # noqa: N806
+    AssetBlob = apps.get_model('api', 'AssetBlob')  # noqa: N806
+    db_alias = schema_editor.connection.alias
+    AssetBlob.objects.using(db_alias).filter(
+        id__in=Asset.objects.using(db_alias).values('blob_id')
+    ).update(counted=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0016_user_search_trigram_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='assetblob',
+            name='counted',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.RunPython(count_referenced_blobs, migrations.RunPython.noop),
+    ]
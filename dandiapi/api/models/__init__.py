@@ -1,5 +1,8 @@
 from .asset import Asset, AssetBlob, AssetMetadata
-from .dandiset import Dandiset
+from .dandiset import Dandiset, DandisetUserObjectPermission
+from .girder_import import GirderImport, GirderImportFile
+from .multipart_upload import MultipartUpload
+from .stats import StatsSnapshot
 from .validation import Validation
 from .version import Version, VersionMetadata
 
@@ -8,6 +11,11 @@ __all__ = [
     'AssetBlob',
     'AssetMetadata',
     'Dandiset',
+    'DandisetUserObjectPermission',
+    'GirderImport',
+    'GirderImportFile',
+    'MultipartUpload',
+    'StatsSnapshot',
     'Validation',
     'Version',
     'VersionMetadata',
@@ -7,7 +7,10 @@ from django.conf import settings
 from django.contrib.postgres.indexes import HashIndex
 from django.core.files.storage import Storage
 from django.core.validators import RegexValidator
-from django.db import models
+from django.db import models, transaction
+from django.db.models.signals import m2m_changed
+from django.dispatch import receiver
+from django.utils import timezone
 from django_extensions.db.models import TimeStampedModel
 
 from dandiapi.api.copy import copy_object
@@ -34,6 +37,8 @@ class AssetBlob(TimeStampedModel):
     )
     sha256 = models.CharField(max_length=64, validators=[RegexValidator(f'^{SHA256_REGEX}$')])
     size = models.PositiveBigIntegerField()
+    # Whether the size of this blob was added to the archive size, when an asset first used it
+    counted = models.BooleanField(default=False)
 
     class Meta:
         indexes = [HashIndex(fields=['sha256'])]
@@ -45,6 +50,11 @@ class AssetBlob(TimeStampedModel):
     def __str__(self) -> str:
         return self.blob.name
 
+    @staticmethod
+    def blob_key(sha256: str) -> str:
+        """Return the object key under which content with the given checksum is stored."""
+        return f'blobs/{sha256[0:3]}/{sha256[3:6]}/{sha256[6:]}'
+
     @classmethod
     def from_validation(cls, validation: Validation):
         """
@@ -61,9 +71,7 @@ class AssetBlob(TimeStampedModel):
         except cls.DoesNotExist:
             # Copy the data from the upload zone to the blob zone
             size = validation.blob.size
-            destination = (
-                f'blobs/{validation.sha256[0:3]}/{validation.sha256[3:6]}/{validation.sha256[6:]}'
-            )
+            destination = cls.blob_key(validation.sha256)
             copy_object(validation, destination)
             return cls(blob=destination, sha256=validation.sha256, size=size), True
 
@@ -95,6 +103,16 @@ class Asset(TimeStampedModel):
         on_delete=models.PROTECT,
     )
 
+    class Meta(TimeStampedModel.Meta):
+        indexes = [
+            # varchar_pattern_ops supports both exact path lookups and path prefix (LIKE) scans.
+            # Combined with the (asset_id, version_id) unique index on the versions through table,
+            # resolving a single path within a version is a pair of index lookups.
+            models.Index(
+                fields=['path'], name='api_asset_path_idx', opclasses=['varchar_pattern_ops']
+            )
+        ]
+
     @property
     def size(self):
         return self.blob.size
@@ -104,13 +122,14 @@ class Asset(TimeStampedModel):
         return self.blob.sha256
 
     def _populate_metadata(self):
+        metadata = {
+            **self.metadata.metadata,
+            'path': self.path,
+        }
+        # Reused metadata is modified again, so garbage collection can't delete it in the meantime
+        AssetMetadata.objects.filter(metadata=metadata).update(modified=timezone.now())
         new: AssetMetadata
-        new, created = AssetMetadata.objects.get_or_create(
-            metadata={
-                **self.metadata.metadata,
-                'path': self.path,
-            },
-        )
+        new, created = AssetMetadata.objects.get_or_create(metadata=metadata)
 
         if created:
             new.save()
@@ -118,8 +137,28 @@ class Asset(TimeStampedModel):
         self.metadata = new
 
     def save(self, *args, **kwargs):
+        # Prevent circular import
+        from .stats import StatsSnapshot
+
         self._populate_metadata()
+        created = self._state.adding
+        # Likewise for a reused blob; one which was deleted can no longer be referenced
+        if created and not AssetBlob.objects.filter(pk=self.blob_id).update(
+            modified=timezone.now()
+        ):
+            raise AssetBlob.DoesNotExist(f'Blob {self.blob_id} was garbage collected')
         super().save(*args, **kwargs)
+        # The archive size counts each blob once, when it is first referenced by an asset. The
+        # conditional update locks the blob, so of concurrent first references only one counts it.
+        if (
+            created
+            and not self.blob.counted
+            and AssetBlob.objects.filter(pk=self.blob_id, counted=False).update(counted=True)
+        ):
+            self.blob.counted = True
+            size = self.blob.size
+            # A rolled back save must not change the stats
+            transaction.on_commit(lambda: StatsSnapshot.increment(size=size))
 
     def __str__(self) -> str:
         return self.path
@@ -151,4 +190,23 @@ class Asset(TimeStampedModel):
 
     @classmethod
     def total_size(cls):
-        return cls.objects.aggregate(size=models.Sum('blob__size'))['size'] or 0
+        # Blobs are deduplicated and may be shared by many assets, so only count each one once
+        return (
+            AssetBlob.objects.filter(id__in=cls.objects.values('blob_id')).aggregate(
+                size=models.Sum('size')
+            )['size']
+            or 0
+        )
+
+
+@receiver(m2m_changed, sender=Asset.versions.through)
+def _touch_versions(sender, instance, action: str, reverse: bool, pk_set, **kwargs):
+    if action not in ['post_add', 'post_remove', 'pre_clear']:
+        return
+    if reverse:
+        # The assets of a single version were changed
+        Version.touch([instance.pk])
+    elif action == 'pre_clear':
+        Version.touch(instance.versions.values('pk'))
+    else:
+        Version.touch(pk_set)
@@ -2,8 +2,13 @@ from __future__ import annotations
 
 from typing import Optional
 
+from django.contrib.auth.models import Permission, User
+from django.contrib.contenttypes.models import ContentType
+from django.db import models, transaction
+from django.db.models import QuerySet
 from django_extensions.db.models import TimeStampedModel
-from guardian.shortcuts import assign_perm, get_users_with_perms, remove_perm
+from guardian.models import UserObjectPermissionBase
+from guardian.shortcuts import assign_perm, remove_perm
 
 
 class Dandiset(TimeStampedModel):
@@ -14,49 +19,96 @@ class Dandiset(TimeStampedModel):
         ordering = ['id']
         permissions = [('owner', 'Owns the dandiset')]
 
+    @staticmethod
+    def format_identifier(dandiset_id: int) -> str:
+        return f'{dandiset_id:06}'
+
     @property
     def identifier(self) -> Optional[str]:
         # Compare against None, to allow id 0
-        return f'{self.id:06}' if self.id is not None else ''
+        return self.format_identifier(self.id) if self.id is not None else ''
 
     @property
     def most_recent_version(self):
         return self.versions.order_by('created').last()
 
+    @classmethod
+    def owned_by(cls, user: User) -> QuerySet:
+        """Return the dandisets which a user owns."""
+        if not user.is_authenticated:
+            return cls.objects.none()
+        return cls.objects.filter(
+            dandisetuserobjectpermission__user=user,
+            dandisetuserobjectpermission__permission__codename='owner',
+        )
+
     @property
-    def owners(self):
-        return get_users_with_perms(self, only_with_perms_in=['owner'])
+    def owners(self) -> QuerySet:
+        return User.objects.filter(
+            dandisetuserobjectpermission__content_object=self,
+            dandisetuserobjectpermission__permission__codename='owner',
+        ).order_by('dandisetuserobjectpermission__id')
 
+    @transaction.atomic
     def set_owners(self, new_owners):
-        old_owners = get_users_with_perms(self, only_with_perms_in=['owner'])
-
-        removed_owners = []
-        added_owners = []
-
-        # Remove old owners
-        for old_owner in old_owners:
-            if old_owner not in new_owners:
-                remove_perm('owner', old_owner, self)
-                removed_owners.append(old_owner)
-
-        # Add new owners
-        for new_owner in new_owners:
-            if new_owner not in old_owners:
-                assign_perm('owner', new_owner, self)
-                added_owners.append(new_owner)
+        old_owners = list(self.owners)
+        old_owner_ids = {owner.id for owner in old_owners}
+        new_owner_ids = {owner.id for owner in new_owners}
+
+        removed_owners = [owner for owner in old_owners if owner.id not in new_owner_ids]
+        # A user listed twice is only added once
+        added_owners = list(
+            {owner.id: owner for owner in new_owners if owner.id not in old_owner_ids}.values()
+        )
+
+        # Change the permissions of every owner at once, rather than one query per owner
+        content_type = ContentType.objects.get_for_model(self)
+        permission = Permission.objects.get(content_type=content_type, codename='owner')
+        if removed_owners:
+            DandisetUserObjectPermission.objects.filter(
+                content_object=self, permission=permission, user__in=removed_owners
+            ).delete()
+        if added_owners:
+            # An owner added concurrently is already an owner
+            DandisetUserObjectPermission.objects.bulk_create(
+                [
+                    DandisetUserObjectPermission(
+                        content_object=self, permission=permission, user=owner
+                    )
+                    for owner in added_owners
+                ],
+                ignore_conflicts=True,
+            )
+
+        self._invalidate_owners(removed_owners)
 
         # Return the owners added/removed so they can be emailed
         return removed_owners, added_owners
 
+    def _invalidate_owners(self, owners):
+        # Prevent circular import
+        from dandiapi.api.caching import invalidate_owners
+
+        invalidate_owners(self.id, [owner.id for owner in owners])
+
     def add_owner(self, new_owner):
-        old_owners = get_users_with_perms(self, only_with_perms_in=['owner'])
-        if new_owner not in old_owners:
+        if new_owner not in self.owners:
             assign_perm('owner', new_owner, self)
+            self._invalidate_owners([new_owner])
 
     def remove_owner(self, owner):
-        owners = get_users_with_perms(self, only_with_perms_in=['owner'])
-        if owner in owners:
+        if owner in self.owners:
             remove_perm('owner', owner, self)
+            self._invalidate_owners([owner])
+
+    def save(self, *args, **kwargs):
+        # Prevent circular import
+        from .stats import StatsSnapshot
+
+        created = self._state.adding
+        super().save(*args, **kwargs)
+        if created:
+            StatsSnapshot.increment(dandiset_count=1)
 
     @classmethod
     def published_count(cls):
@@ -70,3 +122,14 @@ class Dandiset(TimeStampedModel):
 
     def __str__(self) -> str:
         return self.identifier
+
+
+class DandisetUserObjectPermission(UserObjectPermissionBase):
+    """
+    An object permission of a user on a dandiset, e.g. its ownership.
+
+    Guardian uses this instead of its generic UserObjectPermission for dandisets, so permissions
+    are joined to dandisets by a foreign key, rather than by a content type and a text primary key.
+    """
+
+    content_object = models.ForeignKey(Dandiset, on_delete=models.CASCADE)
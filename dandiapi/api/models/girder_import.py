@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+from django.conf import settings
+from django.db import models
+from django_extensions.db.models import TimeStampedModel
+
+from .asset import Asset, AssetBlob
+from .dandiset import Dandiset
+
+
+class GirderImport(TimeStampedModel):
+    """
+    The checkpoint of a migration of a single dandiset from Girder.
+
+    Every file found in the Girder folder is recorded as a GirderImportFile, so an interrupted
+    migration can resume with only the files which have not been transferred yet.
+    The dandiset stays locked in Girder from the start of the import until it succeeds, and is
+    owned by the user who started the import.
+    """
+
+    class State(models.TextChoices):
+        CRAWLING = 'CRAWLING', 'Crawling'
+        TRANSFERRING = 'TRANSFERRING', 'Transferring'
+        SUCCEEDED = 'SUCCEEDED', 'Succeeded'
+
+    girder_folder_id = models.CharField(max_length=24, unique=True)
+    dandiset = models.OneToOneField(
+        Dandiset,
+        blank=True,
+        null=True,
+        related_name='girder_import',
+        on_delete=models.SET_NULL,
+    )
+    state = models.CharField(max_length=20, choices=State.choices, default=State.CRAWLING)
+    owner = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        blank=True,
+        null=True,
+        related_name='+',
+        on_delete=models.SET_NULL,
+    )
+    # Whether the dandiset is locked in Girder, which lasts until the import succeeds
+    locked = models.BooleanField(default=False)
+
+    @property
+    def file_count(self) -> int:
+        return self.files.count()
+
+    @property
+    def pending_count(self) -> int:
+        return self.files.exclude(state=GirderImportFile.State.SUCCEEDED).count()
+
+    def __str__(self) -> str:
+        return self.girder_folder_id
+
+
+class GirderImportFile(TimeStampedModel):
+    class State(models.TextChoices):
+        PENDING = 'PENDING', 'Pending'
+        IN_PROGRESS = 'IN_PROGRESS', 'In Progress'
+        SUCCEEDED = 'SUCCEEDED', 'Succeeded'
+        FAILED = 'FAILED', 'Failed'
+
+    girder_import = models.ForeignKey(GirderImport, related_name='files', on_delete=models.CASCADE)
+    girder_id = models.CharField(max_length=24)
+    path = models.CharField(max_length=512)
+    metadata = models.JSONField(blank=True, default=dict)
+    size = models.PositiveBigIntegerField()
+    state = models.CharField(max_length=20, choices=State.choices, default=State.PENDING)
+    error = models.TextField(null=True)
+    # Set once the file content is in the blob store
+    blob = models.ForeignKey(
+        AssetBlob, blank=True, null=True, related_name='+', on_delete=models.SET_NULL
+    )
+    # Set once the file is registered as an asset of the draft version
+    asset = models.ForeignKey(
+        Asset, blank=True, null=True, related_name='+', on_delete=models.SET_NULL
+    )
+
+    class Meta:
+        unique_together = ['girder_import', 'girder_id']
+        indexes = [models.Index(fields=['girder_import', 'state'])]
+
+    def __str__(self) -> str:
+        return self.path
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import Dict
+
+from django.conf import settings
+from django.db import models
+from django.db.models import QuerySet, Sum
+from django_extensions.db.models import TimeStampedModel
+
+
+class MultipartUpload(TimeStampedModel):
+    """
+    A multipart upload which was initialized, but not yet validated.
+
+    Parts of an upload which is never completed are stored, and billed, until the upload is
+    aborted, so uploads which are still outstanding after EXPIRY are aborted periodically.
+    """
+
+    # Part upload URLs are presigned for 24 hours, but completion may be requested later
+    EXPIRY = timedelta(days=2)
+
+    object_key = models.CharField(max_length=255, unique=True)
+    upload_id = models.CharField(max_length=255)
+    size = models.PositiveBigIntegerField()
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        blank=True,
+        null=True,
+        related_name='+',
+        on_delete=models.SET_NULL,
+    )
+
+    class Meta:
+        indexes = [models.Index(fields=['created'])]
+
+    @staticmethod
+    def outstanding() -> Dict[str, int]:
+        totals = MultipartUpload.objects.aggregate(count=models.Count('pk'), size=Sum('size'))
+        return {
+            'outstanding_upload_count': totals['count'],
+            'outstanding_upload_size': totals['size'] or 0,
+        }
+
+    @classmethod
+    def forget(cls, uploads: QuerySet) -> int:
+        """Delete the records of uploads which were completed or aborted, returning how many."""
+        _, deleted_per_model = uploads.delete()
+        return deleted_per_model.get(cls._meta.label, 0)
+
+    def __str__(self) -> str:
+        return self.object_key
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+from typing import Dict
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import models
+from django.utils import timezone
+from django_extensions.db.models import TimeStampedModel
+
+from .asset import Asset
+from .dandiset import Dandiset
+from .multipart_upload import MultipartUpload
+
+
+class StatsSnapshot(TimeStampedModel):
+    """
+    A precomputed snapshot of archive-wide statistics.
+
+    Computing these statistics requires several aggregates over entire tables, so a single row
+    is recomputed periodically by a Celery task, and is adjusted incrementally in between as
+    assets are registered and versions are published.
+    """
+
+    # There is only ever one snapshot
+    SINGLETON_PK = 1
+    CACHE_KEY = 'api:stats-snapshot'
+
+    dandiset_count = models.PositiveIntegerField(default=0)
+    published_dandiset_count = models.PositiveIntegerField(default=0)
+    user_count = models.PositiveIntegerField(default=0)
+    size = models.PositiveBigIntegerField(default=0)
+    # Multipart uploads which were initialized, but not yet validated or aborted. These change
+    # with every upload, so they are only recomputed by refresh.
+    outstanding_upload_count = models.PositiveIntegerField(default=0)
+    outstanding_upload_size = models.PositiveBigIntegerField(default=0)
+
+    @staticmethod
+    def compute() -> Dict[str, int]:
+        """Calculate the current statistics directly from the database."""
+        return {
+            'dandiset_count': Dandiset.objects.count(),
+            'published_dandiset_count': Dandiset.published_count(),
+            'user_count': User.objects.count(),
+            'size': Asset.total_size(),
+            **MultipartUpload.outstanding(),
+        }
+
+    @classmethod
+    def refresh(cls) -> StatsSnapshot:
+        """Recompute the snapshot from scratch, correcting any drift."""
+        snapshot, _ = cls.objects.update_or_create(pk=cls.SINGLETON_PK, defaults=cls.compute())
+        cache.delete(cls.CACHE_KEY)
+        return snapshot
+
+    @classmethod
+    def load(cls) -> StatsSnapshot:
+        """Return the current snapshot, preferring the cached copy."""
+        timeout = settings.DANDI_CACHE_POLICIES.get('stats')
+        snapshot = cache.get(cls.CACHE_KEY) if timeout else None
+        if snapshot is None:
+            snapshot = cls.objects.filter(pk=cls.SINGLETON_PK).first() or cls.refresh()
+            if timeout:
+                cache.set(cls.CACHE_KEY, snapshot, timeout)
+        return snapshot
+
+    @classmethod
+    def increment(cls, **deltas: int) -> None:
+        """
+        Atomically adjust the snapshot counters by the given amounts.
+
+        If no snapshot exists yet, this does nothing; the first load will compute one.
+        """
+        cls.objects.filter(pk=cls.SINGLETON_PK).update(
+            **{field: models.F(field) + delta for field, delta in deltas.items()},
+            modified=timezone.now(),
+        )
+        cache.delete(cls.CACHE_KEY)
+
+    def __str__(self) -> str:
+        return f'Stats as of {self.modified}'
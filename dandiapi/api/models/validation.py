@@ -38,6 +38,11 @@ class Validation(TimeStampedModel):
     )
     state = models.CharField(max_length=20, choices=State.choices)
     error = models.TextField(null=True)
+    # The name of the exception which failed the validation
+    error_type = models.CharField(max_length=100, blank=True, default='')
+    # The number of bytes validated, and the seconds spent in each stage of the validation
+    size = models.PositiveBigIntegerField(null=True, blank=True)
+    durations = models.JSONField(blank=True, default=dict)
 
     def object_key_exists(self):
         return self.blob.field.storage.exists(self.blob.name)
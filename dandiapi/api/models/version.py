@@ -6,6 +6,7 @@ from django.conf import settings
 from django.contrib.postgres.indexes import HashIndex
 from django.core.validators import RegexValidator
 from django.db import models
+from django.utils import timezone
 from django_extensions.db.models import TimeStampedModel
 
 from .dandiset import Dandiset
@@ -44,6 +45,8 @@ class Version(TimeStampedModel):
         validators=[RegexValidator(f'^{VERSION_REGEX}$')],
         default=_get_default_version,
     )  # TODO: rename this?
+    # Incremented whenever the metadata or assets of this version change, for use in ETags
+    modification_count = models.PositiveIntegerField(default=0)
 
     class Meta:
         unique_together = ['dandiset', 'version']
@@ -84,15 +87,19 @@ class Version(TimeStampedModel):
         return Version(dandiset=version.dandiset, metadata=version.metadata)
 
     def _populate_metadata(self):
+        metadata = {
+            **self.metadata.metadata,
+            'name': self.metadata.name,
+            'identifier': f'DANDI:{self.dandiset.identifier}',
+            'schema_version': settings.DANDI_SCHEMA_VERSION,
+        }
+        # Reused metadata is modified again, so garbage collection can't delete it in the meantime
+        VersionMetadata.objects.filter(name=self.metadata.name, metadata=metadata).update(
+            modified=timezone.now()
+        )
         new: VersionMetadata
         new, created = VersionMetadata.objects.get_or_create(
-            name=self.metadata.name,
-            metadata={
-                **self.metadata.metadata,
-                'name': self.metadata.name,
-                'identifier': f'DANDI:{self.dandiset.identifier}',
-                'schema_version': settings.DANDI_SCHEMA_VERSION,
-            },
+            name=self.metadata.name, metadata=metadata
         )
 
         if created:
@@ -101,8 +108,30 @@ class Version(TimeStampedModel):
         self.metadata = new
 
     def save(self, *args, **kwargs):
+        # Prevent circular import
+        from .stats import StatsSnapshot
+
         self._populate_metadata()
+        adding = self._state.adding
+        first_publish = (
+            adding
+            and self.version != 'draft'
+            and not self.dandiset.versions.exclude(version='draft').exists()
+        )
+        if not adding:
+            self.modification_count = models.F('modification_count') + 1
         super().save(*args, **kwargs)
+        if not adding:
+            self.refresh_from_db(fields=['modification_count'])
+        if first_publish:
+            StatsSnapshot.increment(published_dandiset_count=1)
+
+    @classmethod
+    def touch(cls, version_ids) -> None:
+        """Record that the assets of the given versions have changed."""
+        cls.objects.filter(pk__in=version_ids).update(
+            modification_count=models.F('modification_count') + 1, modified=timezone.now()
+        )
 
     def __str__(self) -> str:
         return f'{self.dandiset.identifier}/{self.version}'
@@ -0,0 +1,98 @@
+"""
+Fast JSON rendering and parsing for the REST API.
+
+These live outside of dandiapi.api.views, since they are loaded by DRF settings, which are
+themselves loaded while the views are being imported.
+"""
+import math
+
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+
+try:
+    import orjson
+except ImportError:
+    # FastJSONRenderer and FastJSONParser will fall back to the standard library json module
+    orjson = None
+
+
+def _has_non_finite_float(data) -> bool:
+    stack = [data]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, float):
+            if not math.isfinite(value):
+                return True
+        elif isinstance(value, dict):
+            stack.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            stack.extend(value)
+    return False
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    A JSONRenderer which uses orjson, if it is installed.
+
+    The output decodes to the same values as that of JSONRenderer, but is not always
+    byte-identical; e.g. orjson formats the float 1e16 as "1e16", rather than "1e+16".
+    Pretty-printed output, and data which orjson cannot encode exactly as JSONRenderer would,
+    falls back to JSONRenderer. That includes non-finite floats, which orjson renders as null,
+    but which JSONRenderer rejects (with STRICT_JSON) or renders as NaN or Infinity.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None or not self.compact or self.ensure_ascii:
+            return super().render(data, accepted_media_type, renderer_context)
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        if _has_non_finite_float(data):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(
+                data,
+                # Use the DRF encoder for types not natively supported by orjson, and for
+                # datetimes, which orjson formats differently
+                default=self.encoder_class().default,
+                option=orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME,
+            )
+        except TypeError:
+            # e.g. integers which are larger than 64 bits
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Like JSONRenderer, escape these so the output is a strict subset of Javascript
+        return ret.replace('\u2028'.encode(), b'\\u2028').replace('\u2029'.encode(), b'\\u2029')
+
+
+class FastJSONParser(JSONParser):
+    """A JSONParser which uses orjson, if it is installed."""
+
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', 'utf-8')
+        if orjson is None or encoding.lower().replace('_', '-') != 'utf-8':
+            return super().parse(stream, media_type, parser_context)
+
+        try:
+            return orjson.loads(stream.read())
+        except ValueError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
+
+
+class PrometheusRenderer(BaseRenderer):
+    """A renderer of metrics which are already in the Prometheus text format."""
+
+    media_type = 'text/plain'
+    format = 'txt'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if isinstance(data, dict):
+            # An error, e.g. for an unauthenticated request
+            return str(data.get('detail', data)).encode(self.charset)
+        return data
@@ -1,26 +1,91 @@
+import os
+import socket
+import threading
+from typing import Dict, Optional, Tuple
 from urllib.parse import urlsplit, urlunsplit
 
+from botocore.config import Config
+import certifi
 from django.conf import settings
 from django.core.files.storage import Storage, get_storage_class
+from minio import Minio
 from minio_storage.policy import Policy
 from minio_storage.storage import MinioStorage, create_minio_client_from_settings
 from storages.backends.s3boto3 import S3Boto3Storage
+import urllib3
+
+# Storages and clients are shared by every thread of a process, but connections must never be
+# shared with a forked process, so they are discarded in the child after a fork
+_minio_client: Optional[Minio] = None
+_storages: Dict[Tuple, Storage] = {}
+_lock = threading.Lock()
+
+
+def get_minio_client() -> Minio:
+    """Return the Minio client of this process, whose connections are pooled and kept alive."""
+    global _minio_client
+    with _lock:
+        if _minio_client is None:
+            _minio_client = create_minio_client_from_settings(
+                minio_kwargs={
+                    'http_client': urllib3.PoolManager(
+                        maxsize=settings.DANDI_STORAGE_MAX_CONNECTIONS,
+                        socket_options=[
+                            *urllib3.connection.HTTPConnection.default_socket_options,
+                            (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+                        ],
+                        # The same as the default client of Minio
+                        timeout=urllib3.Timeout.DEFAULT_TIMEOUT,
+                        cert_reqs='CERT_REQUIRED',
+                        ca_certs=os.environ.get('SSL_CERT_FILE') or certifi.where(),
+                        retries=urllib3.Retry(
+                            total=5, backoff_factor=0.2, status_forcelist=[500, 502, 503, 504]
+                        ),
+                    )
+                }
+            )
+        return _minio_client
+
+
+def _discard_connections() -> None:
+    global _lock, _minio_client
+    # The lock may have been held by another thread of the parent process
+    _lock = threading.Lock()
+    _minio_client = None
+    for storage in _storages.values():
+        if isinstance(storage, S3Boto3Storage):
+            # The same as unpickling a S3Boto3Storage
+            storage.__setstate__(storage.__getstate__())
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_discard_connections)
 
 
 class DeconstructableMinioStorage(MinioStorage):
     """
     A MinioStorage which is deconstructable by Django.
 
-    This does not require a minio_client argument to the constructor.
+    This does not require a minio_client argument to the constructor, and always uses the Minio
+    client of the current process.
     """
 
     def __init__(self, *args, **kwargs):
         # A minio.api.Minio instance cannot be serialized by Django. Since all constructor
         # arguments are serialized by the @deconstructible decorator, passing a Minio client as a
         # constructor argument causes makemigrations to fail.
-        kwargs['minio_client'] = create_minio_client_from_settings()
+        kwargs['minio_client'] = get_minio_client()
         super().__init__(*args, **kwargs)
 
+    @property
+    def client(self) -> Minio:
+        return get_minio_client()
+
+    @client.setter
+    def client(self, minio_client: Minio) -> None:
+        # MinioStorage.__init__ sets the client, which is always the client of the process
+        pass
+
 
 class VerbatimNameStorageMixin:
     """A Storage mixin, storing files without transforming their original filename."""
@@ -50,17 +115,34 @@ class VerbatimNameMinioStorage(VerbatimNameStorageMixin, DeconstructableMinioSto
 
 def create_s3_storage(bucket_name: str) -> Storage:
     """
-    Return a new Storage instance, compatible with the default Storage class.
+    Return a Storage instance, compatible with the default Storage class.
 
     This abstracts over differences between S3Boto3Storage and MinioStorage,
     allowing either to be used as an additional non-default Storage.
+
+    Storages are cached, so every call for the same bucket and settings returns the same
+    instance, and reuses its connections.
     """
     # For production, calling django.core.files.storage.get_storage_class is fine
     # to return the storage class of S3Boto3Storage.
     default_storage_class = get_storage_class()
 
+    key = (bucket_name, default_storage_class, settings.DANDI_STORAGE_MAX_CONNECTIONS)
+    with _lock:
+        storage = _storages.get(key)
+    if storage is None:
+        storage = _create_s3_storage(bucket_name, default_storage_class)
+        with _lock:
+            storage = _storages.setdefault(key, storage)
+    return storage
+
+
+def _create_s3_storage(bucket_name: str, default_storage_class: type) -> Storage:
     if issubclass(default_storage_class, S3Boto3Storage):
         storage = VerbatimNameS3Storage(bucket_name=bucket_name)
+        storage.config = storage.config.merge(
+            Config(max_pool_connections=settings.DANDI_STORAGE_MAX_CONNECTIONS, tcp_keepalive=True)
+        )
     elif issubclass(default_storage_class, MinioStorage):
         base_url = None
         if getattr(settings, 'MINIO_STORAGE_MEDIA_URL', None):
@@ -1,12 +1,29 @@
+from typing import List
+
 from celery import shared_task
 from celery.utils.log import get_task_logger
+from django.contrib.auth.models import User
 from django.db.transaction import atomic
 
+from dandiapi.api import garbage_collection, girder_importer, mail, metrics
 from dandiapi.api.checksum import calculate_sha256_checksum
-from dandiapi.api.models import AssetBlob, Validation
+from dandiapi.api.girder import GirderClient
+from dandiapi.api.models import (
+    AssetBlob,
+    Dandiset,
+    GirderImport,
+    GirderImportFile,
+    MultipartUpload,
+    StatsSnapshot,
+    Validation,
+)
 
 logger = get_task_logger(__name__)
 
+EMAIL_MAX_RETRIES = 5
+# Seconds before the first retry of a failed email, doubled for every later retry
+EMAIL_RETRY_DELAY = 30
+
 
 class ChecksumMismatch(Exception):
     def __init__(self, expected_sha256, actual_sha256):
@@ -20,38 +37,171 @@ class ChecksumMismatch(Exception):
         )
 
 
+class UploadNotFound(Exception):
+    def __init__(self, object_key):
+        self.object_key = object_key
+
+    def __str__(self):
+        return 'Object does not exist.'
+
+
 @shared_task
 @atomic
 def validate(validation_id: int) -> None:
     validation: Validation = Validation.objects.get(pk=validation_id)
     logger.info('Starting validation %s', validation.sha256)
+    timer = metrics.StageTimer(metrics.VALIDATION_STAGE_DURATION)
 
     try:
-        sha256 = calculate_sha256_checksum(validation.blob.storage, validation.blob.name)
+        with timer.stage('checksum'):
+            # Checked here rather than by the view, so starting a validation never waits for S3
+            if not validation.object_key_exists():
+                raise UploadNotFound(validation.blob.name)
+            # The upload was completed, so it no longer needs to be aborted
+            MultipartUpload.forget(MultipartUpload.objects.filter(object_key=validation.blob.name))
+            validation.size = validation.blob.size
+            sha256 = calculate_sha256_checksum(validation.blob.storage, validation.blob.name)
         logger.info('Calculated sha256 %s', sha256)
         if sha256 != validation.sha256:
             raise ChecksumMismatch(validation.sha256, sha256)
 
         # TODO: Run dandi-cli validation
 
+        logger.info('Copying validated blob to asset storage')
+        with timer.stage('copy'):
+            asset_blob, created = AssetBlob.from_validation(validation)
+        with timer.stage('database'):
+            if created:
+                asset_blob.save()
+
         logger.info('Saving successful validation %s', validation.sha256)
         validation.state = Validation.State.SUCCEEDED
         validation.error = None
-        validation.save()
-
-        logger.info('Copying validated blob to asset storage')
-        asset_blob, created = AssetBlob.from_validation(validation)
-        if created:
-            asset_blob.save()
-    except ChecksumMismatch as e:
-        logger.info('Checksum mismatch: %s', str(e))
+        validation.error_type = ''
+    except (ChecksumMismatch, UploadNotFound) as e:
+        logger.info('Invalid upload: %s', str(e))
         validation.state = Validation.State.FAILED
         validation.error = str(e)
-        validation.save()
+        validation.error_type = type(e).__name__
     except Exception as e:
         logger.error('Internal error', exc_info=True)
         validation.state = Validation.State.FAILED
         validation.error = f'Internal error: {e}'
-        validation.save()
+        validation.error_type = type(e).__name__
         # TODO: Can celery recover from a task error?
         # raise e
+
+    validation.durations = {**timer.durations, 'total': timer.total}
+    validation.save()
+    _record_validation_metrics(validation)
+
+
+def _record_validation_metrics(validation: Validation) -> None:
+    metrics.VALIDATIONS.labels(validation.state, validation.error_type).inc()
+    total = validation.durations['total']
+    if validation.size:
+        metrics.VALIDATION_BYTES.inc(validation.size)
+        if validation.state == Validation.State.SUCCEEDED:
+            metrics.VALIDATION_THROUGHPUT.observe(validation.size / total)
+    logger.info(
+        'Finished validation %s: %s, %s bytes, %s',
+        validation.sha256,
+        validation.state,
+        validation.size,
+        ', '.join(f'{stage} {duration:.3f}s' for stage, duration in validation.durations.items()),
+    )
+
+
+@shared_task(bind=True, max_retries=EMAIL_MAX_RETRIES)
+def send_ownership_change_emails(
+    self, dandiset_id: int, removed_owner_ids: List[int], added_owner_ids: List[int]
+) -> None:
+    """Notify the owners which were removed from and added to a dandiset."""
+    dandiset = Dandiset.objects.filter(pk=dandiset_id).first()
+    if dandiset is None:
+        logger.info('Dandiset %s was deleted, not sending ownership change emails', dandiset_id)
+        return
+    users = User.objects.in_bulk(removed_owner_ids + added_owner_ids)
+    removed_owners = [users[pk] for pk in removed_owner_ids if pk in users]
+    added_owners = [users[pk] for pk in added_owner_ids if pk in users]
+    messages = mail.build_ownership_change_messages(dandiset, removed_owners, added_owners)
+
+    sent = 0
+    try:
+        for sent_so_far in mail.send_messages(messages):
+            sent = sent_so_far
+    except Exception as e:
+        if not mail.is_transient_error(e):
+            raise
+        # Only retry the messages which weren't sent, so nobody is notified twice
+        logger.warning('Sent %d of %d emails before failing: %s', sent, len(messages), e)
+        raise self.retry(
+            args=(
+                dandiset_id,
+                [owner.pk for owner in removed_owners[sent:]],
+                [owner.pk for owner in added_owners[max(0, sent - len(removed_owners)) :]],
+            ),
+            exc=e,
+            countdown=EMAIL_RETRY_DELAY * 2 ** self.request.retries,
+        )
+    logger.info('Sent %d ownership change emails for dandiset %s', sent, dandiset.identifier)
+
+
+@shared_task
+def refresh_stats() -> None:
+    snapshot = StatsSnapshot.refresh()
+    logger.info(
+        'Refreshed stats: %d dandisets, %d users, %d bytes',
+        snapshot.dandiset_count,
+        snapshot.user_count,
+        snapshot.size,
+    )
+
+
+@shared_task
+def collect_garbage() -> None:
+    report = garbage_collection.collect_garbage()
+    logger.info('Collected garbage: %s', report)
+
+
+@shared_task
+def reap_multipart_uploads() -> None:
+    reaped = garbage_collection.reap_multipart_uploads()
+    logger.info('Aborted %d expired multipart uploads', reaped)
+
+
+@shared_task
+def import_girder_dandiset(girder_import_id: int) -> None:
+    """Start or resume the import of a dandiset from Girder."""
+    girder_import: GirderImport = GirderImport.objects.get(pk=girder_import_id)
+    # Each task authenticates for itself, so no credentials are passed through the broker
+    client = GirderClient(authenticate=True)
+    girder_importer.lock(girder_import, client)
+    if girder_import.state == GirderImport.State.CRAWLING:
+        logger.info('Crawling Girder folder %s', girder_import.girder_folder_id)
+        girder_importer.crawl(girder_import, client)
+
+    claimed = girder_importer.claim_pending(girder_import)
+    logger.info('Transferring %d files', len(claimed))
+    if not girder_import.files.exclude(state=GirderImportFile.State.SUCCEEDED).exists():
+        finalize_girder_import.delay(girder_import_id)
+    for import_file_id in claimed:
+        transfer_girder_file.delay(import_file_id)
+
+
+@shared_task
+def transfer_girder_file(import_file_id: int) -> None:
+    import_file: GirderImportFile = GirderImportFile.objects.get(pk=import_file_id)
+    if not girder_importer.transfer(import_file, GirderClient(authenticate=True)):
+        return
+
+    # The last transfer to finish completes the import
+    if not import_file.girder_import.files.exclude(state=GirderImportFile.State.SUCCEEDED).exists():
+        finalize_girder_import.delay(import_file.girder_import_id)
+
+
+@shared_task
+def finalize_girder_import(girder_import_id: int) -> None:
+    girder_import: GirderImport = GirderImport.objects.get(pk=girder_import_id)
+    if girder_importer.finalize(girder_import, GirderClient(authenticate=True)):
+        logger.info('Imported Girder folder %s', girder_import.girder_folder_id)
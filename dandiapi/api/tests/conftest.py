@@ -2,6 +2,7 @@ from typing import TYPE_CHECKING
 
 from botocore.exceptions import ClientError
 from django.conf import settings
+from django.core.cache import cache
 from django.core.files.storage import Storage
 from minio import Minio
 from minio_storage.storage import MinioStorage
@@ -10,6 +11,8 @@ from pytest_factoryboy import register
 from rest_framework.test import APIClient
 from storages.backends.s3boto3 import S3Boto3Storage
 
+from dandiapi.api.authentication import local_tokens
+
 from .factories import (
     AssetBlobFactory,
     AssetFactory,
@@ -40,6 +43,16 @@ register(ValidationFactory)
 register(VersionMetadataFactory)
 
 
+@pytest.fixture(autouse=True)
+def clear_cache():
+    # Cached values may refer to rows from previous tests, which have been rolled back
+    cache.clear()
+    local_tokens.clear()
+    yield
+    cache.clear()
+    local_tokens.clear()
+
+
 @pytest.fixture
 def api_client() -> APIClient:
     return APIClient()
@@ -1,7 +1,10 @@
 import contextlib
+import json
+import re
 from typing import Any, Dict, Iterator, List
 
 import factory
+import httpx
 
 from dandiapi.api.girder import GirderClient, GirderFile
 
@@ -67,6 +70,78 @@ class MockGirderClient(GirderClient):
         yield
 
 
+class MockGirderServer:
+    """
+    An in-memory Girder folder tree, served through an httpx transport.
+
+    Listings honor limit and offset, and every request is recorded.
+    """
+
+    def __init__(self, depth: int = 2, subfolders: int = 2, items: int = 3) -> None:
+        self.folders: Dict[str, List[Dict]] = {}
+        self.items: Dict[str, List[Dict]] = {}
+        self.files: Dict[str, List[Dict]] = {}
+        self.contents: Dict[str, bytes] = {}
+        self.requests: List[httpx.Request] = []
+        self.root = _GirderClientDraftFolderFactory()
+        self.root_id = self._build_folder(depth, subfolders, items, self.root)
+
+    def _build_folder(self, depth: int, subfolders: int, items: int, folder: Dict = None) -> str:
+        folder = folder or _GirderClientFolderFactory()
+        self.items[folder['_id']] = _GirderClientItemFactory.build_batch(items)
+        for item in self.items[folder['_id']]:
+            self.files[item['_id']] = _GirderClientFileFactory.build_batch(1)
+            file = self.files[item['_id']][0]
+            self.contents[file['_id']] = (file['_id'].encode() * file['size'])[: file['size']]
+        self.folders[folder['_id']] = []
+        if depth > 0:
+            for _ in range(subfolders):
+                subfolder_id = self._build_folder(depth - 1, subfolders, items)
+                self.folders[folder['_id']].append(
+                    {**_GirderClientFolderFactory(), '_id': subfolder_id}
+                )
+        return folder['_id']
+
+    def expected_paths(self, folder_id: str = None, current_path: str = '/') -> List[str]:
+        folder_id = folder_id or self.root_id
+        paths = [f'{current_path}{item["name"]}' for item in self.items[folder_id]]
+        for subfolder in self.folders[folder_id]:
+            paths += self.expected_paths(subfolder['_id'], f'{current_path}{subfolder["name"]}/')
+        return paths
+
+    def _page(self, params: httpx.QueryParams, records: List[Dict]) -> List[Dict]:
+        limit = int(params['limit'])
+        offset = int(params.get('offset', 0))
+        # Girder treats a limit of 0 as unlimited
+        return records[offset : offset + limit] if limit else records[offset:]
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        path = request.url.path.split('/api/v1/', 1)[1]
+        params = httpx.QueryParams(request.url.query)
+        if path == 'api_key/token':
+            body = {'authToken': {'token': 'mocktoken'}}
+        elif path == f'folder/{self.root_id}':
+            body = self.root
+        elif re.fullmatch(r'dandi/\d+/(un)?lock', path):
+            body = {}
+        elif re.fullmatch(r'file/\w+/download', path):
+            return httpx.Response(200, content=self.contents[path.split('/')[1]])
+        elif path == 'folder':
+            body = self._page(params, self.folders[params['parentId']])
+        elif path == 'item':
+            body = self._page(params, self.items[params['folderId']])
+        elif re.fullmatch(r'item/\w+/files', path):
+            body = self.files[path.split('/')[1]]
+        else:
+            return httpx.Response(404)
+        return httpx.Response(200, content=json.dumps(body).encode())
+
+    @property
+    def transport(self) -> httpx.MockTransport:
+        return httpx.MockTransport(self.handle)
+
+
 class GirderFileFactory(factory.Factory):
     class Meta:
         model = GirderFile
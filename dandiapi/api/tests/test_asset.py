@@ -2,6 +2,7 @@ from guardian.shortcuts import assign_perm
 import pytest
 
 from dandiapi.api.models import Asset
+from dandiapi.api.views.serializers import AssetSerializer
 
 from .fuzzy import TIMESTAMP_RE, UUID_RE
 
@@ -54,6 +55,19 @@ def test_asset_rest_list(api_client, version, asset):
     }
 
 
+@pytest.mark.django_db
+def test_asset_rest_list_matches_serializer(api_client, version, asset_factory):
+    assets = [asset_factory() for _ in range(3)]
+    version.assets.add(*assets)
+
+    results = api_client.get(
+        f'/api/dandisets/{version.dandiset.identifier}/versions/{version.version}/assets/'
+    ).data['results']
+    assert sorted(results, key=lambda a: a['uuid']) == sorted(
+        AssetSerializer(assets, many=True).data, key=lambda a: a['uuid']
+    )
+
+
 @pytest.mark.django_db
 def test_asset_rest_retrieve(api_client, version, asset):
     version.assets.add(asset)
@@ -168,6 +182,24 @@ def test_asset_create_duplicate(api_client, user, version, asset):
     assert resp.data == 'Asset Already Exists'
 
 
+@pytest.mark.django_db
+def test_asset_create_same_path_new_blob(api_client, user, version, asset, asset_blob_factory):
+    assign_perm('owner', user, version.dandiset)
+    api_client.force_authenticate(user=user)
+    version.assets.add(asset)
+
+    resp = api_client.post(
+        f'/api/dandisets/{version.dandiset.identifier}/versions/{version.version}/assets/',
+        {
+            'metadata': asset.metadata.metadata,
+            'sha256': asset_blob_factory().sha256,
+        },
+        format='json',
+    )
+    assert resp.status_code == 200
+    assert version.assets.filter(path=asset.path).count() == 2
+
+
 @pytest.mark.django_db
 def test_asset_rest_update(api_client, user, version, asset, asset_blob):
     assign_perm('owner', user, version.dandiset)
@@ -311,3 +343,46 @@ def test_asset_rest_path_filter(api_client, version, asset_factory, path_prefix,
     ).data
 
     assert partial_path_assets == results
+
+
+@pytest.mark.django_db
+def test_asset_rest_by_path(api_client, version, asset_factory):
+    asset = asset_factory(path='foo/bar.nwb')
+    version.assets.add(asset)
+    version.assets.add(asset_factory(path='foo/bar.nwb.extra'))
+
+    assert api_client.get(
+        f'/api/dandisets/{version.dandiset.identifier}/'
+        f'versions/{version.version}/assets/by-path/',
+        {'path': 'foo/bar.nwb'},
+    ).data == {
+        'uuid': str(asset.uuid),
+        'path': asset.path,
+        'sha256': asset.sha256,
+        'size': asset.size,
+        'created': TIMESTAMP_RE,
+        'modified': TIMESTAMP_RE,
+        'metadata': asset.metadata.metadata,
+    }
+
+
+@pytest.mark.django_db
+def test_asset_rest_by_path_not_in_version(api_client, version, published_version_factory, asset):
+    other_version = published_version_factory()
+    other_version.assets.add(asset)
+
+    response = api_client.get(
+        f'/api/dandisets/{version.dandiset.identifier}/'
+        f'versions/{version.version}/assets/by-path/',
+        {'path': asset.path},
+    )
+    assert response.status_code == 404
+
+
+@pytest.mark.django_db
+def test_asset_rest_by_path_no_path(api_client, version):
+    response = api_client.get(
+        f'/api/dandisets/{version.dandiset.identifier}/'
+        f'versions/{version.version}/assets/by-path/'
+    )
+    assert response.status_code == 400
@@ -1,6 +1,17 @@
+import time
+
+from django.core.cache import cache
 import pytest
 from rest_framework.authtoken.models import Token
 
+from dandiapi.api.authentication import (
+    USER_FIELDS,
+    CachedTokenAuthentication,
+    LRUCache,
+    _token_cache_key,
+    local_tokens,
+)
+
 
 @pytest.fixture
 def token(user) -> Token:
@@ -33,3 +44,108 @@ def test_auth_token_refresh(api_client, user, token):
 @pytest.mark.django_db
 def test_auth_token_reset_unauthorized(api_client, user, token):
     assert api_client.post('/api/auth/token/').status_code == 401
+
+
+@pytest.mark.django_db
+def test_auth_token_cached(api_client, user, token, django_assert_num_queries):
+    api_client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+    assert api_client.get('/api/auth/token/').status_code == 200
+
+    # Only the view itself queries the token
+    with django_assert_num_queries(1):
+        assert api_client.get('/api/auth/token/').status_code == 200
+
+
+@pytest.mark.django_db
+def test_auth_token_cached_user(user, token, django_assert_num_queries):
+    CachedTokenAuthentication().authenticate_credentials(token.key)
+    cached = cache.get(_token_cache_key(token.key))
+    assert cached == local_tokens.get(_token_cache_key(token.key))
+    assert user.password not in cached
+
+    with django_assert_num_queries(0):
+        cached_user, cached_token = CachedTokenAuthentication().authenticate_credentials(token.key)
+        assert cached_token.key == token.key
+        assert cached_token.user == user
+        for field in USER_FIELDS:
+            assert getattr(cached_user, field) == getattr(user, field)
+    # Any other field is loaded when it is accessed
+    with django_assert_num_queries(1):
+        assert cached_user.email == user.email
+
+
+@pytest.mark.django_db
+def test_auth_token_cache_disabled(settings, api_client, user, token, django_assert_num_queries):
+    settings.DANDI_CACHE_POLICIES = {**settings.DANDI_CACHE_POLICIES, 'token': 0}
+    api_client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+    assert api_client.get('/api/auth/token/').status_code == 200
+
+    # The token is queried with its user, then by the view
+    with django_assert_num_queries(2):
+        assert api_client.get('/api/auth/token/').status_code == 200
+
+
+@pytest.mark.django_db
+def test_auth_token_refresh_invalidates(api_client, user, token):
+    api_client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+    assert api_client.get('/api/auth/token/').status_code == 200
+
+    new_token_key = api_client.post('/api/auth/token/').data
+
+    assert api_client.get('/api/auth/token/').status_code == 401
+    api_client.credentials(HTTP_AUTHORIZATION=f'Token {new_token_key}')
+    assert api_client.get('/api/auth/token/').data == new_token_key
+
+
+@pytest.mark.django_db
+def test_auth_token_deactivated_user(api_client, user, token):
+    api_client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+    assert api_client.get('/api/auth/token/').status_code == 200
+
+    user.is_active = False
+    user.save()
+
+    assert api_client.get('/api/auth/token/').status_code == 401
+
+
+@pytest.mark.django_db
+def test_auth_token_deleted(api_client, user, token):
+    api_client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+    assert api_client.get('/api/auth/token/').status_code == 200
+
+    token.delete()
+
+    assert api_client.get('/api/auth/token/').status_code == 401
+
+
+@pytest.mark.django_db
+def test_auth_token_shared_cache(settings, api_client, user, token, django_assert_num_queries):
+    settings.DANDI_CACHE_POLICIES = {**settings.DANDI_CACHE_POLICIES, 'token': 60}
+    api_client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+    assert api_client.get('/api/auth/token/').status_code == 200
+    # Another process only has the shared cache
+    local_tokens.clear()
+
+    with django_assert_num_queries(1):
+        assert api_client.get('/api/auth/token/').status_code == 200
+
+
+def test_lru_cache(mocker):
+    now = time.monotonic()
+    lru = LRUCache(maxsize=2, timeout=10)
+    lru.set('a', 1)
+    lru.set('b', 2)
+    assert lru.get('a') == 1
+    # The least recently used value is evicted
+    lru.set('c', 3)
+    assert lru.get('b') is None
+    assert lru.get('a') == 1
+    # Values may expire sooner than the default timeout
+    lru.set('d', 4, timeout=5)
+
+    mocker.patch('time.monotonic', return_value=now + 6)
+    assert lru.get('d') is None
+    assert lru.get('a') == 1
+
+    mocker.patch('time.monotonic', return_value=now + 11)
+    assert lru.get('a') is None
@@ -0,0 +1,208 @@
+"""
+Query count, latency and memory benchmarks of the main API endpoints.
+
+These only run when selected with `-m perf`, e.g. through `tox -e benchmark`. Each endpoint
+is measured against dandisets seeded at every scale in DANDI_BENCHMARK_SCALES, a comma-separated
+list of asset counts which defaults to 1000. The number of queries made by each endpoint must
+not exceed its baseline in QUERY_BASELINES at any scale, which catches N+1 regressions; timings
+are compared against the runs saved by pytest-benchmark.
+"""
+from dataclasses import dataclass
+import os
+import tracemalloc
+from typing import Callable
+
+from django.contrib.auth.models import User
+from django.db import connection, reset_queries, transaction
+from django.test.utils import CaptureQueriesContext
+import pytest
+from rest_framework.test import APIClient
+
+from dandiapi.api.models import Asset, AssetBlob, AssetMetadata, Version
+
+from .factories import (
+    AssetBlobFactory,
+    AssetMetadataFactory,
+    DandisetFactory,
+    DraftVersionFactory,
+    PublishedVersionFactory,
+    UserFactory,
+)
+
+pytest.importorskip('pytest_benchmark')
+pytestmark = [pytest.mark.perf, pytest.mark.django_db]
+
+SCALES = [int(scale) for scale in os.environ.get('DANDI_BENCHMARK_SCALES', '1000').split(',')]
+# Enough dandisets to fill a page of the dandiset list
+DANDISET_COUNT = 100
+SEED_BATCH_SIZE = 10000
+
+# The most queries each endpoint may make, regardless of scale
+QUERY_BASELINES = {
+    'dandiset_list': 3,
+    'dandiset_retrieve': 5,
+    'version_list': 2,
+    'version_retrieve': 5,
+    'asset_list': 3,
+    'asset_retrieve': 3,
+    'asset_paths': 2,
+    'publish': 14,
+    'stats': 1,
+}
+
+
+@dataclass
+class Seed:
+    owner: User
+    version: Version
+    asset: Asset
+
+
+def seed_assets(version: Version, count: int) -> None:
+    """Bulk create assets in a version, spread over a folder hierarchy."""
+    for start in range(0, count, SEED_BATCH_SIZE):
+        indexes = range(start, min(start + SEED_BATCH_SIZE, count))
+        paths = [f'folder{i % 100}/subfolder{i % 1000 // 100}/file{i}.nwb' for i in indexes]
+        # Share each blob between a few assets, like duplicated uploads
+        blobs = AssetBlob.objects.bulk_create(
+            AssetBlobFactory.build(
+                blob=f'blobs/benchmark/{i}', sha256=f'{version.dandiset_id:06}{i:058}'
+            )
+            for i in indexes[::4]
+        )
+        metadata = AssetMetadata.objects.bulk_create(
+            AssetMetadataFactory.build(metadata={'path': path, 'name': path.rsplit('/', 1)[1]})
+            for path in paths
+        )
+        assets = Asset.objects.bulk_create(
+            Asset(path=path, blob=blobs[offset // 4], metadata=metadata[offset])
+            for offset, path in enumerate(paths)
+        )
+        Asset.versions.through.objects.bulk_create(
+            Asset.versions.through(asset=asset, version=version) for asset in assets
+        )
+
+
+@pytest.fixture(scope='module', params=SCALES, ids=lambda scale: f'{scale}-assets')
+def seed(request, django_db_setup, django_db_blocker):
+    """
+    Seed a dandiset with many assets, alongside many small dandisets.
+
+    Seeding is expensive, so it is done once per scale, and rolled back once every benchmark of
+    that scale has run.
+    """
+    with django_db_blocker.unblock():
+        atomic = transaction.atomic()
+        atomic.__enter__()
+        try:
+            for i, dandiset in enumerate(DandisetFactory.create_batch(DANDISET_COUNT)):
+                DraftVersionFactory(dandiset=dandiset)
+                # Versions published in the same minute would collide with a new publication
+                PublishedVersionFactory(dandiset=dandiset, version=f'0.200101.{i:04}')
+            owner = UserFactory()
+            version = DraftVersionFactory()
+            version.dandiset.set_owners([owner])
+            seed_assets(version, request.param)
+            yield Seed(owner=owner, version=version, asset=version.assets.first())
+        finally:
+            transaction.set_rollback(True)
+            atomic.__exit__(None, None, None)
+
+
+def measure(benchmark, name: str, request: Callable) -> None:
+    """Benchmark a request, and check the number of queries it makes against its baseline."""
+    # Measure the steady state, after anything computed on first use
+    request()
+    # The query log is bounded, so it must be read before the benchmark makes more queries
+    reset_queries()
+    with CaptureQueriesContext(connection) as context:
+        request()
+    # Outside of the seed transaction, atomic blocks would begin and commit transactions, which
+    # are not captured, rather than create savepoints
+    queries = [
+        query['sql']
+        for query in context.captured_queries
+        if not query['sql'].startswith(('SAVEPOINT', 'RELEASE SAVEPOINT', 'ROLLBACK TO SAVEPOINT'))
+    ]
+
+    tracemalloc.start()
+    try:
+        request()
+        _, peak_memory = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    benchmark.extra_info.update(queries=len(queries), peak_memory=peak_memory)
+    benchmark(request)
+    assert len(queries) <= QUERY_BASELINES[name], queries
+
+
+def get(client: APIClient, url: str, **params) -> Callable:
+    def request():
+        response = client.get(url, params)
+        assert response.status_code == 200
+        return response
+
+    return request
+
+
+@pytest.fixture
+def client(seed) -> APIClient:
+    client = APIClient()
+    client.force_authenticate(user=seed.owner)
+    return client
+
+
+def version_url(seed: Seed) -> str:
+    return f'/api/dandisets/{seed.version.dandiset.identifier}/versions/{seed.version.version}/'
+
+
+def test_benchmark_dandiset_list(benchmark, seed, client):
+    measure(benchmark, 'dandiset_list', get(client, '/api/dandisets/'))
+
+
+def test_benchmark_dandiset_retrieve(benchmark, seed, client):
+    url = f'/api/dandisets/{seed.version.dandiset.identifier}/'
+    measure(benchmark, 'dandiset_retrieve', get(client, url))
+
+
+def test_benchmark_version_list(benchmark, seed, client):
+    url = f'/api/dandisets/{seed.version.dandiset.identifier}/versions/'
+    measure(benchmark, 'version_list', get(client, url))
+
+
+def test_benchmark_version_retrieve(benchmark, seed, client):
+    measure(benchmark, 'version_retrieve', get(client, version_url(seed)))
+
+
+def test_benchmark_asset_list(benchmark, seed, client):
+    measure(benchmark, 'asset_list', get(client, f'{version_url(seed)}assets/'))
+
+
+def test_benchmark_asset_retrieve(benchmark, seed, client):
+    url = f'{version_url(seed)}assets/{seed.asset.uuid}/'
+    measure(benchmark, 'asset_retrieve', get(client, url))
+
+
+@pytest.mark.parametrize('path_prefix', ['', 'folder1/', 'folder1/subfolder1/'])
+def test_benchmark_asset_paths(benchmark, seed, client, path_prefix):
+    url = f'{version_url(seed)}assets/paths/'
+    measure(benchmark, 'asset_paths', get(client, url, path_prefix=path_prefix))
+
+
+def test_benchmark_publish(benchmark, seed, client):
+    url = f'{version_url(seed)}publish/'
+
+    def request():
+        # Every publication is rolled back, so the seed is the same for every benchmark
+        with transaction.atomic():
+            response = client.post(url)
+            assert response.status_code == 200
+            transaction.set_rollback(True)
+        return response
+
+    measure(benchmark, 'publish', request)
+
+
+def test_benchmark_stats(benchmark, seed, client):
+    measure(benchmark, 'stats', get(client, '/api/stats/'))
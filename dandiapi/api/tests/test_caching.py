@@ -0,0 +1,233 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+import pytest
+
+from dandiapi.api.caching import get_owner_40x_or_none
+from dandiapi.settings import TestingConfiguration
+
+
+@pytest.fixture
+def published_version(published_version_factory):
+    return published_version_factory()
+
+
+@pytest.mark.django_db
+def test_cache_info(api_client, django_assert_num_queries):
+    response = api_client.get('/api/info/')
+
+    with django_assert_num_queries(0):
+        assert api_client.get('/api/info/').data == response.data
+
+
+@pytest.mark.django_db
+def test_cache_published_version(api_client, published_version, django_assert_num_queries):
+    url = (
+        f'/api/dandisets/{published_version.dandiset.identifier}/'
+        f'versions/{published_version.version}/'
+    )
+    response = api_client.get(url)
+    assert response.status_code == 200
+
+    with django_assert_num_queries(0):
+        assert api_client.get(url).data == response.data
+
+
+@pytest.mark.django_db
+def test_cache_draft_version_not_cached(api_client, version):
+    url = f'/api/dandisets/{version.dandiset.identifier}/versions/{version.version}/'
+    assert api_client.get(url).data['name'] == version.name
+
+    version.metadata.name = 'new name'
+    version.save()
+
+    assert api_client.get(url).data['name'] == 'new name'
+
+
+@pytest.mark.django_db
+def test_cache_published_assets_invalidated(api_client, published_version, asset_factory):
+    url = (
+        f'/api/dandisets/{published_version.dandiset.identifier}/'
+        f'versions/{published_version.version}/assets/'
+    )
+    assert api_client.get(url).data['count'] == 0
+
+    published_version.assets.add(asset_factory())
+    assert api_client.get(url).data['count'] == 1
+
+    published_version.assets.clear()
+    assert api_client.get(url).data['count'] == 0
+
+
+@pytest.mark.django_db
+def test_cache_published_assets_query_params(api_client, published_version, asset_factory):
+    published_version.assets.add(asset_factory(path='foo/a.nwb'))
+    published_version.assets.add(asset_factory(path='bar/b.nwb'))
+    url = (
+        f'/api/dandisets/{published_version.dandiset.identifier}/'
+        f'versions/{published_version.version}/assets/'
+    )
+
+    assert api_client.get(url).data['count'] == 2
+    assert api_client.get(url, {'path': 'foo'}).data['count'] == 1
+
+
+@pytest.mark.django_db
+def test_cache_disabled(api_client, settings, published_version):
+    settings.DANDI_CACHE_POLICIES = {**settings.DANDI_CACHE_POLICIES, 'published_version': 0}
+    url = (
+        f'/api/dandisets/{published_version.dandiset.identifier}/'
+        f'versions/{published_version.version}/'
+    )
+    api_client.get(url)
+
+    with CaptureQueriesContext(connection) as queries:
+        api_client.get(url)
+    assert len(queries) > 0
+
+
+@pytest.mark.django_db
+def test_http_cache_published_version(api_client, published_version):
+    url = (
+        f'/api/dandisets/{published_version.dandiset.identifier}/'
+        f'versions/{published_version.version}/'
+    )
+    response = api_client.get(url)
+
+    assert response.status_code == 200
+    assert 'max-age=3600' in response['Cache-Control']
+    assert 'must-revalidate' in response['Cache-Control']
+    assert 'immutable' not in response['Cache-Control']
+    assert response['ETag']
+    assert response['Last-Modified']
+
+    assert api_client.get(url, HTTP_IF_NONE_MATCH=response['ETag']).status_code == 304
+    assert api_client.get(url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified']).status_code == 304
+
+
+@pytest.mark.django_db
+def test_http_cache_published_assets_modified(api_client, published_version, asset_factory):
+    url = (
+        f'/api/dandisets/{published_version.dandiset.identifier}/'
+        f'versions/{published_version.version}/assets/'
+    )
+    etag = api_client.get(url)['ETag']
+
+    # Published versions may still be modified, so they must be revalidated
+    published_version.assets.add(asset_factory())
+    response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert response.data['count'] == 1
+
+
+@pytest.mark.django_db
+def test_http_cache_etag_per_format(api_client, settings, published_version):
+    # The browsable API requires static files, which aren't collected for tests
+    settings.STATICFILES_STORAGE = 'django.contrib.staticfiles.storage.StaticFilesStorage'
+    url = (
+        f'/api/dandisets/{published_version.dandiset.identifier}/'
+        f'versions/{published_version.version}/'
+    )
+    json_etag = api_client.get(url)['ETag']
+    html_response = api_client.get(url, HTTP_ACCEPT='text/html')
+
+    assert html_response['ETag'] != json_etag
+    assert (
+        api_client.get(url, HTTP_ACCEPT='text/html', HTTP_IF_NONE_MATCH=json_etag).status_code
+        == 200
+    )
+    assert (
+        api_client.get(
+            url, HTTP_ACCEPT='text/html', HTTP_IF_NONE_MATCH=html_response['ETag']
+        ).status_code
+        == 304
+    )
+
+
+@pytest.mark.django_db
+def test_http_cache_draft_assets(api_client, version, asset_factory):
+    url = f'/api/dandisets/{version.dandiset.identifier}/versions/{version.version}/assets/'
+    response = api_client.get(url)
+
+    assert response.status_code == 200
+    assert 'immutable' not in response['Cache-Control']
+    assert 'max-age=60' in response['Cache-Control']
+    etag = response['ETag']
+    assert api_client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+    # Modifying the assets of the draft changes its ETag
+    version.assets.add(asset_factory())
+    response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert response['ETag'] != etag
+    assert response.data['count'] == 1
+
+
+@pytest.mark.django_db
+def test_http_cache_draft_metadata(api_client, version):
+    url = f'/api/dandisets/{version.dandiset.identifier}/versions/{version.version}/'
+    etag = api_client.get(url)['ETag']
+
+    version.metadata.name = 'new name'
+    version.save()
+
+    assert api_client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+
+@pytest.mark.django_db
+def test_http_cache_nonexistent_version(api_client, dandiset):
+    response = api_client.get(f'/api/dandisets/{dandiset.identifier}/versions/draft/')
+
+    assert response.status_code == 404
+    assert not response.has_header('ETag')
+
+
+def test_cache_policies_shared_cache():
+    configuration = TestingConfiguration()
+    # Without a shared cache, invalidations don't reach other processes
+    assert configuration.DANDI_CACHE_POLICIES['published_assets'] <= 60
+
+    configuration.DANDI_CACHE_REDIS_URL = 'redis://localhost:6379/0'
+    assert configuration.DANDI_CACHE_POLICIES['published_assets'] == 24 * 60 * 60
+
+    configuration.DANDI_CACHE_POLICY_OVERRIDES = {'published_assets': 0}
+    assert configuration.DANDI_CACHE_POLICIES['published_assets'] == 0
+
+
+@pytest.fixture
+def owner_request(rf, user, dandiset):
+    dandiset.add_owner(user)
+    request = rf.post('/')
+    request.user = user
+    return request
+
+
+@pytest.mark.django_db
+def test_cache_owner_permission(owner_request, dandiset, django_assert_num_queries):
+    assert get_owner_40x_or_none(owner_request, dandiset) is None
+
+    with django_assert_num_queries(0):
+        assert get_owner_40x_or_none(owner_request, dandiset) is None
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('method', ['set_owners', 'remove_owner'])
+def test_cache_owner_permission_invalidated(owner_request, dandiset, user_factory, method):
+    assert get_owner_40x_or_none(owner_request, dandiset) is None
+
+    if method == 'set_owners':
+        dandiset.set_owners([user_factory()])
+    else:
+        dandiset.remove_owner(owner_request.user)
+
+    assert get_owner_40x_or_none(owner_request, dandiset).status_code == 403
+
+
+@pytest.mark.django_db
+def test_cache_owner_permission_not_refused(rf, user, dandiset):
+    request = rf.post('/')
+    request.user = user
+    assert get_owner_40x_or_none(request, dandiset).status_code == 403
+
+    dandiset.add_owner(user)
+
+    assert get_owner_40x_or_none(request, dandiset) is None
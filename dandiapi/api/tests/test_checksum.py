@@ -1,7 +1,10 @@
 import hashlib
+import os
+import uuid
 
 from django.core.files.base import ContentFile
 from django.core.files.storage import Storage
+import pytest
 
 from dandiapi.api.checksum import calculate_sha256_checksum
 
@@ -20,3 +23,20 @@ def test_checksum(faker, storage: Storage):
     actual_sha256 = calculate_sha256_checksum(storage, name)
 
     assert actual_sha256 == expected_sha256
+
+
+@pytest.mark.parametrize(
+    'chunk_size,max_concurrency',
+    [(64 * 1024, 1), (64 * 1024, 4), (100 * 1000, 3)],
+    ids=['serial', 'concurrent', 'uneven-chunks'],
+)
+def test_checksum_chunked(storage: Storage, chunk_size, max_concurrency):
+    name = f'checksum/{uuid.uuid4()}'
+    data = os.urandom(1024 * 1024 + 1)
+    storage.save(name, ContentFile(data))
+
+    actual_sha256 = calculate_sha256_checksum(
+        storage, name, chunk_size=chunk_size, max_concurrency=max_concurrency
+    )
+
+    assert actual_sha256 == hashlib.sha256(data).hexdigest()
@@ -0,0 +1,71 @@
+"""
+Throughput benchmarks of calculate_sha256_checksum, to tune its chunk size and concurrency.
+
+These only run when selected with `-m perf`, e.g. through `tox -e benchmark`. Every
+combination of storage backend, object size, chunk size and concurrency is measured against the
+local object store; pytest-benchmark saves the results of each run, and `pytest-benchmark compare
+--group-by=param:object_size --sort=mean` ranks the combinations. Object sizes, in MiB, are read
+from DANDI_CHECKSUM_BENCHMARK_SIZES, a comma-separated list which defaults to 1,64.
+"""
+import os
+import uuid
+
+from django.core.files.base import ContentFile
+import pytest
+
+from dandiapi.api.checksum import calculate_sha256_checksum
+
+from .conftest import minio_storage_factory, s3boto3_storage_factory
+
+pytest.importorskip('pytest_benchmark')
+pytestmark = pytest.mark.perf
+
+MiB = 1024 * 1024
+OBJECT_SIZES = [
+    int(size) * MiB for size in os.environ.get('DANDI_CHECKSUM_BENCHMARK_SIZES', '1,64').split(',')
+]
+CHUNK_SIZES = [256 * 1024, 1 * MiB, 8 * MiB, 32 * MiB]
+# None is each backend's default strategy
+CONCURRENCIES = [None, 1, 4, 10]
+
+
+@pytest.fixture(
+    scope='module',
+    params=[s3boto3_storage_factory, minio_storage_factory],
+    ids=['s3boto3', 'minio'],
+)
+def benchmark_storage(request):
+    return request.param()
+
+
+@pytest.fixture(scope='module', params=OBJECT_SIZES, ids=lambda size: f'{size // MiB}MiB')
+def object_size(request) -> int:
+    return request.param
+
+
+@pytest.fixture(scope='module')
+def object_name(benchmark_storage, object_size):
+    """Upload an object of random content once per backend and size."""
+    name = benchmark_storage.save(
+        f'benchmarks/{uuid.uuid4()}', ContentFile(os.urandom(object_size))
+    )
+    yield name
+    benchmark_storage.delete(name)
+
+
+@pytest.mark.parametrize(
+    'max_concurrency', CONCURRENCIES, ids=lambda c: f'{c or "default"}-threads'
+)
+@pytest.mark.parametrize('chunk_size', CHUNK_SIZES, ids=lambda size: f'{size // 1024}KiB-chunks')
+def test_benchmark_checksum(
+    benchmark, benchmark_storage, object_size, object_name, chunk_size, max_concurrency
+):
+    benchmark.pedantic(
+        calculate_sha256_checksum,
+        args=(benchmark_storage, object_name),
+        kwargs={'chunk_size': chunk_size, 'max_concurrency': max_concurrency},
+        rounds=3,
+        warmup_rounds=1,
+    )
+    mean = benchmark.stats.stats.mean
+    benchmark.extra_info.update(throughput_mib_per_second=object_size / MiB / mean)
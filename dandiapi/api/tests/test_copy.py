@@ -1,11 +1,22 @@
 from typing import TYPE_CHECKING
+import uuid
 
 from botocore.exceptions import ClientError
 from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import Storage
 import pytest
+from s3_file_field._multipart import MultipartManager
 from storages.backends.s3boto3 import S3Boto3Storage
 
-from dandiapi.api.copy import _copy_object_s3, copy_object
+from dandiapi.api import copy
+from dandiapi.api.copy import (
+    _copy_object_s3,
+    abort_multipart_upload,
+    copy_object,
+    delete_objects,
+    list_objects,
+)
 
 if TYPE_CHECKING:
     # mypy_boto3_s3 only provides types
@@ -77,3 +88,27 @@ def test_copy_s3(validation):
 
     # Verify original object was deleted
     assert not validation.blob.field.storage.exists(validation.blob.name)
+
+
+def test_list_and_delete_objects(monkeypatch, storage: Storage):
+    # Delete in several batches
+    monkeypatch.setattr(copy, 'DELETE_BATCH_SIZE', 2)
+    prefix = f'test-delete/{uuid.uuid4()}/'
+    keys = [f'{prefix}{i}' for i in range(5)]
+    for key in keys:
+        storage.save(key, ContentFile(b'content'))
+
+    assert sorted(key for key, _ in list_objects(storage, prefix)) == keys
+
+    delete_objects(storage, keys[:3])
+
+    assert sorted(key for key, _ in list_objects(storage, prefix)) == keys[3:]
+
+
+def test_abort_multipart_upload(storage: Storage):
+    key = f'uploads/{uuid.uuid4()}'
+    upload_id = MultipartManager.from_storage(storage)._create_upload_id(key)
+
+    assert abort_multipart_upload(storage, key, upload_id)
+    # The upload no longer exists
+    assert not abort_multipart_upload(storage, key, upload_id)
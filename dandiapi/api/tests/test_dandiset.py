@@ -1,12 +1,28 @@
+import smtplib
+
 from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core.mail.backends.locmem import EmailBackend
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from guardian.shortcuts import assign_perm
 import pytest
 
-from dandiapi.api.models import Dandiset
+from dandiapi.api import tasks
+from dandiapi.api.models import Dandiset, DandisetUserObjectPermission
+from dandiapi.api.views.serializers import DandisetDetailSerializer
 
 from .fuzzy import DANDISET_ID_RE, DANDISET_SCHEMA_ID_RE, TIMESTAMP_RE
 
 
+@pytest.fixture
+def send_emails(mocker):
+    """Send ownership change emails immediately, rather than in a Celery worker."""
+    return mocker.patch.object(
+        tasks.send_ownership_change_emails, 'delay', tasks.send_ownership_change_emails
+    )
+
+
 @pytest.mark.django_db
 def test_dandiset_identifier(dandiset):
     assert int(dandiset.identifier) == dandiset.id
@@ -49,6 +65,43 @@ def test_dandiset_rest_list(api_client, dandiset):
     }
 
 
+@pytest.mark.django_db
+def test_dandiset_rest_list_versions(
+    api_client, dandiset_factory, draft_version_factory, published_version_factory, asset
+):
+    versions = [
+        published_version_factory(dandiset=dandiset_factory()),
+        draft_version_factory(dandiset=dandiset_factory()),
+    ]
+    versions[1].assets.add(asset)
+    # Only the most recent version of each dandiset is listed
+    draft_version_factory(dandiset=versions[0].dandiset)
+    published_version_factory(dandiset=versions[1].dandiset)
+
+    with CaptureQueriesContext(connection) as context:
+        results = api_client.get('/api/dandisets/').data['results']
+
+    assert results == [DandisetDetailSerializer(version.dandiset).data for version in versions]
+    # The versions of every dandiset on the page are fetched at once
+    assert len(context.captured_queries) == 3
+
+
+@pytest.mark.django_db
+def test_dandiset_owner_permissions_direct(dandiset_factory, user_factory):
+    dandiset = dandiset_factory()
+    owner = user_factory()
+    assign_perm('owner', owner, dandiset)
+
+    assert DandisetUserObjectPermission.objects.filter(user=owner, content_object=dandiset).exists()
+    assert list(dandiset.owners) == [owner]
+    assert list(Dandiset.owned_by(owner)) == [dandiset]
+    assert list(Dandiset.owned_by(user_factory())) == []
+    assert list(Dandiset.owned_by(AnonymousUser())) == []
+    # Ownership is joined on the foreign key, not the content type
+    assert 'django_content_type' not in str(dandiset.owners.query)
+    assert 'django_content_type' not in str(Dandiset.owned_by(owner).query)
+
+
 @pytest.mark.django_db
 def test_dandiset_rest_list_for_user(api_client, user, dandiset_factory):
     dandiset = dandiset_factory()
@@ -255,7 +308,7 @@ def test_dandiset_rest_get_owners(api_client, dandiset, user):
 
 
 @pytest.mark.django_db
-def test_dandiset_rest_change_owner(api_client, version, user_factory, mailoutbox):
+def test_dandiset_rest_change_owner(api_client, version, user_factory, mailoutbox, send_emails):
     dandiset = version.dandiset
     user1 = user_factory()
     user2 = user_factory()
@@ -280,7 +333,7 @@ def test_dandiset_rest_change_owner(api_client, version, user_factory, mailoutbo
 
 
 @pytest.mark.django_db
-def test_dandiset_rest_add_owner(api_client, version, user_factory, mailoutbox):
+def test_dandiset_rest_add_owner(api_client, version, user_factory, mailoutbox, send_emails):
     dandiset = version.dandiset
     user1 = user_factory()
     user2 = user_factory()
@@ -303,7 +356,7 @@ def test_dandiset_rest_add_owner(api_client, version, user_factory, mailoutbox):
 
 
 @pytest.mark.django_db
-def test_dandiset_rest_remove_owner(api_client, version, user_factory, mailoutbox):
+def test_dandiset_rest_remove_owner(api_client, version, user_factory, mailoutbox, send_emails):
     dandiset = version.dandiset
     user1 = user_factory()
     user2 = user_factory()
@@ -326,6 +379,102 @@ def test_dandiset_rest_remove_owner(api_client, version, user_factory, mailoutbo
     assert mailoutbox[0].to == [user2.email]
 
 
+@pytest.mark.django_db
+def test_dandiset_rest_change_many_owners_queries(api_client, version, user_factory, send_emails):
+    # Changing owners makes the same number of queries however many owners change
+    dandiset = version.dandiset
+    user = user_factory()
+    assign_perm('owner', user, dandiset)
+    api_client.force_authenticate(user=user)
+
+    def change_owners(count):
+        dandiset.set_owners([user, *user_factory.create_batch(count)])
+        owners = [user, *user_factory.create_batch(count)]
+        with CaptureQueriesContext(connection) as context:
+            resp = api_client.put(
+                f'/api/dandisets/{dandiset.identifier}/users/',
+                [{'username': owner.username} for owner in owners],
+                format='json',
+            )
+        assert resp.status_code == 200
+        assert set(dandiset.owners) == set(owners)
+        return len(context.captured_queries)
+
+    assert change_owners(2) == change_owners(20)
+
+
+@pytest.mark.django_db
+def test_dandiset_rest_change_owner_emails_in_background(
+    api_client, version, user_factory, mailoutbox, mocker
+):
+    delay = mocker.patch.object(tasks.send_ownership_change_emails, 'delay')
+    dandiset = version.dandiset
+    user1 = user_factory()
+    user2 = user_factory()
+    assign_perm('owner', user1, dandiset)
+    api_client.force_authenticate(user=user1)
+
+    resp = api_client.put(
+        f'/api/dandisets/{dandiset.identifier}/users/',
+        [{'username': user2.username}],
+        format='json',
+    )
+
+    assert resp.status_code == 200
+    assert mailoutbox == []
+    delay.assert_called_once_with(dandiset.id, [user1.id], [user2.id])
+
+
+@pytest.mark.django_db
+def test_dandiset_rest_unchanged_owners_no_emails(api_client, dandiset, user, mocker):
+    delay = mocker.patch.object(tasks.send_ownership_change_emails, 'delay')
+    assign_perm('owner', user, dandiset)
+    api_client.force_authenticate(user=user)
+
+    resp = api_client.put(
+        f'/api/dandisets/{dandiset.identifier}/users/',
+        [{'username': user.username}],
+        format='json',
+    )
+
+    assert resp.status_code == 200
+    delay.assert_not_called()
+
+
+@pytest.mark.django_db
+def test_send_ownership_change_emails_retries_unsent(version, user_factory, mailoutbox, mocker):
+    send_messages = EmailBackend.send_messages
+    failures = iter([False, True])
+
+    def flaky_send_messages(self, messages):
+        # Fail the second message once, after the first was sent
+        if next(failures, False):
+            raise smtplib.SMTPServerDisconnected('Connection unexpectedly closed')
+        return send_messages(self, messages)
+
+    mocker.patch.object(EmailBackend, 'send_messages', flaky_send_messages)
+    removed, added = user_factory(), user_factory()
+
+    tasks.send_ownership_change_emails.apply(args=(version.dandiset.id, [removed.id], [added.id]))
+
+    assert [message.to for message in mailoutbox] == [[removed.email], [added.email]]
+
+
+@pytest.mark.django_db
+def test_send_ownership_change_emails_permanent_failure(version, user_factory, mocker):
+    mocker.patch.object(
+        EmailBackend,
+        'send_messages',
+        side_effect=smtplib.SMTPRecipientsRefused({'nobody@example.com': (550, b'No such user')}),
+    )
+    retry = mocker.spy(tasks.send_ownership_change_emails, 'retry')
+
+    with pytest.raises(smtplib.SMTPRecipientsRefused):
+        tasks.send_ownership_change_emails(version.dandiset.id, [], [user_factory().id])
+
+    retry.assert_not_called()
+
+
 @pytest.mark.django_db
 def test_dandiset_rest_not_an_owner(api_client, dandiset, user):
     api_client.force_authenticate(user=user)
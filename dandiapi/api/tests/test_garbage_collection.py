@@ -0,0 +1,215 @@
+from datetime import timedelta
+import io
+import uuid
+
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from django.utils import timezone
+import pytest
+from s3_file_field._multipart import MultipartManager
+
+from dandiapi.api import garbage_collection, girder_importer
+from dandiapi.api.garbage_collection import collect_garbage, reap_multipart_uploads
+from dandiapi.api.models import (
+    Asset,
+    AssetBlob,
+    AssetMetadata,
+    GirderImport,
+    GirderImportFile,
+    MultipartUpload,
+    StatsSnapshot,
+    Validation,
+    VersionMetadata,
+)
+
+
+@pytest.fixture
+def orphans(version, asset_factory, asset_blob_factory, version_metadata_factory):
+    live_asset = asset_factory(blob=asset_blob_factory())
+    version.assets.add(live_asset)
+    # Removing an asset from a version leaves it, its blob and its metadata behind
+    orphaned_asset = asset_factory(blob=asset_blob_factory())
+    version.assets.add(orphaned_asset)
+    version.assets.remove(orphaned_asset)
+    return {
+        'live_asset': live_asset,
+        'asset': orphaned_asset,
+        'version_metadata': version_metadata_factory(),
+    }
+
+
+@pytest.mark.django_db
+def test_collect_garbage(orphans):
+    orphaned_asset = orphans['asset']
+    blob_key = orphaned_asset.blob.blob.name
+    storage = AssetBlob.blob.field.storage
+    assert storage.exists(blob_key)
+    asset_metadata_count = AssetMetadata.objects.count()
+    version_metadata_count = VersionMetadata.objects.count()
+
+    report = collect_garbage(grace_period=timedelta(0), batch_size=1)
+
+    assert report.assets == 1
+    assert report.asset_blobs == 1
+    assert report.asset_blob_bytes == orphaned_asset.blob.size
+    assert report.asset_metadata == asset_metadata_count - AssetMetadata.objects.count()
+    assert report.version_metadata == version_metadata_count - VersionMetadata.objects.count()
+    assert not Asset.objects.filter(pk=orphaned_asset.pk).exists()
+    assert not AssetBlob.objects.filter(pk=orphaned_asset.blob_id).exists()
+    assert not AssetMetadata.objects.filter(pk=orphaned_asset.metadata_id).exists()
+    assert not VersionMetadata.objects.filter(pk=orphans['version_metadata'].pk).exists()
+    assert not storage.exists(blob_key)
+
+    live_asset = orphans['live_asset']
+    assert Asset.objects.filter(pk=live_asset.pk).exists()
+    assert AssetMetadata.objects.filter(pk=live_asset.metadata_id).exists()
+    assert storage.exists(live_asset.blob.blob.name)
+
+
+@pytest.mark.django_db
+def test_collect_garbage_grace_period(orphans):
+    report = collect_garbage()
+
+    assert report.assets == 0
+    assert report.asset_blobs == 0
+    assert Asset.objects.filter(pk=orphans['asset'].pk).exists()
+
+
+@pytest.mark.django_db
+def test_collect_garbage_keeps_previous_assets(version, asset_factory):
+    previous_asset = asset_factory()
+    version.assets.add(asset_factory(previous=previous_asset, blob=previous_asset.blob))
+
+    collect_garbage(grace_period=timedelta(0))
+
+    assert Asset.objects.filter(pk=previous_asset.pk).exists()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_collect_garbage_stats(orphans):
+    StatsSnapshot.refresh()
+    size = StatsSnapshot.load().size
+
+    collect_garbage(grace_period=timedelta(0))
+
+    assert StatsSnapshot.load().size == size - orphans['asset'].blob.size
+
+
+@pytest.mark.django_db
+def test_collect_garbage_keeps_reused(asset_blob, asset_metadata_factory):
+    asset_metadata = asset_metadata_factory(metadata={'path': 'foo/bar.nwb'})
+    old = timezone.now() - timedelta(days=30)
+    AssetBlob.objects.filter(pk=asset_blob.pk).update(modified=old)
+    AssetMetadata.objects.filter(pk=asset_metadata.pk).update(modified=old)
+
+    # An asset which is being registered reuses the orphaned blob and metadata
+    asset = Asset(path='foo/bar.nwb', blob=asset_blob, metadata=asset_metadata)
+    asset.save()
+    assert asset.metadata_id == asset_metadata.pk
+    Asset.objects.filter(pk=asset.pk).delete()
+
+    report = collect_garbage(grace_period=timedelta(days=1))
+
+    assert report.asset_blobs == 0
+    assert report.asset_metadata == 0
+    assert AssetBlob.objects.filter(pk=asset_blob.pk).exists()
+    assert AssetMetadata.objects.filter(pk=asset_metadata.pk).exists()
+
+
+@pytest.mark.django_db
+def test_collect_garbage_dry_run(orphans):
+    stdout = io.StringIO()
+
+    call_command('collect_garbage', dry_run=True, grace_period=0, stdout=stdout)
+
+    report = collect_garbage(grace_period=timedelta(0), dry_run=True)
+    assert stdout.getvalue() == f'Would delete {report}\n'
+    assert report.assets == 1
+    assert report.version_metadata == VersionMetadata.objects.filter(versions=None).count()
+    assert Asset.objects.filter(pk=orphans['asset'].pk).exists()
+    assert VersionMetadata.objects.filter(pk=orphans['version_metadata'].pk).exists()
+
+
+@pytest.mark.django_db
+def test_collect_garbage_uploads(validation_factory):
+    storage = Validation.blob.field.storage
+    abandoned_key = storage.save('uploads/abandoned', ContentFile(b'abandoned'))
+    validation = validation_factory(state=Validation.State.IN_PROGRESS)
+    assert validation.blob.name.startswith('uploads/')
+
+    collect_garbage(grace_period=timedelta(0))
+
+    assert not storage.exists(abandoned_key)
+    assert storage.exists(validation.blob.name)
+
+
+@pytest.mark.django_db
+def test_collect_garbage_girder_uploads():
+    storage = Validation.blob.field.storage
+    girder_import = GirderImport.objects.create(girder_folder_id='0' * 24)
+    keys = {}
+    for state in [GirderImportFile.State.IN_PROGRESS, GirderImportFile.State.FAILED]:
+        import_file = girder_import.files.create(
+            girder_id=uuid.uuid4().hex[:24], path=state, size=1, state=state
+        )
+        keys[state] = storage.save(
+            f'{girder_importer.UPLOADS_PREFIX}{import_file.girder_id}', ContentFile(b'a')
+        )
+
+    collect_garbage(grace_period=timedelta(0))
+
+    # Only a file which is still being transferred keeps its upload
+    assert storage.exists(keys[GirderImportFile.State.IN_PROGRESS])
+    assert not storage.exists(keys[GirderImportFile.State.FAILED])
+
+
+@pytest.mark.django_db
+def test_reap_multipart_uploads(user):
+    storage = Validation.blob.field.storage
+    multipart_uploads = []
+    for size in [10, 20, 40]:
+        object_key = f'uploads/{uuid.uuid4()}'
+        upload_id = MultipartManager.from_storage(storage)._create_upload_id(object_key)
+        multipart_upload = MultipartUpload(
+            object_key=object_key, upload_id=upload_id, size=size, user=user
+        )
+        multipart_upload.save()
+        multipart_uploads.append(multipart_upload)
+    expired, completed, outstanding = multipart_uploads
+    MultipartUpload.objects.filter(pk__in=[expired.pk, completed.pk]).update(
+        created=timezone.now() - MultipartUpload.EXPIRY - timedelta(minutes=1)
+    )
+    # An upload which was completed can no longer be aborted
+    MultipartManager.from_storage(storage)._abort_upload_id(
+        completed.object_key, completed.upload_id
+    )
+
+    assert reap_multipart_uploads(batch_size=1) == 2
+
+    assert list(MultipartUpload.objects.all()) == [outstanding]
+    snapshot = StatsSnapshot.refresh()
+    assert snapshot.outstanding_upload_count == 1
+    assert snapshot.outstanding_upload_size == outstanding.size
+
+
+@pytest.mark.django_db
+def test_reap_multipart_uploads_failure(mocker):
+    expired = timezone.now() - MultipartUpload.EXPIRY - timedelta(minutes=1)
+    uploads = []
+    for _ in range(3):
+        upload = MultipartUpload(object_key=f'uploads/{uuid.uuid4()}', upload_id='test', size=1)
+        upload.save()
+        uploads.append(upload)
+    MultipartUpload.objects.update(created=expired)
+    failing = uploads[1]
+
+    def abort(storage, key, upload_id):
+        if key == failing.object_key:
+            raise IOError('Failed')
+        return True
+
+    mocker.patch.object(garbage_collection, 'abort_multipart_upload', abort)
+
+    # One failure doesn't stop the others from being reaped
+    assert reap_multipart_uploads() == 2
+    assert list(MultipartUpload.objects.all()) == [failing]
@@ -0,0 +1,74 @@
+import asyncio
+
+import httpx
+import pytest
+
+from dandiapi.api.girder import AsyncGirderClient, GirderError, GirderListingCache
+
+from .girder import MockGirderServer
+
+
+def crawl(client: AsyncGirderClient, folder_id: str):
+    async def collect():
+        async with client:
+            return [f async for f in client.files_in_folder(folder_id)]
+
+    return asyncio.run(collect())
+
+
+@pytest.mark.parametrize('concurrency,page_size', [(1, 1000), (4, 2), (16, 1)])
+def test_async_girder_client_files_in_folder(concurrency, page_size):
+    server = MockGirderServer(depth=2, subfolders=2, items=3)
+    client = AsyncGirderClient(
+        concurrency=concurrency, page_size=page_size, transport=server.transport
+    )
+
+    files = crawl(client, server.root_id)
+
+    assert sorted(f.path for f in files) == sorted(server.expected_paths())
+    # Never request an unlimited listing
+    listing_params = [
+        httpx.QueryParams(request.url.query)
+        for request in server.requests
+        if request.url.path.endswith(('/folder', '/item'))
+    ]
+    assert listing_params
+    assert all(int(params['limit']) == page_size for params in listing_params)
+
+
+def test_async_girder_client_listing_cache(tmp_path):
+    server = MockGirderServer(depth=2, subfolders=2, items=3)
+    listing_cache = GirderListingCache(tmp_path)
+
+    files = crawl(
+        AsyncGirderClient(listing_cache=listing_cache, transport=server.transport), server.root_id
+    )
+    request_count = len(server.requests)
+    cached_files = crawl(
+        AsyncGirderClient(listing_cache=listing_cache, transport=server.transport), server.root_id
+    )
+
+    assert sorted(f.path for f in cached_files) == sorted(f.path for f in files)
+    # Every listing was read from the cache
+    assert len(server.requests) == request_count
+
+
+def test_async_girder_client_files_in_folder_empty_file():
+    server = MockGirderServer(depth=1, subfolders=1, items=1)
+    empty_item = server.items[server.root_id][0]
+    server.files[empty_item['_id']][0]['size'] = 0
+    client = AsyncGirderClient(transport=server.transport)
+
+    with pytest.raises(GirderError, match='Found empty file'):
+        crawl(client, server.root_id)
+
+
+def test_async_girder_client_authenticate():
+    server = MockGirderServer(depth=0)
+
+    async def authenticate():
+        async with AsyncGirderClient(transport=server.transport) as client:
+            await client.authenticate()
+            return client.headers['Girder-Token']
+
+    assert asyncio.run(authenticate()) == 'mocktoken'
@@ -0,0 +1,198 @@
+import functools
+import hashlib
+import io
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+import pytest
+
+from dandiapi.api import girder_importer, tasks
+from dandiapi.api.girder import AsyncGirderClient, GirderClient
+from dandiapi.api.management.commands import import_girder_dandiset
+from dandiapi.api.models import AssetBlob, GirderImport, GirderImportFile, Version
+
+from .girder import MockGirderServer
+
+
+@pytest.fixture
+def girder_server(mocker) -> MockGirderServer:
+    server = MockGirderServer(depth=1, subfolders=2, items=2)
+    client_class = functools.partial(GirderClient, transport=server.transport)
+    for module in [girder_importer, tasks, import_girder_dandiset]:
+        mocker.patch.object(module, 'GirderClient', client_class)
+    mocker.patch.object(
+        girder_importer,
+        'AsyncGirderClient',
+        functools.partial(AsyncGirderClient, transport=server.transport),
+    )
+    return server
+
+
+def request_count(server: MockGirderServer, suffix: str) -> int:
+    return len([r for r in server.requests if r.url.path.endswith(suffix)])
+
+
+def download_count(server: MockGirderServer) -> int:
+    return request_count(server, '/download')
+
+
+def assert_imported(server: MockGirderServer, owner):
+    girder_import = GirderImport.objects.get(girder_folder_id=server.root_id)
+    assert girder_import.state == GirderImport.State.SUCCEEDED
+    assert girder_import.dandiset.identifier == server.root['name']
+    assert list(girder_import.dandiset.owners) == [owner]
+    assert not girder_import.locked
+    assert request_count(server, f'dandi/{server.root["name"]}/lock') == 1
+    assert request_count(server, f'dandi/{server.root["name"]}/unlock') == 1
+
+    version = Version.objects.get(dandiset=girder_import.dandiset, version='draft')
+    assert version.name == server.root['meta']['dandiset']['name']
+    assert sorted(asset.path for asset in version.assets.all()) == sorted(
+        path.lstrip('/') for path in server.expected_paths()
+    )
+
+    for import_file in girder_import.files.select_related('blob'):
+        content = server.contents[import_file.girder_id]
+        assert import_file.blob.sha256 == hashlib.sha256(content).hexdigest()
+        assert import_file.blob.size == len(content)
+        assert import_file.blob.blob.name == AssetBlob.blob_key(import_file.blob.sha256)
+        with import_file.blob.blob.open() as f:
+            assert f.read() == content
+
+
+def test_hashing_reader():
+    reader = girder_importer.HashingReader(iter([b'abc', b'', b'defgh', b'i']))
+
+    assert reader.read(2) == b'ab'
+    assert reader.read(4) == b'cdef'
+    assert reader.read() == b'ghi'
+    assert reader.read(1) == b''
+    assert reader.size == 9
+    assert reader.checksum == hashlib.sha256(b'abcdefghi').hexdigest()
+
+
+@pytest.mark.django_db
+def test_import_girder_dandiset_sync(user, girder_server):
+    call_command(
+        'import_girder_dandiset', girder_server.root_id, owner=user.username, sync=True, workers=1
+    )
+
+    assert_imported(girder_server, user)
+
+
+@pytest.mark.django_db
+def test_import_girder_dandiset_requires_owner(girder_server):
+    with pytest.raises(CommandError, match='--owner is required'):
+        call_command('import_girder_dandiset', girder_server.root_id, sync=True)
+    with pytest.raises(CommandError, match='User nobody does not exist'):
+        call_command('import_girder_dandiset', girder_server.root_id, owner='nobody', sync=True)
+
+    assert not GirderImport.objects.exists()
+
+
+@pytest.mark.django_db
+def test_import_girder_dandiset_dry_run(settings, tmp_path, girder_server):
+    settings.DANDI_GIRDER_LISTING_CACHE_DIR = str(tmp_path)
+    stdout = io.StringIO()
+
+    call_command('import_girder_dandiset', girder_server.root_id, dry_run=True, stdout=stdout)
+    requests_made = len(girder_server.requests)
+    call_command('import_girder_dandiset', girder_server.root_id, dry_run=True, stdout=stdout)
+
+    assert not GirderImport.objects.exists()
+    total_size = sum(len(content) for content in girder_server.contents.values())
+    assert (
+        stdout.getvalue().count(
+            f'Would import {len(girder_server.contents)} files ({total_size} bytes)'
+        )
+        == 2
+    )
+    # The second dry run only authenticated, and read every listing from the cache
+    assert len(girder_server.requests) == requests_made + 1
+    assert download_count(girder_server) == 0
+
+
+@pytest.mark.django_db
+def test_import_girder_dandiset_resume(user, girder_server):
+    import_file_ids = [files[0]['_id'] for files in girder_server.files.values()]
+    broken_id = import_file_ids[0]
+    content = girder_server.contents[broken_id]
+    # Truncate the content of one file, so its transfer fails
+    girder_server.contents[broken_id] = content[:-1]
+
+    with pytest.raises(CommandError, match='1 files failed to transfer'):
+        call_command(
+            'import_girder_dandiset',
+            girder_server.root_id,
+            owner=user.username,
+            sync=True,
+            workers=1,
+        )
+
+    girder_import = GirderImport.objects.get(girder_folder_id=girder_server.root_id)
+    assert girder_import.state == GirderImport.State.TRANSFERRING
+    assert girder_import.files.get(girder_id=broken_id).state == GirderImportFile.State.FAILED
+    assert girder_import.pending_count == 1
+    assert download_count(girder_server) == len(import_file_ids)
+
+    girder_server.contents[broken_id] = content
+    # A resumed import keeps its owner
+    call_command('import_girder_dandiset', girder_server.root_id, sync=True, workers=1)
+
+    assert_imported(girder_server, user)
+    # Only the failed file was downloaded again
+    assert download_count(girder_server) == len(import_file_ids) + 1
+
+
+@pytest.mark.django_db
+def test_import_girder_dandiset_task(mocker, user, girder_server):
+    # Run each dispatched task immediately
+    for task in [tasks.transfer_girder_file, tasks.finalize_girder_import]:
+        mocker.patch.object(task, 'delay', task)
+    girder_import = GirderImport.objects.create(girder_folder_id=girder_server.root_id, owner=user)
+
+    tasks.import_girder_dandiset(girder_import.id)
+
+    assert_imported(girder_server, user)
+    # Every task authenticates for itself, rather than receiving a token
+    assert request_count(girder_server, 'api_key/token') == girder_import.file_count + 2
+
+
+@pytest.mark.django_db
+def test_import_girder_dandiset_task_claims_files(mocker, girder_server):
+    transfer_delay = mocker.patch.object(tasks.transfer_girder_file, 'delay')
+    girder_import = GirderImport.objects.create(girder_folder_id=girder_server.root_id)
+
+    tasks.import_girder_dandiset(girder_import.id)
+    assert transfer_delay.call_count == girder_import.file_count
+    assert set(girder_import.files.values_list('state', flat=True)) == {
+        GirderImportFile.State.IN_PROGRESS
+    }
+
+    # Files which are still being transferred are not dispatched again
+    tasks.import_girder_dandiset(girder_import.id)
+    assert transfer_delay.call_count == girder_import.file_count
+    # The dandiset is only locked once
+    assert request_count(girder_server, f'dandi/{girder_server.root["name"]}/lock') == 1
+
+
+@pytest.mark.django_db
+def test_import_girder_dandiset_deduplicates_blobs(user, girder_server):
+    import_file_ids = [files[0]['_id'] for files in girder_server.files.values()]
+    # Give two files identical content
+    first, second = import_file_ids[:2]
+    for files in girder_server.files.values():
+        if files[0]['_id'] == second:
+            files[0]['size'] = len(girder_server.contents[first])
+    girder_server.contents[second] = girder_server.contents[first]
+
+    call_command(
+        'import_girder_dandiset', girder_server.root_id, owner=user.username, sync=True, workers=1
+    )
+
+    assert_imported(girder_server, user)
+    girder_import = GirderImport.objects.get(girder_folder_id=girder_server.root_id)
+    assert (
+        girder_import.files.get(girder_id=first).blob
+        == girder_import.files.get(girder_id=second).blob
+    )
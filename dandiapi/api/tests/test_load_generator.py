@@ -0,0 +1,65 @@
+import random
+
+from django.core.wsgi import get_wsgi_application
+from django.db import connection
+import httpx
+import pytest
+from rest_framework.authtoken.models import Token
+
+from dandiapi.api import load_generator, tasks
+from dandiapi.api.models import Version
+
+
+def test_percentile():
+    values = [5, 1, 4, 2, 3]
+
+    assert load_generator.percentile(values, 50) == 3
+    assert load_generator.percentile(values, 90) == 5
+    assert load_generator.percentile(values, 0) == 1
+
+
+def test_lognormal_sizes_median():
+    sizes = load_generator.lognormal_sizes(1000, 1)
+    rng = random.Random(0)
+
+    assert 900 < load_generator.percentile([sizes(rng) for _ in range(1000)], 50) < 1100
+
+
+@pytest.fixture
+def wsgi_transport() -> httpx.WSGITransport:
+    django_application = get_wsgi_application()
+
+    def application(environ, start_response):
+        try:
+            return django_application(environ, start_response)
+        finally:
+            # Each simulated client runs in its own thread, whose connection must not outlive it
+            connection.close()
+
+    return httpx.WSGITransport(app=application)
+
+
+# Simulated clients run in their own threads, so they can't see data from the test transaction
+@pytest.mark.django_db(transaction=True)
+def test_generate_load(mocker, user, wsgi_transport):
+    # Run each validation immediately
+    mocker.patch.object(tasks.validate, 'delay', tasks.validate)
+    token, _ = Token.objects.get_or_create(user=user)
+
+    report = load_generator.generate_load(
+        'http://testserver',
+        token.key,
+        clients=2,
+        files=3,
+        sizes=load_generator.uniform_sizes(100),
+        transport=wsgi_transport,
+    )
+
+    assert report.errors == []
+    assert report.files == 3
+    assert report.throughput > 0
+    assert set(report.durations) == {*load_generator.STAGES, 'total'}
+    assert all(len(durations) == 3 for durations in report.durations.values())
+    version = Version.objects.get(dandiset__id=int(report.dandiset_identifier), version='draft')
+    assert version.assets.count() == 3
+    assert sum(asset.size for asset in version.assets.all()) == report.bytes
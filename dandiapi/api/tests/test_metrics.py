@@ -0,0 +1,97 @@
+import re
+
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient
+from django.urls import resolve
+from prometheus_client import REGISTRY
+import pytest
+from rest_framework.test import APIClient
+
+SERVER_TIMING_RE = re.compile(
+    r'db;dur=(?P<db>[\d.]+);desc="(?P<queries>\d+) queries", '
+    r'render;dur=(?P<render>[\d.]+), total;dur=(?P<total>[\d.]+)'
+)
+
+
+@pytest.fixture
+def sample_all(settings):
+    settings.DANDI_REQUEST_METRICS_SAMPLE_RATE = 1.0
+
+
+def query_count_sum(view: str) -> float:
+    return (
+        REGISTRY.get_sample_value('dandi_request_queries_sum', {'view': view, 'method': 'GET'}) or 0
+    )
+
+
+@pytest.mark.django_db
+def test_request_metrics_server_timing(sample_all, api_client, dandiset):
+    view = 'dandiset-list'
+    queries_before = query_count_sum(view)
+
+    response = api_client.get('/api/dandisets/')
+
+    timing = SERVER_TIMING_RE.fullmatch(response['Server-Timing'])
+    assert timing
+    assert int(timing['queries']) > 0
+    assert float(timing['render']) > 0
+    assert float(timing['total']) >= float(timing['db']) + float(timing['render'])
+    assert query_count_sum(view) == queries_before + int(timing['queries'])
+
+
+@pytest.mark.django_db
+def test_request_metrics_async_view(sample_all):
+    view = resolve('/api/stats/').view_name
+    queries_before = query_count_sum(view)
+
+    async def get():
+        return await AsyncClient().get('/api/stats/')
+
+    response = async_to_sync(get)()
+
+    timing = SERVER_TIMING_RE.fullmatch(response['Server-Timing'])
+    assert timing
+    # The snapshot is loaded in another thread, whose queries are still recorded
+    assert int(timing['queries']) > 0
+    assert query_count_sum(view) == queries_before + int(timing['queries'])
+
+
+@pytest.mark.django_db
+def test_request_metrics_disabled(api_client, dandiset):
+    response = api_client.get('/api/dandisets/')
+
+    assert 'Server-Timing' not in response
+
+
+@pytest.mark.django_db
+def test_request_metrics_sampled(settings, mocker, api_client, dandiset):
+    settings.DANDI_REQUEST_METRICS_SAMPLE_RATE = 0.5
+    mocker.patch('random.random', side_effect=[0.7, 0.3])
+
+    assert 'Server-Timing' not in api_client.get('/api/dandisets/')
+    assert 'Server-Timing' in api_client.get('/api/dandisets/')
+
+
+@pytest.mark.django_db
+def test_metrics_view(sample_all, user, api_client, dandiset):
+    user.is_staff = True
+    user.save()
+    api_client.force_authenticate(user=user)
+    api_client.get('/api/dandisets/')
+
+    response = api_client.get('/api/metrics/')
+
+    assert response.status_code == 200
+    assert response['Content-Type'] == 'text/plain; charset=utf-8'
+    assert (
+        'dandi_request_duration_seconds_bucket{le="0.005",method="GET",view="dandiset-list"}'
+        in response.content.decode()
+    )
+
+
+@pytest.mark.django_db
+def test_metrics_view_not_staff(user):
+    api_client = APIClient()
+    api_client.force_authenticate(user=user)
+
+    assert api_client.get('/api/metrics/').status_code == 403
@@ -0,0 +1,64 @@
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+import pytest
+
+# The state of the apps which the migrations below use, besides api
+DEPENDENCIES = [
+    ('auth', '0012_alter_user_first_name_max_length'),
+    ('contenttypes', '0002_remove_content_type_name'),
+    ('guardian', '0002_generic_permissions_index'),
+]
+
+
+def migrate(app_migrations):
+    """Migrate the database, and return the historical apps at that state."""
+    executor = MigrationExecutor(connection)
+    executor.migrate(app_migrations)
+    return executor.loader.project_state(app_migrations + DEPENDENCIES).apps
+
+
+@pytest.fixture
+def migrate_back():
+    """Migrate back to the latest migrations once the test is done."""
+    yield
+    executor = MigrationExecutor(connection)
+    executor.migrate(executor.loader.graph.leaf_nodes())
+
+
+@pytest.mark.django_db(transaction=True)
+def test_move_to_dandiset_permissions(migrate_back):
+    before = [('api', '0014_validation_metrics')]
+    after = [('api', '0015_dandiset_user_object_permission')]
+
+    apps = migrate(before)
+    content_type = apps.get_model('contenttypes', 'ContentType').objects.get(
+        app_label='api', model='dandiset'
+    )
+    permission = apps.get_model('auth', 'Permission').objects.get(
+        content_type=content_type, codename='owner'
+    )
+    user = apps.get_model('auth', 'User').objects.create(username='owner')
+    dandiset = apps.get_model('api', 'Dandiset').objects.create()
+    UserObjectPermission = apps.get_model('guardian', 'UserObjectPermission')  # noqa: N806
+    # The permission of a dandiset which was deleted was left behind
+    for object_pk in [dandiset.pk, dandiset.pk + 1]:
+        UserObjectPermission.objects.create(
+            user=user, permission=permission, content_type=content_type, object_pk=str(object_pk)
+        )
+
+    apps = migrate(after)
+
+    assert list(
+        apps.get_model('api', 'DandisetUserObjectPermission').objects.values_list(
+            'content_object_id', 'permission_id', 'user_id'
+        )
+    ) == [(dandiset.pk, permission.pk, user.pk)]
+    assert not apps.get_model('guardian', 'UserObjectPermission').objects.exists()
+
+    apps = migrate(before)
+
+    assert list(
+        apps.get_model('guardian', 'UserObjectPermission').objects.values_list(
+            'object_pk', 'permission_id', 'user_id'
+        )
+    ) == [(str(dandiset.pk), permission.pk, user.pk)]
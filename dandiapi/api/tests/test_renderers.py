@@ -0,0 +1,79 @@
+from datetime import datetime, timezone
+from decimal import Decimal
+import io
+import json
+from uuid import uuid4
+
+from django.core.management import call_command
+import pytest
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from dandiapi.api.renderers import FastJSONParser, FastJSONRenderer
+
+
+@pytest.mark.parametrize(
+    'data',
+    [
+        None,
+        {},
+        [],
+        {'count': 1, 'results': [{'uuid': uuid4(), 'size': 2 ** 40, 'name': 'ünïcode\u2028'}]},
+        {'created': datetime(2021, 1, 2, 3, 4, 5, 678901, tzinfo=timezone.utc)},
+        {'separators': 'a b c', 'float': 1.5, 'decimal': Decimal('1.50')},
+        {1: 'non-string key', 'nested': {'list': [True, False, None]}},
+        {'big': 2 ** 70},
+    ],
+    ids=[
+        'none',
+        'empty-dict',
+        'empty-list',
+        'listing',
+        'datetime',
+        'separators',
+        'non-string-key',
+        'big-int',
+    ],
+)
+def test_fast_json_renderer_matches_json_renderer(data):
+    assert FastJSONRenderer().render(data) == JSONRenderer().render(data)
+
+
+def test_fast_json_renderer_float_formatting():
+    data = {'large': 1e16, 'small': 1e-7, 'list': [0.1, 2.5e300]}
+    # The formatting of some floats differs, but they decode to the same values
+    assert json.loads(FastJSONRenderer().render(data)) == json.loads(JSONRenderer().render(data))
+
+
+@pytest.mark.parametrize('value', [float('nan'), float('inf'), float('-inf')])
+def test_fast_json_renderer_non_finite_float(value):
+    # STRICT_JSON is enabled by default, so these are rejected rather than rendered as null
+    with pytest.raises(ValueError):
+        FastJSONRenderer().render({'nested': [{'value': value}]})
+
+
+def test_fast_json_renderer_indent():
+    data = {'a': [1, 2]}
+    assert FastJSONRenderer().render(data, 'application/json; indent=4') == JSONRenderer().render(
+        data, 'application/json; indent=4'
+    )
+
+
+def test_fast_json_parser():
+    body = b'{"metadata": {"path": "foo/b\xc3\xa4r.nwb"}, "sha256": "abc", "size": 12}'
+    assert FastJSONParser().parse(io.BytesIO(body)) == JSONParser().parse(io.BytesIO(body))
+
+
+def test_fast_json_parser_invalid():
+    with pytest.raises(ParseError):
+        FastJSONParser().parse(io.BytesIO(b'{"foo": '))
+
+
+@pytest.mark.django_db
+def test_benchmark_serializers(version, asset):
+    version.assets.add(asset)
+    stdout = io.StringIO()
+    call_command('benchmark_serializers', rows=5, repeat=1, stdout=stdout)
+    assert 'asset (1 rows)' in stdout.getvalue()
+    assert 'version (1 rows)' in stdout.getvalue()
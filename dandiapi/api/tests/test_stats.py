@@ -1,5 +1,11 @@
+from django.db import transaction
 import pytest
 
+from dandiapi.api.models import StatsSnapshot
+from dandiapi.api.tasks import refresh_stats
+
+from .fuzzy import TIMESTAMP_RE
+
 
 @pytest.mark.django_db
 def test_stats_baseline(api_client):
@@ -9,6 +15,7 @@ def test_stats_baseline(api_client):
         # django-guardian automatically creates an AnonymousUser
         'user_count': 1,
         'size': 0,
+        'modified': TIMESTAMP_RE,
     }
 
 
@@ -42,3 +49,71 @@ def test_stats_asset(api_client, asset):
     stats = api_client.get('/api/stats/').data
 
     assert stats['size'] == asset.size
+
+
+@pytest.mark.django_db
+def test_stats_asset_shared_blob(api_client, asset_blob, asset_factory):
+    asset_factory(blob=asset_blob)
+    asset_factory(blob=asset_blob)
+    stats = api_client.get('/api/stats/').data
+
+    # Deduplicated blobs are only counted once
+    assert stats['size'] == asset_blob.size
+
+
+# Sizes are counted once their transaction commits
+@pytest.mark.django_db(transaction=True)
+def test_stats_incremental(api_client, version, asset_factory, published_version_factory):
+    # Compute the initial snapshot
+    api_client.get('/api/stats/')
+
+    asset = asset_factory()
+    version.assets.add(asset)
+    # A second asset sharing the blob does not add to the size
+    asset_factory(blob=asset.blob)
+    published_version_factory(dandiset=version.dandiset)
+    # A second published version does not add to the published count
+    published_version_factory(dandiset=version.dandiset)
+
+    stats = api_client.get('/api/stats/').data
+    assert stats['dandiset_count'] == 1
+    assert stats['published_dandiset_count'] == 1
+    assert stats['size'] == asset.size
+
+
+@pytest.mark.django_db(transaction=True)
+def test_stats_incremental_rolled_back(api_client, asset_blob, asset_factory):
+    api_client.get('/api/stats/')
+
+    with transaction.atomic():
+        asset_factory(blob=asset_blob)
+        transaction.set_rollback(True)
+
+    asset_blob.refresh_from_db()
+    assert not asset_blob.counted
+    assert api_client.get('/api/stats/').data['size'] == 0
+
+    asset_factory(blob=asset_blob)
+
+    assert api_client.get('/api/stats/').data['size'] == asset_blob.size
+
+
+@pytest.mark.django_db
+def test_stats_cached(api_client, django_assert_num_queries):
+    api_client.get('/api/stats/')
+
+    with django_assert_num_queries(0):
+        api_client.get('/api/stats/')
+
+
+@pytest.mark.django_db
+def test_stats_refresh(api_client, user_factory):
+    api_client.get('/api/stats/')
+    # Users are not tracked incrementally
+    user_factory()
+    assert api_client.get('/api/stats/').data['user_count'] == 1
+
+    refresh_stats()
+
+    assert api_client.get('/api/stats/').data['user_count'] == 2
+    assert StatsSnapshot.objects.count() == 1
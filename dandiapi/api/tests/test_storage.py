@@ -0,0 +1,47 @@
+from minio_storage.storage import MinioStorage
+from storages.backends.s3boto3 import S3Boto3Storage
+
+from dandiapi.api import storage
+from dandiapi.api.storage import create_s3_storage, get_minio_client
+
+
+def test_create_s3_storage_minio_cached(settings):
+    dandisets_storage = create_s3_storage(settings.DANDI_DANDISETS_BUCKET_NAME)
+
+    assert isinstance(dandisets_storage, MinioStorage)
+    assert create_s3_storage(settings.DANDI_DANDISETS_BUCKET_NAME) is dandisets_storage
+    other_storage = create_s3_storage(settings.MINIO_STORAGE_MEDIA_BUCKET_NAME)
+    assert other_storage is not dandisets_storage
+    # Every storage shares the pooled client of the process
+    assert dandisets_storage.client is other_storage.client is get_minio_client()
+    pool_kwargs = get_minio_client()._http.connection_pool_kw
+    assert pool_kwargs['maxsize'] == settings.DANDI_STORAGE_MAX_CONNECTIONS
+
+
+def test_create_s3_storage_s3boto3_cached(settings):
+    settings.DEFAULT_FILE_STORAGE = 'storages.backends.s3boto3.S3Boto3Storage'
+    settings.DANDI_STORAGE_MAX_CONNECTIONS = 7
+
+    dandisets_storage = create_s3_storage(settings.DANDI_DANDISETS_BUCKET_NAME)
+
+    assert isinstance(dandisets_storage, S3Boto3Storage)
+    assert create_s3_storage(settings.DANDI_DANDISETS_BUCKET_NAME) is dandisets_storage
+    assert dandisets_storage.config.max_pool_connections == 7
+    assert dandisets_storage.config.tcp_keepalive
+    # Connections are reused
+    assert dandisets_storage.connection is dandisets_storage.connection
+
+
+def test_connections_discarded_after_fork(settings):
+    minio_storage = create_s3_storage(settings.DANDI_DANDISETS_BUCKET_NAME)
+    minio_client = minio_storage.client
+    settings.DEFAULT_FILE_STORAGE = 'storages.backends.s3boto3.S3Boto3Storage'
+    s3boto3_storage = create_s3_storage(settings.DANDI_DANDISETS_BUCKET_NAME)
+    connection = s3boto3_storage.connection
+
+    # Run the hook which runs in the child process after a fork
+    storage._discard_connections()
+
+    assert create_s3_storage(settings.DANDI_DANDISETS_BUCKET_NAME) is s3boto3_storage
+    assert s3boto3_storage.connection is not connection
+    assert minio_storage.client is not minio_client
@@ -1,7 +1,7 @@
 import pytest
 import requests
 
-from dandiapi.api.models import Validation
+from dandiapi.api.models import MultipartUpload, Validation
 
 from .fuzzy import HTTP_URL_RE, UUID_RE, Re
 
@@ -94,6 +94,12 @@ def test_upload_initialize_and_complete(api_client, user, file_size):
     upload_id = initialization['upload_id']
     parts = initialization['parts']
 
+    # The upload is recorded until it is validated
+    multipart_upload = MultipartUpload.objects.get(object_key=object_key)
+    assert multipart_upload.upload_id == upload_id
+    assert multipart_upload.size == file_size
+    assert multipart_upload.user == user
+
     # Send the data directly to the object store
     transferred_parts = []
     part_number = 1
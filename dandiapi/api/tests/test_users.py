@@ -141,3 +141,44 @@ def test_user_search_limit_enforced(api_client, user, user_factory):
         ).data
         == [serialize(user) for user in users[:10]]
     )
+
+
+@pytest.mark.django_db
+def test_user_search_similar_name(api_client, user_factory):
+    # Names are random by default, so they could be similar to the search
+    api_client.force_authenticate(
+        user=user_factory(username='alovelace', first_name='Ada', last_name='Lovelace')
+    )
+
+    jonathan = user_factory(username='jsmith', first_name='Jonathan', last_name='Smith')
+    user_factory(username='jdoe', first_name='Jane', last_name='Doe')
+
+    assert (
+        api_client.get(
+            '/api/users/search/?',
+            {'username': 'Johnathan'},
+            format='json',
+        ).data
+        == [serialize(jonathan)]
+    )
+
+
+@pytest.mark.django_db
+def test_user_search_prefix_first(api_client, user_factory):
+    # Names are random by default, so they could be similar to the search
+    api_client.force_authenticate(
+        user=user_factory(username='alovelace', first_name='Ada', last_name='Lovelace')
+    )
+
+    similar = user_factory(username='jsmith', first_name='Smithers', last_name='Burns')
+    exact = user_factory(username='smithers', first_name='Waylon', last_name='Smithers')
+    prefix = user_factory(username='smithers_b', first_name='Monty', last_name='Burns')
+
+    assert (
+        api_client.get(
+            '/api/users/search/?',
+            {'username': 'smithers'},
+            format='json',
+        ).data
+        == [serialize(exact), serialize(prefix), serialize(similar)]
+    )
@@ -1,11 +1,18 @@
+import asyncio
 import hashlib
+import io
+import time
 
+from asgiref.sync import async_to_sync
 from django.core.files.base import ContentFile
 from django.core.files.storage import Storage
+from django.core.management import call_command
+from django.test import AsyncClient
 import pytest
+from rest_framework.authtoken.models import Token
 
 from dandiapi.api import tasks
-from dandiapi.api.models import AssetBlob, Validation
+from dandiapi.api.models import AssetBlob, MultipartUpload, Validation
 
 from .fuzzy import TIMESTAMP_RE
 
@@ -42,6 +49,29 @@ def test_validate(api_client, user):
     # TODO how to test that the celery job kicked off?
 
 
+@pytest.mark.django_db
+def test_validate_forgets_multipart_upload(api_client, user):
+    api_client.force_authenticate(user=user)
+    object_key = 'test.txt'
+    contents = b'test content'
+    Validation.blob.field.storage.save(object_key, ContentFile(contents))
+    MultipartUpload(object_key=object_key, upload_id='test', size=len(contents), user=user).save()
+
+    sha256 = hashlib.sha256(contents).hexdigest()
+
+    api_client.post(
+        '/api/uploads/validate/',
+        {'object_key': object_key, 'sha256': sha256},
+        format='json',
+    )
+    # The upload is only known to be complete once the validation finds the object
+    assert MultipartUpload.objects.exists()
+
+    tasks.validate(Validation.objects.get(sha256=sha256).id)
+
+    assert not MultipartUpload.objects.exists()
+
+
 @pytest.mark.django_db
 @pytest.mark.parametrize('state', [Validation.State.SUCCEEDED, Validation.State.FAILED])
 @pytest.mark.parametrize(
@@ -125,11 +155,14 @@ def test_validate_in_progress_validation(api_client, user):
 
 
 @pytest.mark.django_db
-def test_validate_object_does_not_exist(api_client, user):
+def test_validate_object_does_not_exist(api_client, user, mocker):
     api_client.force_authenticate(user=user)
+    # The object store is not checked until the validation runs
+    object_key_exists = mocker.spy(Validation, 'object_key_exists')
 
     object_key = 'does-not-exist.txt'
     contents = b'test content'
+    MultipartUpload(object_key=object_key, upload_id='test', size=len(contents), user=user).save()
 
     h = hashlib.sha256()
     h.update(contents)
@@ -143,8 +176,18 @@ def test_validate_object_does_not_exist(api_client, user):
         },
         format='json',
     )
-    assert resp.status_code == 400
-    assert resp.data == ['Object does not exist.']
+    assert resp.status_code == 204
+    object_key_exists.assert_not_called()
+
+    validation = Validation.objects.get(sha256=sha256)
+    tasks.validate(validation.id)
+
+    validation.refresh_from_db()
+    assert validation.state == Validation.State.FAILED
+    assert validation.error == 'Object does not exist.'
+    assert validation.error_type == 'UploadNotFound'
+    # An upload which was never completed must still be aborted
+    assert MultipartUpload.objects.filter(object_key=object_key).exists()
 
 
 @pytest.mark.django_db
@@ -224,6 +267,11 @@ def test_validation_task(storage: Storage):
     # After copying the object, the original uploaded blob should be removed.
     assert not storage.exists(validation.blob.name)
 
+    # The size and the duration of each stage are recorded
+    assert validation.size == len(contents)
+    assert set(validation.durations) == {'checksum', 'copy', 'database', 'total'}
+    assert validation.durations['total'] >= validation.durations['checksum']
+
 
 @pytest.mark.django_db
 def test_validation_task_incorrect_checksum():
@@ -251,3 +299,61 @@ def test_validation_task_incorrect_checksum():
         validation.error
         == f'Given checksum {sha256} did not match calculated checksum {correct_sha256}.'
     )
+    assert validation.error_type == 'ChecksumMismatch'
+
+
+@pytest.mark.django_db
+def test_summarize_validations():
+    Validation.objects.create(
+        blob='uploads/a',
+        sha256='a' * 64,
+        state=Validation.State.SUCCEEDED,
+        size=4 * 2 ** 20,
+        durations={'checksum': 1.0, 'copy': 0.5, 'database': 0.5, 'total': 2.0},
+    )
+    Validation.objects.create(
+        blob='uploads/b',
+        sha256='b' * 64,
+        state=Validation.State.FAILED,
+        error_type='ChecksumMismatch',
+        durations={'checksum': 1.0, 'total': 1.0},
+    )
+    # Validations which are still running are not summarized
+    Validation.objects.create(blob='uploads/c', sha256='c' * 64)
+    stdout = io.StringIO()
+
+    call_command('summarize_validations', stdout=stdout)
+
+    summary = stdout.getvalue()
+    assert '2 validations in the last 24 hours: 1 succeeded, 1 failed' in summary
+    assert '4.0 MB in 2.0 s (2.0 MB/s overall' in summary
+    assert 'checksum: 1.0 s (50% of the time)' in summary
+    assert 'ChecksumMismatch: 1' in summary
+
+
+@pytest.mark.django_db
+def test_validate_concurrent_requests(mocker, user):
+    # When served by ASGI, requests wait for the broker concurrently
+    mocker.patch.object(tasks.validate, 'delay', side_effect=lambda validation_id: time.sleep(0.5))
+    token, _ = Token.objects.get_or_create(user=user)
+    client = AsyncClient()
+
+    async def validate_all():
+        return await asyncio.gather(
+            *[
+                client.post(
+                    '/api/uploads/validate/',
+                    {'object_key': f'uploads/{i}', 'sha256': f'{i}' * 64},
+                    content_type='application/json',
+                    authorization=f'Token {token.key}',
+                )
+                for i in range(4)
+            ]
+        )
+
+    start = time.monotonic()
+    responses = async_to_sync(validate_all)()
+
+    assert [response.status_code for response in responses] == [204] * 4
+    assert time.monotonic() - start < 4 * 0.5
+    assert Validation.objects.filter(state=Validation.State.IN_PROGRESS).count() == 4
@@ -3,6 +3,7 @@ from guardian.shortcuts import assign_perm
 import pytest
 
 from dandiapi.api.models import Version
+from dandiapi.api.views.serializers import VersionSerializer
 
 from .fuzzy import TIMESTAMP_RE, VERSION_ID_RE
 
@@ -51,6 +52,23 @@ def test_version_rest_list(api_client, version):
     }
 
 
+@pytest.mark.django_db
+def test_version_rest_list_matches_serializer(
+    api_client, version, published_version_factory, asset_factory
+):
+    published_version = published_version_factory(dandiset=version.dandiset)
+    version.assets.add(*[asset_factory() for _ in range(2)])
+    published_version.assets.add(asset_factory())
+
+    results = api_client.get(f'/api/dandisets/{version.dandiset.identifier}/versions/').data[
+        'results'
+    ]
+    expected = VersionSerializer(Version.objects.filter(dandiset=version.dandiset), many=True).data
+    assert sorted(results, key=lambda v: v['version']) == sorted(
+        expected, key=lambda v: v['version']
+    )
+
+
 @pytest.mark.django_db
 def test_version_rest_retrieve(api_client, version):
     assert api_client.get(
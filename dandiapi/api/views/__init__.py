@@ -1,7 +1,8 @@
-from .asset import AssetViewSet
+from .asset import AssetViewSet, asset_download_view
 from .auth import auth_token_view
 from .dandiset import DandisetViewSet
 from .info import info_view
+from .metrics import metrics_view
 from .stats import stats_view
 from .upload import (
     upload_complete_view,
@@ -16,6 +17,7 @@ __all__ = [
     'AssetViewSet',
     'DandisetViewSet',
     'VersionViewSet',
+    'asset_download_view',
     'auth_token_view',
     'upload_initialize_view',
     'upload_complete_view',
@@ -25,4 +27,5 @@ __all__ = [
     'users_search_view',
     'stats_view',
     'info_view',
+    'metrics_view',
 ]
@@ -1,21 +1,27 @@
+from asgiref.sync import sync_to_async
 from django.core.validators import RegexValidator
-from django.http import HttpResponseRedirect
+from django.http import Http404, HttpResponseRedirect
 from django.shortcuts import get_object_or_404
 from django.urls import reverse
 from django_filters import rest_framework as filters
 from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
-from guardian.utils import get_40x_or_None
 from rest_framework import serializers, status
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import IsAuthenticatedOrReadOnly
 from rest_framework.response import Response
 from rest_framework.viewsets import ReadOnlyModelViewSet
 from rest_framework_extensions.mixins import DetailSerializerMixin, NestedViewSetMixin
 
+from dandiapi.api.caching import cache_response, conditional_version_response, get_owner_40x_or_none
 from dandiapi.api.models import Asset, AssetBlob, AssetMetadata, Version
-from dandiapi.api.views.common import DandiPagination
-from dandiapi.api.views.serializers import AssetDetailSerializer, AssetSerializer
+from dandiapi.api.views.common import DandiPagination, async_api_view
+from dandiapi.api.views.serializers import (
+    AssetDetailSerializer,
+    AssetSerializer,
+    AssetValuesSerializer,
+)
 
 
 class AssetRequestSerializer(serializers.Serializer):
@@ -47,6 +53,21 @@ class AssetViewSet(NestedViewSetMixin, DetailSerializerMixin, ReadOnlyModelViewS
     filter_backends = [filters.DjangoFilterBackend]
     filterset_class = AssetFilter
 
+    @conditional_version_response(
+        dandiset_kwarg='versions__dandiset__pk', version_kwarg='versions__version'
+    )
+    @cache_response(
+        'published_assets',
+        dandiset_kwarg='versions__dandiset__pk',
+        version_kwarg='versions__version',
+    )
+    def list(self, request, *args, **kwargs):
+        queryset = AssetValuesSerializer.values(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(queryset)
+        return self.get_paginated_response(
+            [AssetValuesSerializer.to_representation(row) for row in page]
+        )
+
     @swagger_auto_schema(
         responses={
             200: 'The asset metadata.',
@@ -89,7 +110,7 @@ class AssetViewSet(NestedViewSetMixin, DetailSerializerMixin, ReadOnlyModelViewS
 
         # TODO @permission_required doesn't work on methods
         # https://github.com/django-guardian/django-guardian/issues/723
-        response = get_40x_or_None(request, ['owner'], version.dandiset, return_403=True)
+        response = get_owner_40x_or_none(request, version.dandiset)
         if response:
             return response
 
@@ -106,7 +127,11 @@ class AssetViewSet(NestedViewSetMixin, DetailSerializerMixin, ReadOnlyModelViewS
         if created:
             asset_metadata.save()
 
-        if version.assets.filter(path=path, blob=asset_blob, metadata=asset_metadata).exists():
+        # Find the assets at this path with the path index, then compare the few matches, rather
+        # than filtering every asset of the version on blob and metadata
+        if (asset_blob.id, asset_metadata.id) in version.assets.filter(path=path).values_list(
+            'blob_id', 'metadata_id'
+        ):
             return Response('Asset Already Exists', status=status.HTTP_400_BAD_REQUEST)
 
         asset = Asset(
@@ -135,7 +160,7 @@ class AssetViewSet(NestedViewSetMixin, DetailSerializerMixin, ReadOnlyModelViewS
 
         # TODO @permission_required doesn't work on methods
         # https://github.com/django-guardian/django-guardian/issues/723
-        response = get_40x_or_None(request, ['owner'], version.dandiset, return_403=True)
+        response = get_owner_40x_or_none(request, version.dandiset)
         if response:
             return response
 
@@ -181,24 +206,13 @@ class AssetViewSet(NestedViewSetMixin, DetailSerializerMixin, ReadOnlyModelViewS
 
         # TODO @permission_required doesn't work on methods
         # https://github.com/django-guardian/django-guardian/issues/723
-        response = get_40x_or_None(request, ['owner'], version.dandiset, return_403=True)
+        response = get_owner_40x_or_none(request, version.dandiset)
         if response:
             return response
 
         version.assets.remove(asset)
         return Response(None, status=status.HTTP_204_NO_CONTENT)
 
-    @swagger_auto_schema(
-        responses={
-            200: None,  # This disables the auto-generated 200 response
-            301: 'Redirect to object store',
-        }
-    )
-    @action(detail=True, methods=['GET'])
-    def download(self, request, **kwargs):
-        """Return a redirect to the file download in the object store."""
-        return HttpResponseRedirect(redirect_to=self.get_object().blob.blob.url)
-
     @swagger_auto_schema(
         manual_parameters=[
             openapi.Parameter('path_prefix', openapi.IN_QUERY, type=openapi.TYPE_STRING)
@@ -211,6 +225,9 @@ class AssetViewSet(NestedViewSetMixin, DetailSerializerMixin, ReadOnlyModelViewS
         },
     )
     @action(detail=False, methods=['GET'])
+    @conditional_version_response(
+        dandiset_kwarg='versions__dandiset__pk', version_kwarg='versions__version'
+    )
     def paths(self, request, **kwargs):
         """
         Return the unique files/directories that directly reside under the specified path.
@@ -226,4 +243,57 @@ class AssetViewSet(NestedViewSetMixin, DetailSerializerMixin, ReadOnlyModelViewS
 
         return Response(Asset.get_path(path_prefix, qs))
 
+    @swagger_auto_schema(
+        manual_parameters=[
+            openapi.Parameter('path', openapi.IN_QUERY, type=openapi.TYPE_STRING, required=True)
+        ],
+        responses={
+            200: AssetDetailSerializer(),
+            404: 'If no asset exists at the given path',
+        },
+    )
+    @action(detail=False, methods=['GET'], url_path='by-path')
+    @conditional_version_response(
+        dandiset_kwarg='versions__dandiset__pk', version_kwarg='versions__version'
+    )
+    def by_path(self, request, **kwargs):
+        """
+        Return the asset at exactly the specified path.
+
+        Unlike filtering the asset list by path, this matches the full path exactly.
+        """
+        path: str = self.request.query_params.get('path') or ''
+        if not path:
+            raise ValidationError('A path must be specified.')
+
+        # Paths are expected to be unique within a version, but that isn't enforced,
+        # so prefer the most recently created asset if there are duplicates.
+        asset = self.get_queryset().filter(path=path).order_by('-created').first()
+        if asset is None:
+            raise Http404('No asset exists at that path.')
+
+        serializer = AssetDetailSerializer(instance=asset)
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
     # TODO: add create to forge an asset from a validation
+
+
+@swagger_auto_schema(
+    method='GET',
+    responses={
+        200: None,  # This disables the auto-generated 200 response
+        301: 'Redirect to object store',
+    },
+)
+@async_api_view(['GET'])
+async def asset_download_view(request, versions__dandiset__pk, versions__version, uuid):
+    """Return a redirect to the file download in the object store."""
+    asset = await sync_to_async(get_object_or_404)(
+        Asset.objects.select_related('blob'),
+        versions__dandiset__pk=versions__dandiset__pk,
+        versions__version=versions__version,
+        uuid=uuid,
+    )
+    # Presigning the URL may look up the region of the bucket, without needing the database
+    url = await sync_to_async(lambda: asset.blob.blob.url, thread_sensitive=False)()
+    return HttpResponseRedirect(redirect_to=url)
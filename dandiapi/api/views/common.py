@@ -1,7 +1,99 @@
+import asyncio
+from functools import update_wrapper
+
+from asgiref.sync import sync_to_async
 from rest_framework.pagination import PageNumberPagination
+from rest_framework.views import APIView
 
 
 class DandiPagination(PageNumberPagination):
     page_size = 25
     max_page_size = 100
     page_size_query_param = 'page_size'
+
+
+class AsyncAPIView(APIView):
+    """
+    An APIView whose handlers may be coroutines.
+
+    When served by an ASGI server, such a view does not hold a thread while it waits, so one
+    worker process can serve many slow requests at once. Authentication, permissions and
+    throttling may query the database, so they run in a thread, like every other database query
+    of an async view must, with sync_to_async.
+    """
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        # Django only runs a view without a thread if it is a coroutine function
+        async def view(request, *args, **kwargs):
+            self = cls(**initkwargs)
+            self.setup(request, *args, **kwargs)
+            return await self.dispatch(request, *args, **kwargs)
+
+        view.cls = cls
+        view.initkwargs = initkwargs
+        # Like APIView, only SessionAuthentication enforces CSRF
+        view.csrf_exempt = True
+        update_wrapper(view, cls, updated=())
+        update_wrapper(view, cls.dispatch, assigned=())
+        return view
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(self, request.method.lower(), self.http_method_not_allowed)
+            else:
+                handler = self.http_method_not_allowed
+
+            response = handler(request, *args, **kwargs)
+            if asyncio.iscoroutine(response):
+                response = await response
+
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+
+def async_api_view(http_method_names):
+    """Convert a coroutine function into an AsyncAPIView, like @api_view does for functions."""
+
+    def decorator(func):
+        WrappedAPIView = type(  # noqa: N806
+            'WrappedAPIView', (AsyncAPIView,), {'__doc__': func.__doc__}
+        )
+        WrappedAPIView.http_method_names = [
+            method.lower() for method in {*http_method_names, 'options'}
+        ]
+
+        async def handler(self, *args, **kwargs):
+            return await func(*args, **kwargs)
+
+        for method in http_method_names:
+            setattr(WrappedAPIView, method.lower(), handler)
+
+        WrappedAPIView.__name__ = func.__name__
+        WrappedAPIView.__module__ = func.__module__
+        for attribute in [
+            'renderer_classes',
+            'parser_classes',
+            'authentication_classes',
+            'throttle_classes',
+            'permission_classes',
+        ]:
+            setattr(
+                WrappedAPIView, attribute, getattr(func, attribute, getattr(APIView, attribute))
+            )
+
+        return WrappedAPIView.as_view()
+
+    return decorator
@@ -4,7 +4,7 @@ from django.db.utils import IntegrityError
 from django.http import Http404
 from django.shortcuts import get_object_or_404
 from drf_yasg.utils import swagger_auto_schema
-from guardian.shortcuts import assign_perm, get_objects_for_user
+from guardian.shortcuts import assign_perm
 from guardian.utils import get_40x_or_None
 from rest_framework import filters, status
 from rest_framework.decorators import action
@@ -13,13 +13,15 @@ from rest_framework.response import Response
 from rest_framework.serializers import ValidationError
 from rest_framework.viewsets import ReadOnlyModelViewSet
 
-from dandiapi.api.mail import send_ownership_change_emails
 from dandiapi.api.models import Dandiset, Version, VersionMetadata
+from dandiapi.api.tasks import send_ownership_change_emails
 from dandiapi.api.views.common import DandiPagination
 from dandiapi.api.views.serializers import (
     DandisetDetailSerializer,
+    DandisetSerializer,
     UserSerializer,
     VersionMetadataSerializer,
+    VersionValuesSerializer,
 )
 
 
@@ -65,7 +67,7 @@ class DandisetViewSet(ReadOnlyModelViewSet):
         queryset = Dandiset.objects.all().order_by('created')
         user_kwarg = self.request.query_params.get('user', None)
         if user_kwarg == 'me':
-            return get_objects_for_user(self.request.user, 'owner', queryset, with_superuser=False)
+            return Dandiset.owned_by(self.request.user).order_by('created')
         return queryset
 
     def get_object(self):
@@ -81,6 +83,30 @@ class DandisetViewSet(ReadOnlyModelViewSet):
 
         return super().get_object()
 
+    def list(self, request, *args, **kwargs):
+        page = self.paginate_queryset(self.filter_queryset(self.get_queryset()))
+        # Fetch the most recent version of every dandiset on the page at once, rather than
+        # serializing most_recent_version one dandiset at a time
+        latest_version = Version.objects.filter(dandiset=OuterRef('dandiset')).order_by('-created')
+        most_recent_versions = {
+            row['dandiset_id']: VersionValuesSerializer.to_representation(row)
+            for row in VersionValuesSerializer.values(
+                Version.objects.filter(
+                    dandiset__in=[dandiset.id for dandiset in page],
+                    id=Subquery(latest_version.values('id')[:1]),
+                )
+            )
+        }
+        return self.get_paginated_response(
+            [
+                {
+                    **DandisetSerializer(dandiset).data,
+                    'most_recent_version': most_recent_versions.get(dandiset.id),
+                }
+                for dandiset in page
+            ]
+        )
+
     @swagger_auto_schema(
         request_body=VersionMetadataSerializer(),
         responses={200: DandisetDetailSerializer()},
@@ -162,22 +188,25 @@ class DandisetViewSet(ReadOnlyModelViewSet):
             serializer = UserSerializer(data=request.data, many=True)
             serializer.is_valid(raise_exception=True)
 
-            def get_user_or_400(username):
-                try:
-                    return User.objects.get(username=username)
-                except User.DoesNotExist:
+            usernames = [owner['username'] for owner in serializer.validated_data]
+            users = {user.username: user for user in User.objects.filter(username__in=usernames)}
+            for username in usernames:
+                if username not in users:
                     raise ValidationError(f'User {username} not found')
-
-            owners = [
-                get_user_or_400(username=owner['username']) for owner in serializer.validated_data
-            ]
+            owners = [users[username] for username in usernames]
             if len(owners) < 1:
                 raise ValidationError('Cannot remove all draft owners')
 
             removed_owners, added_owners = dandiset.set_owners(owners)
             dandiset.save()
 
-            send_ownership_change_emails(dandiset, removed_owners, added_owners)
+            # Emails are sent in the background, so the response never waits for the mail server
+            if removed_owners or added_owners:
+                send_ownership_change_emails.delay(
+                    dandiset.id,
+                    [owner.id for owner in removed_owners],
+                    [owner.id for owner in added_owners],
+                )
 
         serializer = UserSerializer(dandiset.owners, many=True)
         return Response(serializer.data, status=status.HTTP_200_OK)
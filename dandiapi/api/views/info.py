@@ -4,6 +4,8 @@ from rest_framework import serializers
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
 
+from dandiapi.api.caching import cache_response
+
 schema_url = (
     'https://raw.githubusercontent.com/dandi/schema/master/'
     f'releases/{settings.DANDI_SCHEMA_VERSION}/dandiset.json'
@@ -21,6 +23,7 @@ class ApiInfoSerializer(serializers.Serializer):
     method='GET',
 )
 @api_view()
+@cache_response('info')
 def info_view(self):
     serializer = ApiInfoSerializer(
         data={
@@ -0,0 +1,16 @@
+from drf_yasg.utils import swagger_auto_schema
+from rest_framework.decorators import api_view, permission_classes, renderer_classes
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+
+from dandiapi.api import metrics
+from dandiapi.api.renderers import PrometheusRenderer
+
+
+@swagger_auto_schema(method='GET', auto_schema=None)
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+@renderer_classes([PrometheusRenderer])
+def metrics_view(request):
+    """Return the metrics of sampled requests, for Prometheus to scrape."""
+    return Response(metrics.latest())
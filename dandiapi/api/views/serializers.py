@@ -1,4 +1,7 @@
+from typing import Any, Dict
+
 from django.contrib.auth.validators import UnicodeUsernameValidator
+from django.db.models import Count, QuerySet, Sum
 from rest_framework import serializers
 
 from dandiapi.api.models import (
@@ -129,3 +132,68 @@ class ValidationSerializer(serializers.ModelSerializer):
 class ValidationErrorSerializer(serializers.ModelSerializer):
     class Meta(ValidationSerializer.Meta):
         fields = ValidationSerializer.Meta.fields + ['error']
+
+
+# A ModelSerializer runs its field machinery for every row, and may make a query per row for
+# related fields. The "values serializers" below instead select exactly the columns they need,
+# including related and aggregated columns, with QuerySet.values(), then build each
+# representation directly. Their output must be identical to that of the ModelSerializer they
+# replace, for listing many objects.
+
+_datetime_field = serializers.DateTimeField()
+
+
+def serialize_datetime(value) -> str:
+    """Serialize a datetime the same way as the DateTimeField of a ModelSerializer."""
+    return _datetime_field.to_representation(value)
+
+
+class AssetValuesSerializer:
+    """A read-only equivalent of AssetSerializer, operating on QuerySet.values() rows."""
+
+    @staticmethod
+    def values(queryset: QuerySet) -> QuerySet:
+        return queryset.values('uuid', 'path', 'blob__sha256', 'blob__size', 'created', 'modified')
+
+    @staticmethod
+    def to_representation(row: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            'uuid': str(row['uuid']),
+            'path': row['path'],
+            'sha256': row['blob__sha256'],
+            'size': row['blob__size'],
+            'created': serialize_datetime(row['created']),
+            'modified': serialize_datetime(row['modified']),
+        }
+
+
+class VersionValuesSerializer:
+    """A read-only equivalent of VersionSerializer, operating on QuerySet.values() rows."""
+
+    @staticmethod
+    def values(queryset: QuerySet) -> QuerySet:
+        return queryset.values(
+            'version',
+            'metadata__name',
+            'created',
+            'modified',
+            'dandiset_id',
+            'dandiset__created',
+            'dandiset__modified',
+        ).annotate(asset_count=Count('assets'), size=Sum('assets__blob__size'))
+
+    @staticmethod
+    def to_representation(row: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            'version': row['version'],
+            'name': row['metadata__name'],
+            'asset_count': row['asset_count'],
+            'size': row['size'] or 0,
+            'created': serialize_datetime(row['created']),
+            'modified': serialize_datetime(row['modified']),
+            'dandiset': {
+                'identifier': Dandiset.format_identifier(row['dandiset_id']),
+                'created': serialize_datetime(row['dandiset__created']),
+                'modified': serialize_datetime(row['dandiset__modified']),
+            },
+        }
@@ -1,21 +1,24 @@
-from django.contrib.auth.models import User
-from rest_framework.decorators import api_view
+from asgiref.sync import sync_to_async
+from rest_framework import serializers
 from rest_framework.response import Response
 
-from dandiapi.api.models import Asset, Dandiset
+from dandiapi.api.models import StatsSnapshot
+from dandiapi.api.views.common import async_api_view
 
 
-@api_view()
-def stats_view(self):
-    dandiset_count = Dandiset.objects.count()
-    published_dandiset_count = Dandiset.published_count()
-    user_count = User.objects.count()
-    size = Asset.total_size()
-    return Response(
-        {
-            'dandiset_count': dandiset_count,
-            'published_dandiset_count': published_dandiset_count,
-            'user_count': user_count,
-            'size': size,
-        }
-    )
+class StatsSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = StatsSnapshot
+        fields = [
+            'dandiset_count',
+            'published_dandiset_count',
+            'user_count',
+            'size',
+            'modified',
+        ]
+
+
+@async_api_view(['GET'])
+async def stats_view(self):
+    serializer = StatsSerializer(await sync_to_async(StatsSnapshot.load)())
+    return Response(serializer.data)
@@ -1,7 +1,8 @@
 from __future__ import annotations
 
-from typing import Dict
+from typing import Dict, Optional
 
+from asgiref.sync import sync_to_async
 from django.core.validators import RegexValidator
 from django.http.response import HttpResponseBase
 from django.shortcuts import get_object_or_404
@@ -9,14 +10,22 @@ from drf_yasg.utils import swagger_auto_schema
 from rest_framework import serializers, status
 from rest_framework.decorators import api_view, parser_classes, permission_classes
 from rest_framework.exceptions import ValidationError
-from rest_framework.parsers import JSONParser
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.request import Request
 from rest_framework.response import Response
-from s3_file_field._multipart import MultipartManager, TransferredPart, TransferredParts
+from s3_file_field._multipart import (
+    MultipartManager,
+    PresignedPartTransfer,
+    PresignedTransfer,
+    TransferredPart,
+    TransferredParts,
+)
 
-from dandiapi.api.models import AssetBlob, Validation
+from dandiapi.api.models import AssetBlob, MultipartUpload, Validation
+from dandiapi.api.presign import PresignRequest, presign_urls
+from dandiapi.api.renderers import FastJSONParser
 from dandiapi.api.tasks import validate
+from dandiapi.api.views.common import async_api_view
 from dandiapi.api.views.serializers import ValidationErrorSerializer, ValidationSerializer
 
 
@@ -78,7 +87,7 @@ class UploadValidationRequestSerializer(serializers.Serializer):
     responses={200: UploadInitializationResponseSerializer()},
 )
 @api_view(['POST'])
-@parser_classes([JSONParser])
+@parser_classes([FastJSONParser])
 @permission_classes([IsAuthenticated])
 def upload_initialize_view(request: Request) -> HttpResponseBase:
     """
@@ -102,9 +111,37 @@ def upload_initialize_view(request: Request) -> HttpResponseBase:
         Validation.blob.field.upload_to(None, None)
     )
 
-    initialization = MultipartManager.from_storage(Validation.blob.field.storage).initialize_upload(
-        object_key, upload_request['file_size']
+    storage = Validation.blob.field.storage
+    multipart_manager = MultipartManager.from_storage(storage)
+    # These private members are stable only because setup.py pins django-s3-file-field
+    upload_id = multipart_manager._create_upload_id(object_key)
+    part_sizes = list(multipart_manager._iter_part_sizes(upload_request['file_size']))
+    # Presign the URLs of every part at once, which is much faster for uploads of many parts
+    upload_urls = presign_urls(
+        storage,
+        [
+            PresignRequest(
+                'PUT', object_key, {'uploadId': upload_id, 'partNumber': str(part_number)}
+            )
+            for part_number, _ in part_sizes
+        ],
+        expires=multipart_manager._url_expiration,
+    )
+    initialization = PresignedTransfer(
+        object_key=object_key,
+        upload_id=upload_id,
+        parts=[
+            PresignedPartTransfer(part_number=part_number, size=part_size, upload_url=upload_url)
+            for (part_number, part_size), upload_url in zip(part_sizes, upload_urls)
+        ],
     )
+    # Record the upload, so it can be aborted if it is never completed
+    MultipartUpload(
+        object_key=object_key,
+        upload_id=initialization.upload_id,
+        size=upload_request['file_size'],
+        user=request.user,
+    ).save()
 
     response_serializer = UploadInitializationResponseSerializer(initialization)
     return Response(response_serializer.data)
@@ -116,7 +153,7 @@ def upload_initialize_view(request: Request) -> HttpResponseBase:
     responses={200: UploadCompletionResponseSerializer()},
 )
 @api_view(['POST'])
-@parser_classes([JSONParser])
+@parser_classes([FastJSONParser])
 @permission_classes([IsAuthenticated])
 def upload_complete_view(request: Request) -> HttpResponseBase:
     """
@@ -148,15 +185,13 @@ def upload_complete_view(request: Request) -> HttpResponseBase:
     request_body=UploadValidationRequestSerializer(),
     responses={
         204: 'No content',
-        400: 'Validation already in progress, '
-        'no existing validation for the given checksum, '
-        'or the specified object key does not exist',
+        400: 'Validation already in progress, or no existing validation for the given checksum',
     },
 )
-@api_view(['POST'])
-@parser_classes([JSONParser])
+@async_api_view(['POST'])
+@parser_classes([FastJSONParser])
 @permission_classes([IsAuthenticated])
-def upload_validate_view(request: Request) -> HttpResponseBase:
+async def upload_validate_view(request: Request) -> HttpResponseBase:
     """
     Start the validation process for an existing object.
 
@@ -166,53 +201,59 @@ def upload_validate_view(request: Request) -> HttpResponseBase:
     If the object_key is not specified, it will be looked up using the sha256 checksum if a valid
     object has been validated before. This allows clients to check if blobs have already been
     uploaded before uploading it themselves.
+    If the object does not exist, the validation fails.
     """
     request_serializer = UploadValidationRequestSerializer(data=request.data)
     request_serializer.is_valid(raise_exception=True)
     # validation: Validation = request_serializer.save()
 
-    if 'object_key' in request_serializer.validated_data:
+    validation = await sync_to_async(_prepare_validation)(request_serializer.validated_data)
+    if validation is None:
+        return Response('Validation already in progress.')
+
+    await sync_to_async(validation.save)()
+    # Queuing the task doesn't need the database, so it doesn't wait for its thread
+    await sync_to_async(validate.delay, thread_sensitive=False)(validation.id)
+    return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+def _prepare_validation(validated_data: Dict) -> Optional[Validation]:
+    """Return an unsaved validation of an object, or None if one is already in progress."""
+    if 'object_key' in validated_data:
         # Use uploaded data
-        blob = request_serializer.validated_data['object_key']
+        blob = validated_data['object_key']
     else:
         # Use blob from an AssetBlob
         try:
-            asset_blob = AssetBlob.objects.get(sha256=request_serializer.validated_data['sha256'])
+            asset_blob = AssetBlob.objects.get(sha256=validated_data['sha256'])
         except AssetBlob.DoesNotExist:
             raise ValidationError('A validation for an object with that checksum does not exist.')
         blob = asset_blob.blob
 
-    sha256 = request_serializer.validated_data['sha256']
+    sha256 = validated_data['sha256']
 
     try:
         validation = Validation.objects.get(sha256=sha256)
         if validation.state == Validation.State.IN_PROGRESS:
-            return Response('Validation already in progress.')
+            return None
         validation.blob = blob
         validation.state = Validation.State.IN_PROGRESS
     except Validation.DoesNotExist:
         validation = Validation(
             blob=blob,
-            sha256=request_serializer.validated_data['sha256'],
+            sha256=sha256,
             state=Validation.State.IN_PROGRESS,
         )
-
-    if not validation.object_key_exists():
-        raise ValidationError('Object does not exist.')
-
-    validation.save()
-
-    validate.delay(validation.id)
-    return Response(status=status.HTTP_204_NO_CONTENT)
+    return validation
 
 
 @swagger_auto_schema(method='GET', responses={200: ValidationErrorSerializer()})
-@api_view(['GET'])
-@parser_classes([JSONParser])
+@async_api_view(['GET'])
+@parser_classes([FastJSONParser])
 @permission_classes([IsAuthenticated])
-def upload_get_validation_view(request: Request, sha256: str) -> HttpResponseBase:
+async def upload_get_validation_view(request: Request, sha256: str) -> HttpResponseBase:
     """Get the status of a validation."""
-    validation = get_object_or_404(Validation, sha256=sha256)
+    validation = await sync_to_async(get_object_or_404)(Validation, sha256=sha256)
 
     if validation.state == Validation.State.FAILED:
         response_serializer = ValidationErrorSerializer(validation)
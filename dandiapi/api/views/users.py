@@ -1,24 +1,29 @@
 from __future__ import annotations
 
 from django.contrib.auth.models import User
+from django.contrib.postgres.search import TrigramSimilarity
+from django.db.models import Case, F, FloatField, Q, Value, When
+from django.db.models.functions import Greatest
 from django.forms.models import model_to_dict
 from django.http.response import HttpResponseBase
 from drf_yasg.utils import swagger_auto_schema
 from rest_framework.decorators import api_view, parser_classes, permission_classes
-from rest_framework.parsers import JSONParser
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.request import Request
 from rest_framework.response import Response
 
+from dandiapi.api.renderers import FastJSONParser
 from dandiapi.api.views.serializers import UserDetailSerializer, UserSerializer
 
+SEARCH_LIMIT = 10
+
 
 @swagger_auto_schema(
     method='GET',
     responses={200: UserDetailSerializer},
 )
 @api_view(['GET'])
-@parser_classes([JSONParser])
+@parser_classes([FastJSONParser])
 @permission_classes([IsAuthenticated])
 def users_me_view(request: Request) -> HttpResponseBase:
     """Get the currently authenticated user."""
@@ -34,16 +39,39 @@ def users_me_view(request: Request) -> HttpResponseBase:
     responses={200: UserDetailSerializer(many=True)},
 )
 @api_view(['GET'])
-@parser_classes([JSONParser])
+@parser_classes([FastJSONParser])
 @permission_classes([IsAuthenticated])
 def users_search_view(request: Request) -> HttpResponseBase:
-    """Search for a user."""
+    """
+    Search for a user.
+
+    Users whose username starts with the given one come first, in alphabetical order, followed
+    by users whose first or last name is similar to it, most similar first.
+    """
     request_serializer = UserSerializer(data=request.query_params)
     request_serializer.is_valid(raise_exception=True)
     username: str = request_serializer.validated_data['username']
 
-    results = User.objects.filter(username__startswith=username).order_by('username')[:10]
-    dict_results = [{'admin': user.is_superuser, **model_to_dict(user)} for user in results]
-
-    response_serializer = UserDetailSerializer(dict_results, many=True)
-    return Response(response_serializer.data)
+    # Every condition is answered by the trigram indexes of these fields
+    results = (
+        User.objects.filter(
+            Q(username__startswith=username)
+            | Q(first_name__trigram_similar=username)
+            | Q(last_name__trigram_similar=username)
+        )
+        .annotate(
+            # Similarities are at most 1, so prefix matches always rank first
+            rank=Case(
+                When(username__startswith=username, then=Value(2.0)),
+                default=Greatest(
+                    TrigramSimilarity('first_name', username),
+                    TrigramSimilarity('last_name', username),
+                ),
+                output_field=FloatField(),
+            )
+        )
+        .order_by('-rank', 'username')
+        .values('username', 'first_name', 'last_name', admin=F('is_superuser'))[:SEARCH_LIMIT]
+    )
+    # The values already have the fields of UserDetailSerializer, so they are returned as they are
+    return Response(list(results))
@@ -1,5 +1,5 @@
+from django.db import transaction
 from drf_yasg.utils import no_body, swagger_auto_schema
-from guardian.utils import get_40x_or_None
 from rest_framework import status
 from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticatedOrReadOnly
@@ -7,12 +7,14 @@ from rest_framework.response import Response
 from rest_framework.viewsets import ReadOnlyModelViewSet
 from rest_framework_extensions.mixins import DetailSerializerMixin, NestedViewSetMixin
 
+from dandiapi.api.caching import cache_response, conditional_version_response, get_owner_40x_or_none
 from dandiapi.api.models import Version, VersionMetadata
 from dandiapi.api.views.common import DandiPagination
 from dandiapi.api.views.serializers import (
     VersionDetailSerializer,
     VersionMetadataSerializer,
     VersionSerializer,
+    VersionValuesSerializer,
 )
 
 
@@ -28,6 +30,18 @@ class VersionViewSet(NestedViewSetMixin, DetailSerializerMixin, ReadOnlyModelVie
     lookup_field = 'version'
     lookup_value_regex = Version.VERSION_REGEX
 
+    def list(self, request, *args, **kwargs):
+        queryset = VersionValuesSerializer.values(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(queryset)
+        return self.get_paginated_response(
+            [VersionValuesSerializer.to_representation(row) for row in page]
+        )
+
+    @conditional_version_response(dandiset_kwarg='dandiset__pk', version_kwarg='version')
+    @cache_response('published_version', dandiset_kwarg='dandiset__pk', version_kwarg='version')
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
     @swagger_auto_schema(
         request_body=VersionMetadataSerializer(),
         responses={200: VersionDetailSerializer()},
@@ -39,7 +53,7 @@ class VersionViewSet(NestedViewSetMixin, DetailSerializerMixin, ReadOnlyModelVie
 
         # TODO @permission_required doesn't work on methods
         # https://github.com/django-guardian/django-guardian/issues/723
-        response = get_40x_or_None(request, ['owner'], version.dandiset, return_403=True)
+        response = get_owner_40x_or_none(request, version.dandiset)
         if response:
             return response
 
@@ -68,13 +82,14 @@ class VersionViewSet(NestedViewSetMixin, DetailSerializerMixin, ReadOnlyModelVie
 
         # TODO @permission_required doesn't work on methods
         # https://github.com/django-guardian/django-guardian/issues/723
-        response = get_40x_or_None(request, ['owner'], old_version.dandiset, return_403=True)
+        response = get_owner_40x_or_none(request, old_version.dandiset)
         if response:
             return response
 
-        new_version = Version.copy(old_version)
-        new_version.save()
-        for asset in old_version.assets.all():
-            new_version.assets.add(asset)
+        # Published versions are cached as immutable, so they must never be seen partially copied
+        with transaction.atomic():
+            new_version = Version.copy(old_version)
+            new_version.save()
+            new_version.assets.add(*old_version.assets.all())
         serializer = VersionSerializer(new_version)
         return Response(serializer.data, status=status.HTTP_200_OK)
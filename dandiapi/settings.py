@@ -1,3 +1,4 @@
+from datetime import timedelta
 from pathlib import Path
 from typing import Type
 
@@ -35,24 +36,105 @@ class DandiMixin(ConfigMixin):
             'allauth.socialaccount.providers.github',
         ]
 
+        # Outermost, so the whole request is timed
+        configuration.MIDDLEWARE.insert(0, 'dandiapi.api.middleware.RequestMetricsMiddleware')
+        # Every middleware must be async capable, for async views to be served without a thread
+        configuration.MIDDLEWARE = [
+            'dandiapi.api.middleware.AsyncCapableWhiteNoiseMiddleware'
+            if middleware == 'whitenoise.middleware.WhiteNoiseMiddleware'
+            else middleware
+            for middleware in configuration.MIDDLEWARE
+        ]
+
         configuration.AUTHENTICATION_BACKENDS += ['guardian.backends.ObjectPermissionBackend']
         configuration.REST_FRAMEWORK['DEFAULT_AUTHENTICATION_CLASSES'] += [
             # TODO remove TokenAuthentication, it is only here to support
             # the setTokenHack login workaround
-            'rest_framework.authentication.TokenAuthentication',
+            'dandiapi.api.authentication.CachedTokenAuthentication',
         ]
         configuration.REST_FRAMEWORK[
             'DEFAULT_PAGINATION_CLASS'
         ] = 'dandiapi.api.views.common.DandiPagination'
+        configuration.REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES'] = [
+            'dandiapi.api.renderers.FastJSONRenderer',
+            'rest_framework.renderers.BrowsableAPIRenderer',
+        ]
+        configuration.REST_FRAMEWORK['DEFAULT_PARSER_CLASSES'] = [
+            'dandiapi.api.renderers.FastJSONParser',
+            'rest_framework.parsers.FormParser',
+            'rest_framework.parsers.MultiPartParser',
+        ]
 
     DANDI_DANDISETS_BUCKET_NAME = values.Value(environ_required=True)
     DANDI_GIRDER_API_URL = values.URLValue(environ_required=True)
     DANDI_GIRDER_API_KEY = values.Value(environ_required=True)
+    # If set, dry runs of Girder imports cache Girder listings in this directory
+    DANDI_GIRDER_LISTING_CACHE_DIR = values.Value(None)
     DANDI_SCHEMA_VERSION = values.Value(environ_required=True)
+    # The most connections to the object store kept open by each process
+    DANDI_STORAGE_MAX_CONNECTIONS = values.PositiveIntegerValue(50)
+
+    # The fraction of requests whose metrics are recorded; 0 disables request metrics entirely
+    DANDI_REQUEST_METRICS_SAMPLE_RATE = values.FloatValue(0.0)
 
     # The CloudAMQP connection was dying, using the heartbeat should keep it alive
     CELERY_BROKER_HEARTBEAT = 20
 
+    # If set, a Redis-compatible server is used as a cache shared by all processes.
+    # Otherwise, each process uses its own local memory cache.
+    DANDI_CACHE_REDIS_URL = values.Value(None)
+
+    @property
+    def CACHES(self):  # noqa: N802
+        if self.DANDI_CACHE_REDIS_URL:
+            return {
+                'default': {
+                    'BACKEND': 'django_redis.cache.RedisCache',
+                    'LOCATION': self.DANDI_CACHE_REDIS_URL,
+                }
+            }
+        return {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+    # Overrides of the timeouts of DANDI_CACHE_POLICIES, e.g. "{'published_assets': 0}"
+    DANDI_CACHE_POLICY_OVERRIDES = values.DictValue({})
+
+    @property
+    def DANDI_CACHE_POLICIES(self):  # noqa: N802
+        # Timeouts, in seconds, of cached API responses; a timeout of 0 disables caching.
+        # Published versions never change, and all cached data describing a dandiset is
+        # invalidated when it is modified, so those can be cached for much longer.
+        # However, invalidation happens through the cache itself, so it only reaches other
+        # processes (other web workers, and Celery) when the cache is shared.
+        dandiset_timeout = 24 * 60 * 60 if self.DANDI_CACHE_REDIS_URL else 10
+        return {
+            'info': 60 * 60,
+            'stats': 60,
+            'published_version': dandiset_timeout,
+            'published_assets': dandiset_timeout,
+            # Removed owners keep their access in other processes until this expires, unless the
+            # cache is shared
+            'owner_permission': 60 if self.DANDI_CACHE_REDIS_URL else 5,
+            # Each process also keeps its recently used tokens for at most 30 seconds, so a
+            # deactivated user may keep using theirs in other processes for that long
+            'token': 5 * 60 if self.DANDI_CACHE_REDIS_URL else 30,
+            **self.DANDI_CACHE_POLICY_OVERRIDES,
+        }
+
+    CELERY_BEAT_SCHEDULE = {
+        'refresh-stats': {
+            'task': 'dandiapi.api.tasks.refresh_stats',
+            'schedule': timedelta(minutes=15),
+        },
+        'collect-garbage': {
+            'task': 'dandiapi.api.tasks.collect_garbage',
+            'schedule': timedelta(days=1),
+        },
+        'reap-multipart-uploads': {
+            'task': 'dandiapi.api.tasks.reap_multipart_uploads',
+            'schedule': timedelta(hours=1),
+        },
+    }
+
 
 class DevelopmentConfiguration(DandiMixin, DevelopmentBaseConfiguration):
     pass
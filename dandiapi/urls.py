@@ -6,12 +6,15 @@ from drf_yasg.views import get_schema_view
 from rest_framework import permissions
 from rest_framework_extensions.routers import ExtendedSimpleRouter
 
+from dandiapi.api.models import Asset, Dandiset, Version
 from dandiapi.api.views import (
     AssetViewSet,
     DandisetViewSet,
     VersionViewSet,
+    asset_download_view,
     auth_token_view,
     info_view,
+    metrics_view,
     stats_view,
     upload_complete_view,
     upload_get_validation_view,
@@ -66,10 +69,19 @@ class DandisetIDConverter:
 
 register_converter(DandisetIDConverter, 'dandiset_id')
 urlpatterns = [
+    # Downloads are served by an async view, so they can't be an action of AssetViewSet
+    re_path(
+        rf'^api/dandisets/(?P<versions__dandiset__pk>{Dandiset.IDENTIFIER_REGEX})'
+        rf'/versions/(?P<versions__version>{Version.VERSION_REGEX})'
+        rf'/assets/(?P<uuid>{Asset.UUID_REGEX})/download/$',
+        asset_download_view,
+        name='asset-download',
+    ),
     path('api/', include(router.urls)),
     path('api/auth/token/', auth_token_view, name='auth-token'),
     path('api/stats/', stats_view),
     path('api/info/', info_view),
+    path('api/metrics/', metrics_view),
     path('api/uploads/initialize/', upload_initialize_view, name='upload-initialize'),
     path('api/uploads/complete/', upload_complete_view, name='upload-complete'),
     path('api/uploads/validate/', upload_validate_view, name='upload-validate'),
@@ -48,12 +48,18 @@ setup(
         'djangorestframework',
         'drf-extensions',
         'drf-yasg',
-        'httpx',
+        'httpx[http2]',
+        'orjson',
+        'prometheus-client',
         # Production-only
         'django-composed-configuration[prod]',
-        'django-s3-file-field[boto3]',
+        'django-redis',
+        # The upload views use private members of its MultipartManager, which may change in any
+        # release
+        'django-s3-file-field[boto3]==0.1.2',
         'django-storages[boto3]',
         'gunicorn',
+        'uvicorn[standard]',
         # Development-only, but required
         'django-minio-storage',
     ],
@@ -61,7 +67,7 @@ setup(
         'dev': [
             'django-composed-configuration[dev]',
             'django-debug-toolbar',
-            'django-s3-file-field[minio]',
+            'django-s3-file-field[minio]==0.1.2',
             'ipython',
             'tox',
         ]